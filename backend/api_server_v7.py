@@ -19,6 +19,7 @@ Endpoints:
 - GET  /health              - Health check
 """
 
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -41,6 +42,7 @@ sys.path.insert(0, str(LOGGING_DIR))
 # Import centralized models and config
 from config import get_settings
 from models import (
+    BatchDecipherRequest,
     ConfirmRequest,
     DecipherRequest,
     DecipherResult,
@@ -97,10 +99,21 @@ async def lifespan(app: FastAPI):
     startup_logger.info(f"Log directory: {LOG_DIR}")
     startup_logger.info(f"Environment: {settings.environment}")
     startup_logger.info("=" * 60)
+
+    # Optionally prefetch the known sugyos into the Sefaria response cache
+    warm_task = None
+    if settings.warm_cache_on_startup:
+        from cache_warmer import warm_known_sugyos
+        warm_task = asyncio.create_task(
+            warm_known_sugyos(max_concurrent=settings.cache_warm_concurrency)
+        )
+        startup_logger.info("Cache warmer started in background")
     
     yield
     
     # Shutdown
+    if warm_task and not warm_task.done():
+        warm_task.cancel()
     startup_logger.info("Marei Mekomos API Server Shutting Down")
     stop_logging()
 
@@ -176,8 +189,10 @@ async def search_endpoint(request: SearchRequest) -> MareiMekomosResult:
     logger.info("=" * 60)
 
     try:
-        from main_pipeline import search_sources
+        from main_pipeline import attach_english, search_sources
         result = await search_sources(request.query)
+        if request.include_english and not result.needs_clarification:
+            await attach_english(result)
 
         if result.needs_clarification:
             logger.info(f"[/search] Clarification needed: {result.clarification_prompt}")
@@ -212,7 +227,7 @@ async def clarify_endpoint(request: ClarifyRequest) -> MareiMekomosResult:
     logger.info("=" * 60)
 
     try:
-        from main_pipeline import search_with_clarification
+        from main_pipeline import attach_english, search_with_clarification
 
         result = await search_with_clarification(
             original_query=request.original_query,
@@ -220,6 +235,8 @@ async def clarify_endpoint(request: ClarifyRequest) -> MareiMekomosResult:
             selected_option_id=request.selected_option_id,
             custom_clarification=request.custom_clarification,
         )
+        if request.include_english and not result.needs_clarification:
+            await attach_english(result)
 
         logger.info(f"[/search/clarify] Complete: {result.total_sources} sources")
         return result
@@ -233,6 +250,23 @@ async def clarify_endpoint(request: ClarifyRequest) -> MareiMekomosResult:
 #  DECIPHER ENDPOINTS (Step 1)
 # ==========================================
 
+def _decipher_response(result: DecipherResult) -> Dict[str, Any]:
+    """API shape of a Step 1 result."""
+    return {
+        "success": result.success,
+        "hebrew_term": result.hebrew_term,
+        "hebrew_terms": result.hebrew_terms,
+        "confidence": enum_value(result.confidence),
+        "method": result.method,
+        "message": result.message,
+        "needs_validation": result.needs_validation,
+        "validation_type": enum_value(result.validation_type),
+        "alternatives": result.alternatives,
+        "choose_options": result.choose_options,
+        "word_validations": serialize_word_validations(result.word_validations),
+    }
+
+
 @app.post("/decipher")
 async def decipher_endpoint(request: DecipherRequest) -> Dict[str, Any]:
     """
@@ -249,19 +283,7 @@ async def decipher_endpoint(request: DecipherRequest) -> Dict[str, Any]:
         # Store for confirm/reject
         _pending_sessions[request.query] = result
         
-        response = {
-            "success": result.success,
-            "hebrew_term": result.hebrew_term,
-            "hebrew_terms": result.hebrew_terms,
-            "confidence": enum_value(result.confidence),
-            "method": result.method,
-            "message": result.message,
-            "needs_validation": result.needs_validation,
-            "validation_type": enum_value(result.validation_type),
-            "alternatives": result.alternatives,
-            "choose_options": result.choose_options,
-            "word_validations": serialize_word_validations(result.word_validations),
-        }
+        response = _decipher_response(result)
         
         logger.info(f"[/decipher] Result: {result.hebrew_term} ({result.method})")
         return response
@@ -271,6 +293,34 @@ async def decipher_endpoint(request: DecipherRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/decipher/batch")
+async def decipher_batch_endpoint(request: BatchDecipherRequest) -> Dict[str, Any]:
+    """
+    Step 1 on many queries in one call (e.g. a shiur outline).
+    
+    Words shared between queries are validated once. Results are in
+    request order, each in the /decipher response shape plus "query".
+    """
+    logger.info(f"[/decipher/batch] {len(request.queries)} queries")
+    
+    try:
+        from step_one_decipher import decipher_many
+        results = await decipher_many(request.queries)
+        
+        responses = []
+        for query, result in zip(request.queries, results):
+            # Store for confirm/reject
+            _pending_sessions[query] = result
+            responses.append({"query": query, **_decipher_response(result)})
+        
+        logger.info(f"[/decipher/batch] {sum(1 for r in results if r.success)}/{len(results)} succeeded")
+        return {"results": responses}
+        
+    except Exception as e:
+        logger.exception(f"[/decipher/batch] Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/decipher/confirm")
 async def confirm_decipher(request: ConfirmRequest) -> Dict[str, Any]:
     """User confirms a transliteration selection."""
@@ -279,7 +329,7 @@ async def confirm_decipher(request: ConfirmRequest) -> Dict[str, Any]:
     try:
         # Update dictionary for learning
         try:
-            from word_dictionary import get_dictionary
+            from tools.word_dictionary import get_dictionary
             dictionary = get_dictionary()
             
             words = request.original_query.lower().split()
@@ -288,7 +338,7 @@ async def confirm_decipher(request: ConfirmRequest) -> Dict[str, Any]:
             else:
                 word = request.original_query.lower()
             
-            dictionary.add_entry(word, request.selected_hebrew, boost=True)
+            dictionary.add_entry(word, request.selected_hebrew, source="user_confirmed")
             logger.info(f"[/decipher/confirm] Dictionary updated: {word} -> {request.selected_hebrew}")
             
         except ImportError:
@@ -331,12 +381,9 @@ def _get_feedback_cache():
     """Get or create the feedback cache singleton."""
     global _feedback_cache
     if _feedback_cache is None:
-        from feedback_cache import create_feedback_cache
+        from feedback_cache import get_feedback_cache
         cache_dir = settings.cache_dir / "feedback"
-        _feedback_cache = create_feedback_cache(
-            storage_type="json",
-            cache_dir=str(cache_dir),
-        )
+        _feedback_cache = get_feedback_cache(str(cache_dir))
     return _feedback_cache
 
 
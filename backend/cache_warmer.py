@@ -0,0 +1,290 @@
+"""
+Cache Warmer for the Known Sugyos Database
+==========================================
+
+data/sugyos.json lists our highest-traffic sugyos. After a deploy (or a
+cache wipe) the first user to hit each one pays the full cold fetch of the
+gemara text, its /related payload and every commentary Step 3 pulls in.
+
+This module walks every known sugya ahead of time and fills the Step 3
+response cache (backend/cache/sefaria) with:
+1. The base text of each primary_gemara ref
+2. The daf-level /related payload for that ref
+3. The text of each target commentary found in /related
+   (Rashi + Tosafos, plus the sugya's rishonim_who_discuss)
+
+All fetches go through the same helpers Step 3 uses, so the cache keys
+match exactly what a live query will look up.
+
+USAGE:
+    python cache_warmer.py                     # Warm everything
+    python cache_warmer.py --concurrency 8     # More parallel requests
+    python cache_warmer.py --sugya chezkas_haguf_vs_mammon
+
+    # From code (e.g. API server startup):
+    from cache_warmer import warm_known_sugyos
+    report = await warm_known_sugyos(max_concurrent=4)
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+# Ensure backend/ is on the path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from known_sugyos import get_all_sugyos
+from tools.http_replay import client_session
+from step_three_search import (
+    RESPONSE_CACHE,
+    _text_request,
+    fetch_related,
+    fetch_text,
+    is_unconventional_source,
+    matches_source_target,
+    response_cache_key,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+#  CONFIGURATION
+# =============================================================================
+
+# Commentaries warmed for every sugya, on top of its rishonim_who_discuss
+DEFAULT_TARGET_SOURCES = ["rashi", "tosafos"]
+
+# Upper bound on commentary texts warmed per base ref
+MAX_COMMENTARIES_PER_REF = 40
+
+
+# =============================================================================
+#  DATA STRUCTURES
+# =============================================================================
+
+@dataclass
+class WarmReport:
+    """Summary of a cache warming run."""
+    sugyos_total: int = 0
+    base_refs: int = 0
+    commentary_refs: int = 0
+    keys_attempted: int = 0
+    keys_cached: int = 0
+    bytes_cached: int = 0
+    failed_keys: List[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of attempted cache keys that are now cached."""
+        if not self.keys_attempted:
+            return 0.0
+        return self.keys_cached / self.keys_attempted
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        return (
+            f"{self.sugyos_total} sugyos, {self.base_refs} base refs, "
+            f"{self.commentary_refs} commentaries | "
+            f"coverage {self.keys_cached}/{self.keys_attempted} ({self.coverage:.0%}) | "
+            f"{self.bytes_cached / 1024:.1f} KB cached | "
+            f"{self.elapsed_seconds:.1f}s"
+        )
+
+
+# =============================================================================
+#  WARMING LOGIC
+# =============================================================================
+
+def _target_sources_for(sugya: Dict) -> List[str]:
+    """Targets to warm for a sugya: defaults + its listed rishonim."""
+    targets = list(DEFAULT_TARGET_SOURCES)
+    for name in sugya.get("rishonim_who_discuss", []):
+        target = name.lower().replace(" ", "_")
+        if target not in targets:
+            targets.append(target)
+    return targets
+
+
+def _matching_commentary_refs(related: Dict, targets: List[str]) -> List[str]:
+    """Pick the /related links Step 3 would fetch text for."""
+    refs = []
+    for link in related.get("links", []):
+        link_ref = link.get("ref", "")
+        if not link_ref or link_ref in refs:
+            continue
+        if is_unconventional_source(link_ref, link.get("categories", [])):
+            continue
+
+        categories = link.get("category", "")
+        collective_title = link.get("collectiveTitle", {}).get("en", "")
+        if any(
+            matches_source_target(link_ref, categories, collective_title, target)
+            for target in targets
+        ):
+            refs.append(link_ref)
+
+        if len(refs) >= MAX_COMMENTARIES_PER_REF:
+            break
+    return refs
+
+
+def _record(report: WarmReport, key: str) -> None:
+    """Account for one cache key after its fetch completed."""
+    report.keys_attempted += 1
+    size = RESPONSE_CACHE.entry_size(key) if RESPONSE_CACHE else 0
+    if size:
+        report.keys_cached += 1
+        report.bytes_cached += size
+    else:
+        report.failed_keys.append(key)
+
+
+async def warm_known_sugyos(
+    max_concurrent: int = 4,
+    sugya_ids: Optional[List[str]] = None,
+    include_commentaries: bool = True,
+) -> WarmReport:
+    """
+    Prefetch texts, /related payloads and target commentaries for known sugyos.
+
+    Args:
+        max_concurrent: Max Sefaria requests in flight at once
+        sugya_ids: Only warm these sugyos (default: all)
+        include_commentaries: Also warm the text of target commentaries
+
+    Returns:
+        WarmReport with coverage and bytes cached
+    """
+    report = WarmReport()
+    start = time.monotonic()
+
+    if RESPONSE_CACHE is None:
+        logger.warning("[CACHE_WARMER] Response cache is disabled - nothing to warm")
+        return report
+
+    sugyos = get_all_sugyos()
+    if sugya_ids:
+        sugyos = [s for s in sugyos if s.get("id") in sugya_ids]
+    report.sugyos_total = len(sugyos)
+
+    logger.info(f"[CACHE_WARMER] Warming {len(sugyos)} sugyos (max {max_concurrent} concurrent)")
+
+    semaphore = asyncio.Semaphore(max_concurrent)
+    warmed_keys: Set[str] = set()
+
+    async with client_session() as session:
+
+        async def warm_text(ref: str) -> None:
+            _, key = _text_request(ref)  # The key fetch_text writes (Hebrew-only by default)
+            if key in warmed_keys:
+                return
+            warmed_keys.add(key)
+            async with semaphore:
+                await fetch_text(ref, session)
+            _record(report, key)
+
+        async def warm_base_ref(ref: str, targets: List[str]) -> None:
+            key = response_cache_key("related", ref)
+            if key in warmed_keys:
+                return
+            warmed_keys.add(key)
+
+            async with semaphore:
+                related = await fetch_related(ref, session)
+            _record(report, key)
+
+            if not related or not include_commentaries:
+                return
+
+            commentary_refs = _matching_commentary_refs(related, targets)
+            report.commentary_refs += len(commentary_refs)
+            await asyncio.gather(*(warm_text(c) for c in commentary_refs))
+
+        tasks = []
+        seen_base_refs: Set[str] = set()
+        for sugya in sugyos:
+            targets = _target_sources_for(sugya)
+            for loc in sugya.get("primary_gemara", []):
+                ref = loc.get("ref", "")
+                if not ref or ref in seen_base_refs:
+                    continue
+                seen_base_refs.add(ref)
+                report.base_refs += 1
+                tasks.append(warm_text(ref))
+                tasks.append(warm_base_ref(ref, targets))
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for item in results:
+            if isinstance(item, Exception):
+                logger.warning(f"[CACHE_WARMER] Warm task failed: {item}")
+
+    report.elapsed_seconds = time.monotonic() - start
+
+    logger.info(f"[CACHE_WARMER] Done: {report.summary()}")
+    if report.failed_keys:
+        logger.info(f"[CACHE_WARMER] {len(report.failed_keys)} keys not cached (first 5: {report.failed_keys[:5]})")
+
+    return report
+
+
+# =============================================================================
+#  CLI
+# =============================================================================
+
+def main():
+    """Command-line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Prefetch known sugyos into the Sefaria response cache",
+    )
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=4,
+        help="Max concurrent Sefaria requests (default: 4)"
+    )
+    parser.add_argument(
+        "--sugya",
+        action="append",
+        dest="sugya_ids",
+        help="Only warm this sugya id (repeatable)"
+    )
+    parser.add_argument(
+        "--no-commentaries",
+        action="store_true",
+        help="Warm base texts and /related payloads only"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s | %(levelname)-8s | %(message)s',
+        datefmt='%H:%M:%S'
+    )
+
+    report = asyncio.run(warm_known_sugyos(
+        max_concurrent=args.concurrency,
+        sugya_ids=args.sugya_ids,
+        include_commentaries=not args.no_commentaries,
+    ))
+
+    print("\n" + "=" * 70)
+    print("CACHE WARM COMPLETE")
+    print("=" * 70)
+    print(f"Sugyos:        {report.sugyos_total}")
+    print(f"Base refs:     {report.base_refs}")
+    print(f"Commentaries:  {report.commentary_refs}")
+    print(f"Coverage:      {report.keys_cached}/{report.keys_attempted} ({report.coverage:.0%})")
+    print(f"Bytes cached:  {report.bytes_cached:,}")
+    print(f"Elapsed:       {report.elapsed_seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
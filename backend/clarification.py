@@ -22,6 +22,8 @@ from enum import Enum
 
 from anthropic import Anthropic
 
+from tools.http_replay import sync_http_client
+
 try:
     from config import get_settings
     settings = get_settings()
@@ -267,7 +269,7 @@ async def generate_clarification_options(
 
     # Otherwise, ask Claude to generate options
     try:
-        client = Anthropic(api_key=settings.anthropic_api_key)
+        client = Anthropic(api_key=settings.anthropic_api_key, http_client=sync_http_client())
 
         prompt = CLARIFICATION_PROMPT.format(
             query=query,
@@ -73,10 +73,24 @@ class Settings(BaseSettings):
         Path(__file__).parent / "cache",
         env="CACHE_DIR"
     )
+    warm_cache_on_startup: bool = Field(False, env="WARM_CACHE_ON_STARTUP")
+    cache_warm_concurrency: int = Field(4, env="CACHE_WARM_CONCURRENCY")
     dictionary_file: Path = Field(
         Path(__file__).parent / "data" / "word_dictionary.json",
         env="DICTIONARY_FILE"
     )
+    variant_lexicon_file: Path = Field(
+        Path(__file__).parent / "data" / "variant_lexicon.json",
+        env="VARIANT_LEXICON_FILE"
+    )
+    term_frequency_file: Path = Field(
+        Path(__file__).parent / "data" / "term_frequency.bin",
+        env="TERM_FREQUENCY_FILE"
+    )
+    english_lexicon_file: Path = Field(
+        Path(__file__).parent / "data" / "english_lexicon.bin",
+        env="ENGLISH_LEXICON_FILE"
+    )
 
     # ==========================================
     #  LOGGING
@@ -112,6 +126,9 @@ class Settings(BaseSettings):
     # Step 3: Search
     default_search_depth: str = Field("standard", env="DEFAULT_SEARCH_DEPTH")
     max_sources_per_level: int = Field(10, env="MAX_SOURCES_PER_LEVEL")
+    commentary_budget: int = Field(15, env="COMMENTARY_BUDGET")
+    hebrew_only_texts: bool = Field(True, env="HEBREW_ONLY_TEXTS")
+    range_fetch_max_amudim: int = Field(8, env="RANGE_FETCH_MAX_AMUDIM")
 
     # ==========================================
     #  TESTING/DEVELOPMENT
@@ -310,6 +310,20 @@ class FeedbackCache:
             return history.priority_adjustment
         return 0.0
 
+    def get_source_priority_adjustments(self, source_refs: List[str]) -> Dict[str, float]:
+        """
+        Priority adjustments for many sources at once.
+
+        Reads the source histories once instead of once per ref.
+        Refs without feedback are omitted.
+        """
+        histories = self.storage.get_all_source_histories()
+        return {
+            ref: histories[ref].priority_adjustment
+            for ref in source_refs
+            if ref in histories
+        }
+
     def apply_priority_to_sources(self, sources: List[Source]) -> List[Tuple[Source, float]]:
         """
         Apply priority adjustments to a list of sources.
@@ -628,3 +642,16 @@ def create_feedback_cache(
         raise ValueError(f"Unknown storage type: {storage_type}")
 
     return FeedbackCache(storage=storage, **kwargs)
+
+
+_feedback_caches: Dict[str, FeedbackCache] = {}
+
+
+def get_feedback_cache(cache_dir: str = "cache/feedback") -> FeedbackCache:
+    """Get the shared JSON-backed FeedbackCache for a directory (created once)."""
+    if cache_dir not in _feedback_caches:
+        _feedback_caches[cache_dir] = create_feedback_cache(
+            storage_type="json",
+            cache_dir=cache_dir,
+        )
+    return _feedback_caches[cache_dir]
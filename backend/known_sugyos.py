@@ -320,6 +320,12 @@ def get_all_sugya_ids() -> List[str]:
     return [s.get("id", "") for s in database.get("sugyos", [])]
 
 
+def get_all_sugyos() -> List[Dict[str, Any]]:
+    """Get the raw entries for every known sugya."""
+    database = _load_database()
+    return list(database.get("sugyos", []))
+
+
 def get_sugya_by_id(sugya_id: str) -> Optional[Dict[str, Any]]:
     """Get a specific sugya by its ID."""
     database = _load_database()
@@ -338,6 +344,7 @@ __all__ = [
     'KnownSugyaMatch',
     'PrimaryGemaraLocation',
     'get_all_sugya_ids',
+    'get_all_sugyos',
     'get_sugya_by_id',
     'reload_database',
     'KNOWN_SUGYOS_DB_PATH',
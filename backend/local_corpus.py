@@ -14,10 +14,12 @@ import json
 import re
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Any
 from dataclasses import dataclass, field
 from collections import defaultdict
 
+from utils.hebrew_text import strip_html
+
 logger = logging.getLogger(__name__)
 
 
@@ -327,6 +329,20 @@ def extract_gemara_citations(
     return citations
 
 
+def iter_text_segments(text_item: Any) -> Iterator[str]:
+    """Yield every string in a nested Sefaria text structure (merged.json "text")."""
+    if not text_item:
+        return
+    if isinstance(text_item, str):
+        yield text_item
+    elif isinstance(text_item, list):
+        for item in text_item:
+            yield from iter_text_segments(item)
+    elif isinstance(text_item, dict):
+        for item in text_item.values():
+            yield from iter_text_segments(item)
+
+
 # ==============================================================================
 #  LOCAL CORPUS CLASS
 # ==============================================================================
@@ -370,7 +386,7 @@ class LocalCorpus:
         """Remove HTML tags from text."""
         if not text:
             return ''
-        clean = re.sub(r'<[^>]+>', '', text)
+        clean = strip_html(text)
         clean = re.sub(r'\s+', ' ', clean)
         return clean.strip()
     
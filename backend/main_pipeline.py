@@ -25,6 +25,7 @@ from typing import Optional, Dict, Any, List
 
 from models import MareiMekomosResult, ConfidenceLevel, QueryType, SourceLevel
 from source_output import sort_sources_chronologically
+from utils.text_arena import TextHandle
 
 # V7: Import clarification utilities
 try:
@@ -101,9 +102,15 @@ def _get_attr(source, key, default=None):
     return getattr(source, key, default)
 
 
+def _truncated_text(source, key: str, handle_attr: str, truncate: int) -> str:
+    # Step 3 sources expose TextHandles (handle_attr): slice without copying the full text
+    handle = None if isinstance(source, dict) else getattr(source, handle_attr, None)
+    if isinstance(handle, TextHandle):
+        return handle.truncated(truncate)
+    return (_get_attr(source, key, "") or "")[:truncate]
+
+
 def _serialize_source(source, truncate=500) -> dict:
-    hebrew_text = _get_attr(source, "hebrew_text", "") or ""
-    english_text = _get_attr(source, "english_text", "") or ""
     relevance_note = _get_attr(source, "relevance_description", "") or _get_attr(
         source, "relevance_note", ""
     )
@@ -113,8 +120,8 @@ def _serialize_source(source, truncate=500) -> dict:
         "he_ref": _get_attr(source, "he_ref"),
         "level": _map_source_level(_get_attr(source, "level")),
         "level_hebrew": _get_attr(source, "level_hebrew", ""),
-        "hebrew_text": hebrew_text[:truncate],
-        "english_text": english_text[:truncate],
+        "hebrew_text": _truncated_text(source, "hebrew_text", "hebrew", truncate),
+        "english_text": _truncated_text(source, "english_text", "english", truncate),
         "author": _get_attr(source, "author", ""),
         "categories": _get_attr(source, "categories", []) or [],
         "relevance_note": relevance_note,
@@ -123,6 +130,45 @@ def _serialize_source(source, truncate=500) -> dict:
     }
 
 
+async def attach_english(result: MareiMekomosResult, truncate: int = 500) -> MareiMekomosResult:
+    """
+    Fill in english_text for the sources in a finished result.
+
+    Step 3 fetches Hebrew only; English is fetched here, once per distinct
+    ref and only for the sources actually being returned, when the client
+    asked for it (include_english on /search and /search/clarify).
+    """
+    from step_three_search import MAX_CONCURRENT_REQUESTS, fetch_english
+    from tools.http_replay import client_session
+
+    sources = list(result.sources or [])
+    for level_sources in (result.sources_by_level or {}).values():
+        sources.extend(level_sources)
+    missing = {source.ref for source in sources if source.ref and not source.english_text}
+    if not missing:
+        return result
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def _fetch(ref: str, session):
+        async with semaphore:
+            try:
+                return ref, await fetch_english(ref, session)
+            except Exception as e:
+                logger.debug(f"English fetch failed for {ref}: {e}")
+                return ref, ""
+
+    async with client_session() as session:
+        english = dict(await asyncio.gather(*(_fetch(ref, session) for ref in sorted(missing))))
+
+    for source in sources:
+        if source.ref in english and not source.english_text:
+            source.english_text = english[source.ref][:truncate]
+
+    logger.info(f"Attached English to {sum(1 for text in english.values() if text)}/{len(missing)} refs")
+    return result
+
+
 def _build_failure_result(query: str, step1_result, message: str) -> MareiMekomosResult:
     return MareiMekomosResult(
         original_query=query,
@@ -355,6 +355,7 @@ class SearchRequest(BaseModel):
     """Request for full search."""
     query: str = Field(..., min_length=1, description="User's query")
     depth: str = Field("standard", description="Search depth")
+    include_english: bool = Field(False, description="Fetch English text for returned sources")
 
     @validator('query')
     def query_not_empty(cls, v):
@@ -369,6 +370,18 @@ class DecipherRequest(BaseModel):
     strict: bool = False
 
 
+class BatchDecipherRequest(BaseModel):
+    """Request for Step 1 on many queries at once."""
+    queries: List[str] = Field(..., min_length=1, max_length=200)
+
+    @validator('queries')
+    def queries_not_empty(cls, v):
+        queries = [q.strip() for q in v]
+        if not all(queries):
+            raise ValueError('Queries cannot be empty')
+        return queries
+
+
 class ConfirmRequest(BaseModel):
     """Confirm user's transliteration selection."""
     original_query: str
@@ -459,3 +472,5 @@ class ClarifyRequest(BaseModel):
 
     # Optional: user can provide custom input instead of picking option
     custom_clarification: Optional[str] = None
+
+    include_english: bool = False  # Fetch English text for returned sources
@@ -13,6 +13,9 @@ from typing import List, Optional, Dict
 import re
 import html
 
+from utils.hebrew_text import strip_niqqud
+from utils.refs import parse_ref
+
 # Initialize logging
 try:
     from logging_config import setup_logging
@@ -88,22 +91,9 @@ def extract_daf_number(ref: str) -> tuple:
     Returns tuple of (tractate, daf_num, amud) for sorting.
     amud: 0 for 'a', 1 for 'b'
     """
-    import re
-
-    # Pattern to extract daf reference like "4a", "4b", "104a", etc.
-    # Handle refs like "Pesachim 4a", "Rashi on Pesachim 4a:5:1", etc.
-    daf_pattern = r'(\d+)([ab])'
-
-    match = re.search(daf_pattern, ref.lower())
-    if match:
-        daf_num = int(match.group(1))
-        amud = 0 if match.group(2) == 'a' else 1
-
-        # Extract tractate name (first word, or word after "on")
-        tractate_match = re.search(r'(?:on\s+)?([A-Z][a-z]+)', ref)
-        tractate = tractate_match.group(1) if tractate_match else ""
-
-        return (tractate, daf_num, amud)
+    parsed = parse_ref(ref)
+    if parsed is not None:
+        return (parsed.book, parsed.daf, 1 if parsed.amud == "b" else 0)
 
     # Fallback for refs without standard daf pattern
     return ("", 999, 0)
@@ -179,28 +169,6 @@ def strip_html_tags(text: str) -> str:
     return text
 
 
-def strip_niqqud(text: str) -> str:
-    """
-    Strip Hebrew vowel points (nekudos/niqqud) from text.
-
-    This removes:
-    - Hebrew points (U+05B0-U+05BD): sheva, hiriq, tsere, segol, patah, qamats, holam, etc.
-    - Hebrew point dagesh/mapiq (U+05BC)
-    - Hebrew point shin/sin dot (U+05C1, U+05C2)
-    - Hebrew punctuation (U+05BE-U+05BF): maqaf, rafe
-    - Hebrew cantillation marks (U+0591-U+05AF): taamim
-    """
-    if not text:
-        return ""
-
-    # Remove cantillation marks (taamim) - U+0591 to U+05AF
-    # Remove vowel points (nekudos) - U+05B0 to U+05BD
-    # Remove other marks - U+05BF (rafe), U+05C1-U+05C2 (shin/sin dots), U+05C4-U+05C5, U+05C7
-    text = re.sub(r'[\u0591-\u05C7]', '', text)
-
-    return text
-
-
 def should_strip_niqqud_for_level(level_str: str) -> bool:
     """
     Determine if niqqud should be stripped for a given source level.
@@ -6,6 +6,8 @@ IMPROVEMENTS FROM V4.2:
 1. MULTI-TERM DICTIONARY: Uses lookup_all() to find multiple terms
    - "chezkas haguf chezkas mammon" → ['חזקת הגוף', 'חזקת ממון']
    - No longer stops at first match!
+   - Near-miss spellings ("chezkaz hagug") resolve through the dictionary's
+     fuzzy index instead of falling through to Sefaria validation
 
 2. AUTHOR-AWARE EXTRACTION: Skip phrase validation for known author names
    - Detects "ran", "rashi", "tosfos" etc. BEFORE trying phrase combinations
@@ -35,6 +37,7 @@ import sys
 import os
 import re
 import asyncio
+import contextvars
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
@@ -43,6 +46,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 # Import Pydantic models
 from models import DecipherResult, ConfidenceLevel
+from utils.hebrew_text import SOFIT_TABLE, strip_niqqud
 
 # Import V3 modules
 try:
@@ -425,6 +429,59 @@ async def find_best_validated(
     return best_result
 
 
+# Word -> validation task, shared by every query of a decipher_many() batch
+_batch_words: contextvars.ContextVar = contextvars.ContextVar("decipher_batch_words", default=None)
+
+
+async def _validate_word_uncached(
+    word: str,
+    validator,
+    max_variants: int
+) -> Tuple[List[str], Optional[Dict]]:
+    variants = generate_hebrew_variants(word, max_variants=max_variants)
+    if not variants:
+        return variants, None
+    return variants, await find_best_validated(variants, validator, word, parallel=True)
+
+
+async def validate_word(
+    word: str,
+    validator,
+    max_variants: int = 15
+) -> Tuple[List[str], Optional[Dict]]:
+    """
+    Generate variants for one word and find the best validated one: (variants, result).
+
+    Inside decipher_many() each distinct word is generated and validated
+    once; every query containing it awaits the same task.
+    """
+    batch = _batch_words.get()
+    if batch is None:
+        return await _validate_word_uncached(word, validator, max_variants)
+
+    key = (word, max_variants)
+    task = batch.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_validate_word_uncached(word, validator, max_variants))
+        batch[key] = task
+    return await task
+
+
+async def validate_words(
+    words: List[str],
+    validator,
+    max_variants: int = 15
+) -> List[Tuple[List[str], Optional[Dict]]]:
+    """
+    validate_word for every word at once, results in word order.
+
+    Words are independent, so a multi-word query costs one validation
+    round-trip instead of one per word; the validator's shared request
+    budget keeps the total number of in-flight searches bounded.
+    """
+    return list(await asyncio.gather(*(validate_word(word, validator, max_variants) for word in words)))
+
+
 # ==========================================
 #  AUTHOR-AWARE EXTRACTION (V4.2 NEW)
 # ==========================================
@@ -484,6 +541,7 @@ async def extract_hebrew_candidates(text: str) -> List[str]:
             # AUTHOR MODE: Don't try phrase validation, process words individually
             logger.debug(f"[EXTRACT] Author detected: '{first_word_cleaned}' - processing segment individually")
             
+            cleaned_words = []
             for word in segment:
                 if len(word) <= 1:
                     continue
@@ -493,11 +551,12 @@ async def extract_hebrew_candidates(text: str) -> List[str]:
                 cleaned_word, was_stripped = strip_english_suffixes(word)
                 if was_stripped:
                     logger.debug(f"[EXTRACT]   Stripped suffix: '{word}' → '{cleaned_word}'")
-                
-                # Validate individual word
-                word_variants = generate_hebrew_variants(cleaned_word, max_variants=8)
+                cleaned_words.append(cleaned_word)
+            
+            # Validate individual words (concurrently)
+            word_results = await validate_words(cleaned_words, validator, max_variants=8)
+            for cleaned_word, (word_variants, result) in zip(cleaned_words, word_results):
                 if word_variants:
-                    result = await find_best_validated(word_variants, validator, cleaned_word, parallel=True)
                     if result and result.get('hits', 0) > 0:
                         logger.debug(f"[EXTRACT]     ✓ '{cleaned_word}' validated ({result['hits']} hits)")
                         validated_candidates.append(cleaned_word)
@@ -525,6 +584,7 @@ async def extract_hebrew_candidates(text: str) -> List[str]:
             # Phrase didn't validate - try individual words
             logger.debug(f"[EXTRACT]   ✗ Full phrase didn't validate, trying individual words...")
             
+            cleaned_words = []
             for word in segment:
                 if len(word) <= 1:
                     continue
@@ -536,10 +596,11 @@ async def extract_hebrew_candidates(text: str) -> List[str]:
                     logger.debug(f"[EXTRACT]   Stripped suffix: '{word}' → '{cleaned_word}'")
                 
                 logger.debug(f"[EXTRACT]   Checking word: '{cleaned_word}'")
-                word_variants = generate_hebrew_variants(cleaned_word, max_variants=8)
-                
+                cleaned_words.append(cleaned_word)
+            
+            word_results = await validate_words(cleaned_words, validator, max_variants=8)
+            for cleaned_word, (word_variants, result) in zip(cleaned_words, word_results):
                 if word_variants:
-                    result = await find_best_validated(word_variants, validator, cleaned_word, parallel=True)
                     if result and result.get('hits', 0) > 0:
                         logger.debug(f"[EXTRACT]     ✓ Word '{cleaned_word}' validated ({result['hits']} hits)")
                         validated_candidates.append(cleaned_word)
@@ -567,11 +628,7 @@ def normalize_hebrew(text: str) -> str:
     if not text:
         return ""
     text = re.sub(r'[\s,.;:!?()\[\]{}"\'\-]', '', text)
-    finals = {'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'}
-    for f, s in finals.items():
-        text = text.replace(f, s)
-    text = re.sub(r'[\u0591-\u05C7]', '', text)
-    return text
+    return strip_niqqud(text).translate(SOFIT_TABLE)
 
 
 # ==========================================
@@ -630,24 +687,36 @@ async def decipher_single(query: str) -> DecipherResult:
     # V4.3: Try lookup_all first to find multiple terms
     # This handles "chezkas haguf chezkas mammon" → both terms!
     # V4.5 FIX: Also process UNMATCHED words through transliteration
-    if hasattr(dictionary, 'lookup_all'):
-        all_matches = dictionary.lookup_all(normalized_query)
+    # V4.6: find_matches() reports word positions, so the unmatched words
+    # are read off directly (repeated words are no longer conflated)
+    if hasattr(dictionary, 'find_matches'):
+        all_matches = dictionary.find_matches(normalized_query)
 
         # Find unmatched words that need transliteration
         words = normalized_query.split()
-        matched_words = set()
-        for translit, _, _ in (all_matches or []):
-            matched_words.update(translit.split())
-        unmatched_words = [w for w in words if w not in matched_words]
+        covered = [False] * len(words)
+        for match in all_matches:
+            covered[match.start:match.end] = [True] * (match.end - match.start)
+        unmatched_words = [w for w, is_covered in zip(words, covered) if not is_covered]
+
+        # Near-miss spellings resolved by the dictionary's fuzzy index
+        fuzzy_matches = [match for match in all_matches if match.is_fuzzy]
 
         if all_matches and not unmatched_words:
             # All words matched - return dictionary results
-            hebrew_terms = [hebrew for _, hebrew, _ in all_matches]
-            translit_terms = [translit for translit, _, _ in all_matches]
+            hebrew_terms = [match.hebrew for match in all_matches]
+            translit_terms = [match.transliteration for match in all_matches]
 
             logger.info(f"    ✓ Dictionary HIT: Found {len(all_matches)} term(s)")
-            for translit, hebrew, _ in all_matches:
-                logger.info(f"      '{translit}' → '{hebrew}'")
+            for match in all_matches:
+                if match.is_fuzzy:
+                    logger.info(f"      '{match.transliteration}' → '{match.hebrew}' (fuzzy: '{match.key}', distance {match.distance})")
+                else:
+                    logger.info(f"      '{match.transliteration}' → '{match.hebrew}'")
+
+            # A typo'd spelling is still a dictionary term, just a less certain one
+            confidence = ConfidenceLevel.MEDIUM if fuzzy_matches else ConfidenceLevel.HIGH
+            method_suffix = "_fuzzy" if fuzzy_matches else ""
 
             # If multiple terms, combine them
             if len(hebrew_terms) > 1:
@@ -656,8 +725,8 @@ async def decipher_single(query: str) -> DecipherResult:
                     success=True,
                     hebrew_term=primary_term,
                     hebrew_terms=hebrew_terms,
-                    confidence=ConfidenceLevel.HIGH,
-                    method="dictionary_multi",
+                    confidence=confidence,
+                    method="dictionary_multi" + method_suffix,
                     message=f"Found {len(hebrew_terms)} terms in dictionary: {translit_terms}",
                     is_mixed_query=False,
                     original_query=query,
@@ -669,8 +738,8 @@ async def decipher_single(query: str) -> DecipherResult:
                     success=True,
                     hebrew_term=hebrew_terms[0],
                     hebrew_terms=hebrew_terms,
-                    confidence=ConfidenceLevel.HIGH,
-                    method="dictionary",
+                    confidence=confidence,
+                    method="dictionary" + method_suffix,
                     message=f"Found in dictionary cache",
                     is_mixed_query=False,
                     original_query=query,
@@ -679,17 +748,18 @@ async def decipher_single(query: str) -> DecipherResult:
         elif all_matches and unmatched_words:
             # PARTIAL match - some words in dict, some need transliteration
             logger.info(f"    ✓ Dictionary PARTIAL: Found {len(all_matches)} term(s), {len(unmatched_words)} unmatched")
-            for translit, hebrew, _ in all_matches:
-                logger.info(f"      '{translit}' → '{hebrew}'")
+            for match in all_matches:
+                via = f" (fuzzy: '{match.key}')" if match.is_fuzzy else ""
+                logger.info(f"      '{match.transliteration}' → '{match.hebrew}'{via}")
             logger.info(f"    Unmatched words need transliteration: {unmatched_words}")
             # Don't return - continue to transliteration for unmatched words
             # Store matched results to combine later
-            dict_hebrew_terms = [hebrew for _, hebrew, _ in all_matches]
+            dict_hebrew_terms = [match.hebrew for match in all_matches]
         else:
             dict_hebrew_terms = []
             unmatched_words = words  # All words need transliteration
     else:
-        # Fallback to legacy lookup() if lookup_all not available
+        # Fallback to legacy lookup() if find_matches not available
         cached_result = dictionary.lookup(normalized_query)
         
         if cached_result:
@@ -719,27 +789,23 @@ async def decipher_single(query: str) -> DecipherResult:
     # ========================================
     # TOOL 2: Transliteration Map
     # ========================================
-    # V4.5: Process each unmatched word separately
+    # V4.5: Process each unmatched word separately (validated concurrently)
     transliterated_terms = []
 
-    for word in unmatched_words:
-        logger.debug(f"  [TOOL 2] Transliteration Map - Generating variants for '{word}'...")
+    # ========================================
+    # TOOL 3: Sefaria Validation (Author-Aware)
+    # ========================================
+    validator = get_validator()
+    logger.debug(f"  [TOOL 2+3] Generating and validating variants for {len(unmatched_words)} word(s) concurrently...")
+    word_results = await validate_words(unmatched_words, validator, max_variants=15)
 
-        variants = generate_hebrew_variants(word, max_variants=15)
-        logger.debug(f"    Generated {len(variants)} variants")
+    for word, (variants, validation_result) in zip(unmatched_words, word_results):
+        logger.debug(f"    '{word}': generated {len(variants)} variants")
 
         if not variants:
             logger.warning(f"  No variants generated for '{word}'")
             continue
 
-        # ========================================
-        # TOOL 3: Sefaria Validation (Author-Aware)
-        # ========================================
-        logger.debug(f"  [TOOL 3] Sefaria Validation - Finding best validated term for '{word}'...")
-
-        validator = get_validator()
-        validation_result = await find_best_validated(variants, validator, word, parallel=True)
-
         if validation_result and validation_result.get('hits', 0) > 0:
             hebrew_term = validation_result['term']
             hits = validation_result.get('hits', 0)
@@ -871,11 +937,13 @@ async def decipher(query: str) -> DecipherResult:
         all_hebrew_terms = []
         all_confidences = []
         
-        for idx, candidate in enumerate(candidates, start=1):
+        # Candidates are independent - decipher them concurrently, report in order
+        results = await asyncio.gather(*(decipher_single(candidate) for candidate in candidates))
+        
+        for idx, (candidate, result) in enumerate(zip(candidates, results), start=1):
             logger.info("")
             logger.info("Candidate %d/%d: '%s'", idx, len(candidates), candidate)
             logger.info("-" * 40)
-            result = await decipher_single(candidate)
             
             if result.success or result.hebrew_term:
                 # V4.3: Handle multi-term results from dictionary
@@ -940,6 +1008,60 @@ async def decipher(query: str) -> DecipherResult:
         return result
 
 
+# ==========================================
+#  BATCH DECIPHER
+# ==========================================
+
+async def decipher_many(queries: List[str]) -> List[DecipherResult]:
+    """
+    Decipher many queries at once (e.g. every term of a shiur outline).
+
+    Results are in input order. Compared with calling decipher() per query:
+    - Repeated queries are deciphered once
+    - The dictionary is refreshed once, up front
+    - All queries run concurrently and share one word table, so a word
+      appearing in several queries has its variants generated and
+      validated once, and every remaining variant is validated in the
+      same concurrent pass (bounded by the validator's request budget)
+
+    A query that raises gets a failed DecipherResult; the rest still return.
+    """
+    unique = list(dict.fromkeys(queries))
+    logger.info(f"[DECIPHER_MANY] {len(queries)} queries ({len(unique)} distinct)")
+
+    dictionary = get_dictionary()
+    if hasattr(dictionary, 'refresh'):
+        dictionary.refresh()
+
+    batch: Dict = {}
+    token = _batch_words.set(batch)
+    try:
+        # gather() wraps each decipher in a task that copies this context,
+        # so they all see the same word table
+        outcomes = await asyncio.gather(*(decipher(query) for query in unique), return_exceptions=True)
+    finally:
+        _batch_words.reset(token)
+
+    by_query: Dict[str, DecipherResult] = {}
+    for query, outcome in zip(unique, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"[DECIPHER_MANY] '{query}' failed: {outcome}")
+            outcome = DecipherResult(
+                success=False,
+                hebrew_term=None,
+                hebrew_terms=[],
+                confidence=ConfidenceLevel.LOW,
+                method="failed",
+                message=str(outcome),
+                original_query=query,
+                extraction_confident=False
+            )
+        by_query[query] = outcome
+
+    logger.info(f"[DECIPHER_MANY] Validated {len(batch)} distinct word(s)")
+    return [by_query[query] for query in queries]
+
+
 # ==========================================
 #  QUICK TEST
 # ==========================================
@@ -16,16 +16,24 @@ KEY IMPROVEMENTS:
 """
 
 import logging
-import re
 import json
 import asyncio
 import aiohttp
 from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Any, Union
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+
+from tools.http_replay import client_session
+from tools.link_classifier import get_link_classifier
+from tools.sefaria_client import TEXT_VERSION_PARAMS, legacy_text_shape
+from utils.hebrew_text import NormalizedText, fold_for_search, strip_niqqud
+from utils.refs import hebrew_daf_label, parse_ref
+from utils.text_arena import TextHandle, text_arena_scope, text_handle
+from variant_lexicon import get_variant_lexicon
 
 # =============================================================================
 #  LOGGING SETUP
@@ -34,11 +42,6 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 
-def strip_niqqud(text: str) -> str:
-    """Strip Hebrew vowel points (niqqud) for text matching."""
-    return re.sub(r'[\u0591-\u05C7]', '', text)
-
-
 def log_section(title: str) -> None:
     """Log a major section header."""
     border = "=" * 70
@@ -160,11 +163,59 @@ except ImportError:
     logger.warning("Local corpus not available, will use Sefaria API only")
     MASECHTA_MAP = {}
 
+# NumPy backs the segment scoring matrix when installed (pure-Python fallback otherwise)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 
 SEFARIA_BASE_URL = getattr(settings, 'sefaria_base_url', "https://www.sefaria.org/api")
 DEFAULT_BUFFER_SIZE = 1
 MAX_CONCURRENT_REQUESTS = 5
 
+# Fetch /related once per daf and split its links by anchor segment locally,
+# instead of one /related call per relevant segment (see trickle_up_filtered).
+PARTITION_RELATED_BY_DAF = True
+
+# Commentary budget for trickle_up_filtered: candidates are ranked by cheap
+# signals and fetched in priority order until this many score >= 2.0.
+# 0 fetches every matching commentary.
+COMMENTARY_BUDGET = getattr(settings, 'commentary_budget', 15)
+COMMENTARY_FETCH_LIMIT_FACTOR = 4  # Never fetch more than budget * this
+
+# Fetch only the Hebrew version of texts (everything Step 3 scores is Hebrew);
+# English is fetched separately via fetch_english when a client asks for it.
+HEBREW_ONLY_TEXTS = getattr(settings, 'hebrew_only_texts', True)
+
+# fetch_texts coalesces adjacent amudim (4a, 4b, 5a...) into one range request
+# of at most this many amudim. 1 fetches every ref on its own.
+RANGE_FETCH_MAX_AMUDIM = getattr(settings, 'range_fetch_max_amudim', 8)
+
+# Keys of a range response that describe the whole range, not one amud
+RANGE_ONLY_RESPONSE_KEYS = {
+    "ref", "heRef", "sectionRef", "heSectionRef", "sections", "toSections",
+    "spanningRefs", "isSpanning", "next", "prev", "firstAvailableSectionRef",
+}
+
+# Shared on-disk response cache for the Sefaria helpers below.
+# Filled at request time and ahead of time by cache_warmer.py.
+try:
+    from tools.sefaria_client import FileCache
+    RESPONSE_CACHE = FileCache(cache_dir="cache/sefaria") if getattr(settings, 'use_cache', True) else None
+except ImportError:
+    RESPONSE_CACHE = None
+    logger.warning("Response cache not available, Sefaria responses will not be cached")
+
+
+def response_cache_key(endpoint: str, ref: str, language: Optional[str] = None) -> str:
+    """Cache key for a Step 3 Sefaria response ("text" or "related", optionally per language)."""
+    if language:
+        return f"step3:{endpoint}:{language}:{ref}"
+    return f"step3:{endpoint}:{ref}"
+
 
 # =============================================================================
 #  V5: PROPER RISHON-TO-SEFARIA MAPPING
@@ -331,73 +382,10 @@ RISHON_SEFARIA_MAP = {
     },
 }
 
-# V5: Better category-to-level mapping with exclusions
-CATEGORY_TO_LEVEL = {
-    "Tanakh": SourceLevel.CHUMASH,
-    "Torah": SourceLevel.CHUMASH,
-    "Prophets": SourceLevel.CHUMASH,
-    "Writings": SourceLevel.CHUMASH,
-    "Mishnah": SourceLevel.MISHNA,
-    "Talmud": SourceLevel.GEMARA,
-    "Bavli": SourceLevel.GEMARA,
-    "Yerushalmi": SourceLevel.GEMARA,
-    "Midrash": SourceLevel.RISHONIM,
-    "Rashi": SourceLevel.RASHI,
-    "Tosafot": SourceLevel.TOSFOS,
-    "Rishonim": SourceLevel.RISHONIM,
-    "Rambam": SourceLevel.RAMBAM,
-    "Mishneh Torah": SourceLevel.RAMBAM,
-    "Tur": SourceLevel.TUR,
-    "Shulchan Arukh": SourceLevel.SHULCHAN_ARUCH,
-    "Acharonim": SourceLevel.ACHARONIM,
-}
+# Level, target and exclusion tables (CATEGORY_TO_LEVEL, SOURCE_NAME_MAP,
+# EXCLUSION_PATTERNS, UNCONVENTIONAL_SOURCE_PATTERNS) live in
+# tools/link_classifier.py, shared with SefariaClient.
 
-# V5: Expanded source name map with proper patterns
-SOURCE_NAME_MAP = {
-    "gemara": ["Talmud", "Bavli"],
-    "rashi": ["Rashi on"],
-    "tosafos": ["Tosafot on", "Tosafos on"],
-    "ran": ["Ran on Rif", "Chiddushei HaRan"],  # V5: Fixed - Ran writes on Rif!
-    "rashba": ["Rashba on"],
-    "ritva": ["Ritva on"],
-    "ramban": ["Ramban on"],
-    "rambam": ["Rambam", "Mishneh Torah"],
-    "rosh": ["Rosh on"],
-    "rif": ["Rif "],  # Note the space to avoid matching other things
-    "meiri": ["Meiri on"],
-    "shulchan_arukh": ["Shulchan Arukh"],
-    "mishnah_berurah": ["Mishnah Berurah"],
-    "taz": ["Taz", "Turei Zahav"],
-    "shach": ["Shakh", "Siftei Kohen"],
-    "magen_avraham": ["Magen Avraham"],
-    "ketzos": ["Ketzot HaChoshen", "Ketzos"],
-    "nesivos": ["Netivot HaMishpat", "Nesivos"],
-    "chumash": ["Torah", "Tanakh"],
-}
-
-# V5: Exclusion patterns - refs that should NOT match certain categories
-EXCLUSION_PATTERNS = {
-    "ran": ["Likutei Moharan", "Otzar", "Midrash"],  # These are NOT Ran
-    "rashi": ["Otzar", "Likutei"],
-    "tosafos": ["Piskei Tosafot"],  # This is a summary, not Tosafos itself
-}
-
-# V6.1: Unconventional sources to exclude from results
-# These are modern/academic sources that clutter the marei mekomos
-UNCONVENTIONAL_SOURCE_PATTERNS = [
-    "Steinsaltz",           # Modern Steinsaltz commentary/elucidation
-    "Introductions to the Babylonian Talmud",  # Sefaria introductions
-    "Introduction to",      # Various introductions
-    "Koren",               # Koren translations/editions
-    "William Davidson",     # William Davidson translation
-    "Jastrow",             # Dictionary
-    "Guide for the Perplexed",  # Rambam's philosophical work (usually not relevant)
-    "The Commentators",     # Generic commentary collections
-    "Sefer HaChinukh",      # Usually background, not primary
-    "Encyclopedia",         # Encyclopedia entries
-    "Otzar Laazei Rashi",   # Rashi glossary
-    "Otzar HaGeonim",       # Geonic anthology (usually background)
-]
 
 def is_unconventional_source(ref: str, categories: List[str] = None) -> bool:
     """
@@ -405,46 +393,107 @@ def is_unconventional_source(ref: str, categories: List[str] = None) -> bool:
 
     Returns True if the source should be excluded from results.
     """
-    ref_lower = ref.lower()
-
-    for pattern in UNCONVENTIONAL_SOURCE_PATTERNS:
-        if pattern.lower() in ref_lower:
-            return True
-
-    # Also check categories if provided
-    if categories:
-        cat_str = " ".join(categories).lower()
-        for pattern in UNCONVENTIONAL_SOURCE_PATTERNS:
-            if pattern.lower() in cat_str:
-                return True
-
-    return False
+    return get_link_classifier().is_unconventional(ref, categories)
 
 
 # =============================================================================
 #  DATA STRUCTURES
 # =============================================================================
 
-@dataclass
 class Source:
-    """A single source with text and metadata."""
-    ref: str
-    he_ref: str = ""
-    level: SourceLevel = SourceLevel.OTHER
-    hebrew_text: str = ""
-    english_text: str = ""
-    author: str = ""
-    categories: List[str] = field(default_factory=list)
-    is_foundation: bool = False
-    is_verified: bool = False
-    verification_keywords_found: List[str] = field(default_factory=list)
-    # V4: Nuance scoring
-    is_landmark: bool = False
-    is_primary: bool = True
-    focus_score: float = 0.0
-    tier: str = "background"
-    # V5: Segment info
-    segment_index: Optional[int] = None  # Which segment of the daf this is from
+    """
+    A single source with text and metadata.
+
+    Slotted, with hebrew_text/english_text stored once in the request's
+    TextArena (see utils/text_arena.py). hebrew_text/english_text read and
+    write the full text as before; the `hebrew`/`english` handles give
+    truncated slices and snippets without copying the whole text.
+
+    hebrew_normalized is the NormalizedText every keyword matcher takes -
+    passed in by the fetch site that already built it for verification,
+    else computed on first use, and dropped when hebrew_text is replaced.
+    """
+
+    __slots__ = (
+        'ref', 'he_ref', 'level', '_hebrew', '_hebrew_norm', '_english', 'author', 'categories',
+        'is_foundation', 'is_verified', 'verification_keywords_found',
+        'is_landmark', 'is_primary', 'focus_score', 'tier', 'segment_index',
+    )
+
+    def __init__(
+        self,
+        ref: str,
+        he_ref: str = "",
+        level: SourceLevel = SourceLevel.OTHER,
+        hebrew_text: str = "",
+        english_text: str = "",
+        author: str = "",
+        categories: Optional[List[str]] = None,
+        is_foundation: bool = False,
+        is_verified: bool = False,
+        verification_keywords_found: Optional[List[str]] = None,
+        # V4: Nuance scoring
+        is_landmark: bool = False,
+        is_primary: bool = True,
+        focus_score: float = 0.0,
+        tier: str = "background",
+        # V5: Segment info
+        segment_index: Optional[int] = None,  # Which segment of the daf this is from
+        hebrew_normalized: Optional[NormalizedText] = None,
+    ):
+        self.ref = ref
+        self.he_ref = he_ref
+        self.level = level
+        self._hebrew = text_handle(hebrew_text)
+        self._hebrew_norm = hebrew_normalized
+        self._english = text_handle(english_text)
+        self.author = author
+        self.categories = categories if categories is not None else []
+        self.is_foundation = is_foundation
+        self.is_verified = is_verified
+        self.verification_keywords_found = verification_keywords_found if verification_keywords_found is not None else []
+        self.is_landmark = is_landmark
+        self.is_primary = is_primary
+        self.focus_score = focus_score
+        self.tier = tier
+        self.segment_index = segment_index
+
+    @property
+    def hebrew(self) -> TextHandle:
+        return self._hebrew
+
+    @property
+    def english(self) -> TextHandle:
+        return self._english
+
+    @property
+    def hebrew_text(self) -> str:
+        return self._hebrew.text
+
+    @hebrew_text.setter
+    def hebrew_text(self, value: str) -> None:
+        self._hebrew = text_handle(value)
+        self._hebrew_norm = None
+
+    @property
+    def hebrew_normalized(self) -> NormalizedText:
+        if self._hebrew_norm is None:
+            self._hebrew_norm = NormalizedText(self.hebrew_text)
+        return self._hebrew_norm
+
+    @property
+    def english_text(self) -> str:
+        return self._english.text
+
+    @english_text.setter
+    def english_text(self, value: str) -> None:
+        self._english = text_handle(value)
+
+    def __repr__(self) -> str:
+        return (
+            f"Source(ref={self.ref!r}, level={self.level!r}, author={self.author!r}, "
+            f"focus_score={self.focus_score!r}, hebrew={len(self._hebrew)} chars)"
+        )
 
 
 @dataclass
@@ -470,6 +519,17 @@ class LandmarkResult:
     topic_keywords_found: List[str] = field(default_factory=list)
 
 
+@dataclass
+class CommentaryCandidate:
+    """A commentary link found by trickle-up, before its text is fetched."""
+    ref: str
+    segment_index: int
+    matched_target: str
+    collective_title: str = ""
+    anchor_score: float = 0.0
+    priority: float = 0.0
+
+
 @dataclass
 class SearchResult:
     """Complete search result - V5 with topic-filtered sources."""
@@ -513,35 +573,241 @@ class SearchResult:
 #  SEFARIA API HELPERS
 # =============================================================================
 
-async def fetch_text(ref: str, session: aiohttp.ClientSession) -> Optional[Dict]:
-    """Fetch text from Sefaria API."""
-    try:
-        encoded_ref = ref.replace(" ", "%20")
+def _cache_get(key: str, url: str = None) -> Optional[Dict]:
+    """
+    Read a cached Sefaria response, if caching is enabled.
+
+    Stale entries (past TTL, within max-age) are returned as-is; when a url
+    is given they are refreshed from it in the background.
+    """
+    if RESPONSE_CACHE is None:
+        return None
+    cached, is_stale = RESPONSE_CACHE.get_entry(key)
+    if cached is not None and is_stale and url:
+        RESPONSE_CACHE.revalidate(key, lambda: _refresh_cached(url, key))
+    return cached
+
+
+def _cache_set(key: str, data: Dict) -> None:
+    """Store a Sefaria response, skipping error payloads so they can be retried."""
+    if RESPONSE_CACHE is None or not data:
+        return
+    if isinstance(data, dict) and data.get("error"):
+        return
+    RESPONSE_CACHE.set(key, data)
+
+
+async def _fetch_json(url: str, session: aiohttp.ClientSession, cache_key: Optional[str] = None) -> Optional[Dict]:
+    """GET a Sefaria endpoint and cache a 200 response under cache_key (if given)."""
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+        if response.status == 200:
+            data = await response.json()
+            if cache_key:
+                _cache_set(cache_key, data)
+            return data
+        logger.debug(f"Sefaria returned {response.status} for {url}")
+        return None
+
+
+async def _refresh_cached(url: str, cache_key: str) -> None:
+    """Background revalidation - uses its own session since the caller's may be closed."""
+    async with client_session() as session:
+        await _fetch_json(url, session, cache_key)
+
+
+def _text_request(ref: str, language: str = "he") -> Tuple[str, str]:
+    """(url, cache_key) fetch_text uses for a ref in a language."""
+    encoded_ref = ref.replace(" ", "%20")
+    if language == "all" or not HEBREW_ONLY_TEXTS:
         url = f"{SEFARIA_BASE_URL}/texts/{encoded_ref}?context=0"
-        
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                logger.debug(f"Sefaria returned {response.status} for {ref}")
-                return None
+        return url, response_cache_key("text", ref)
+    versions = "&".join(f"{key}={value}" for key, value in TEXT_VERSION_PARAMS[language])
+    url = f"{SEFARIA_BASE_URL}/v3/texts/{encoded_ref}?{versions}"
+    return url, response_cache_key("text", ref, language)
+
+
+def _has_cached_text(ref: str, language: str = "he") -> bool:
+    """True if fetch_text would answer this ref from the response cache."""
+    if RESPONSE_CACHE is None:
+        return False
+    _, cache_key = _text_request(ref, language)
+    if RESPONSE_CACHE.get_entry(cache_key)[0] is not None:
+        return True
+    return language != "all" and RESPONSE_CACHE.get_entry(response_cache_key("text", ref))[0] is not None
+
+
+async def fetch_text(ref: str, session: aiohttp.ClientSession, language: str = "he") -> Optional[Dict]:
+    """
+    Fetch text from Sefaria API (served from the response cache when present).
+
+    language="he" (every scoring path) asks the v3 API for the Hebrew version
+    only; "en" fetches just the English and "all" the bilingual legacy
+    payload. The response always has the legacy "he"/"text" keys.
+    """
+    url, cache_key = _text_request(ref, language)
+
+    cached = _cache_get(cache_key, url)
+    if cached is None and language != "all":
+        # A bilingual entry (older cache, or an "all" fetch) has both languages
+        cached = _cache_get(response_cache_key("text", ref))
+    if cached is not None:
+        return legacy_text_shape(cached)
+
+    try:
+        return legacy_text_shape(await _fetch_json(url, session, cache_key))
     except Exception as e:
         logger.debug(f"Error fetching {ref}: {e}")
         return None
 
 
+async def fetch_english(ref: str, session: aiohttp.ClientSession) -> str:
+    """English text of a ref, fetched on its own (empty if Sefaria has none)."""
+    response = await fetch_text(ref, session, language="en")
+    _, en_text = extract_text_content(response)
+    return en_text
+
+
+def plan_text_fetches(refs: List[str], max_amudim: int = RANGE_FETCH_MAX_AMUDIM) -> List[List[str]]:
+    """
+    Group refs into fetches: runs of adjacent whole amudim of the same text
+    ("Pesachim 4a", "Pesachim 4b", "Pesachim 5a") become one group of at
+    most max_amudim refs; anything else (segment refs, ranges, non-daf refs)
+    is fetched on its own.
+    """
+    groups: List[List[str]] = []
+    runs: Dict[Tuple, List[Tuple[int, str]]] = defaultdict(list)
+
+    for ref in dict.fromkeys(refs):
+        parsed = parse_ref(ref)
+        if max_amudim < 2 or parsed is None or parsed.segment is not None or parsed.end_daf is not None:
+            groups.append([ref])
+            continue
+        runs[(parsed.commentator, parsed.book)].append((parsed.position, ref))
+
+    for members in runs.values():
+        members.sort()
+        run: List[str] = []
+        last_position = None
+        for position, ref in members:
+            if run and (position != last_position + 1 or len(run) >= max_amudim):
+                groups.append(run)
+                run = []
+            run.append(ref)
+            last_position = position
+        groups.append(run)
+
+    return groups
+
+
+def split_range_response(response: Optional[Dict], refs: List[str]) -> Optional[Dict[str, Dict]]:
+    """
+    Split a legacy-shaped response for a range ("Pesachim 4a-5b") into one
+    response per amud, shaped as if each ref had been fetched on its own.
+
+    Returns None if the response doesn't have one section per ref (a missing
+    amud, an unexpected shape) - the caller then fetches the refs singly.
+    """
+    if not response:
+        return None
+
+    sections = {}
+    for key in ("he", "text"):
+        value = response.get(key)
+        if not value:
+            sections[key] = [[] for _ in refs]
+        elif isinstance(value, list) and len(value) == len(refs) and all(isinstance(v, list) for v in value):
+            sections[key] = value
+        else:
+            return None
+
+    he_title = response.get("heIndexTitle") or response.get("heTitle")
+    shared = {
+        key: value for key, value in response.items()
+        if key not in RANGE_ONLY_RESPONSE_KEYS and key not in ("he", "text")
+    }
+    pieces = {}
+    for i, ref in enumerate(refs):
+        piece = dict(shared)
+        piece["ref"] = ref
+        piece["sectionRef"] = ref
+        parsed = parse_ref(ref)
+        if he_title and parsed is not None:
+            piece["heRef"] = f"{he_title} {hebrew_daf_label(parsed.daf, parsed.amud)}"
+        piece["he"] = sections["he"][i]
+        piece["text"] = sections["text"][i]
+        pieces[ref] = piece
+    return pieces
+
+
+async def _fetch_range(
+    refs: List[str],
+    session: aiohttp.ClientSession,
+    language: str
+) -> Optional[Dict[str, Dict]]:
+    """Fetch a run of adjacent amudim as one range and split it; pieces are cached per amud."""
+    first, last = parse_ref(refs[0]), parse_ref(refs[-1])
+    range_ref = f"{first.amud_ref}-{last.daf_label}"
+    url, _ = _text_request(range_ref, language)
+    try:
+        pieces = split_range_response(legacy_text_shape(await _fetch_json(url, session)), refs)
+    except Exception as e:
+        logger.debug(f"Error fetching {range_ref}: {e}")
+        return None
+    if pieces is None:
+        logger.debug(f"Could not split {range_ref} per amud - fetching singly")
+        return None
+
+    for ref, piece in pieces.items():
+        _cache_set(_text_request(ref, language)[1], piece)
+    return pieces
+
+
+async def fetch_texts(
+    refs: List[str],
+    session: aiohttp.ClientSession,
+    language: str = "he"
+) -> Dict[str, Optional[Dict]]:
+    """
+    fetch_text for several refs at once, coalescing adjacent amudim.
+
+    Uncached runs like Pesachim 4a, 4b, 5a, 5b go out as a single
+    "Pesachim 4a-5b" request whose response is split back per amud; every
+    ref maps to exactly what fetch_text(ref) would have returned.
+    """
+    texts: Dict[str, Optional[Dict]] = {}
+    uncached = []
+    for ref in dict.fromkeys(refs):
+        if _has_cached_text(ref, language):
+            texts[ref] = await fetch_text(ref, session, language)
+        else:
+            uncached.append(ref)
+
+    async def fetch_group(group: List[str]) -> None:
+        pieces = await _fetch_range(group, session, language) if len(group) > 1 else None
+        if pieces is None:
+            pieces = dict(zip(group, await asyncio.gather(*(fetch_text(ref, session, language) for ref in group))))
+        texts.update(pieces)
+
+    groups = plan_text_fetches(uncached)
+    if len(groups) < len(uncached):
+        logger.info(f"  Fetching {len(uncached)} texts in {len(groups)} requests (adjacent amudim coalesced)")
+    for start in range(0, len(groups), MAX_CONCURRENT_REQUESTS):
+        await asyncio.gather(*(fetch_group(group) for group in groups[start:start + MAX_CONCURRENT_REQUESTS]))
+
+    return texts
+
+
 async def fetch_related(ref: str, session: aiohttp.ClientSession) -> Optional[Dict]:
     """Fetch related texts (commentaries, links) from Sefaria."""
+    encoded_ref = ref.replace(" ", "%20")
+    url = f"{SEFARIA_BASE_URL}/related/{encoded_ref}"
+    cache_key = response_cache_key("related", ref)
+    cached = _cache_get(cache_key, url)
+    if cached is not None:
+        return cached
+
     try:
-        encoded_ref = ref.replace(" ", "%20")
-        url = f"{SEFARIA_BASE_URL}/related/{encoded_ref}"
-        
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                logger.debug(f"Sefaria related returned {response.status} for {ref}")
-                return None
+        return await _fetch_json(url, session, cache_key)
     except Exception as e:
         logger.debug(f"Error fetching related for {ref}: {e}")
         return None
@@ -563,14 +829,25 @@ async def fetch_links(ref: str, session: aiohttp.ClientSession) -> Optional[List
         return None
 
 
-async def sefaria_search(query: str, session: aiohttp.ClientSession, filters: Dict = None) -> Optional[Dict]:
-    """Search Sefaria for a query."""
+async def sefaria_search(
+    query: str,
+    session: aiohttp.ClientSession,
+    filters: Dict = None,
+    size: int = 10
+) -> Optional[Dict]:
+    """
+    Search Sefaria for a query.
+
+    Callers only read _source.ref from the top few hits, so only that
+    field is requested.
+    """
     try:
         url = f"{SEFARIA_BASE_URL}/search-wrapper"
         params = {
             "query": query,
             "type": "text",
-            "size": 20
+            "size": size,
+            "source_proj": "ref",
         }
         if filters:
             params.update(filters)
@@ -629,7 +906,8 @@ def extract_text_segments(sefaria_response: Dict) -> List[Dict]:
     with their index, Hebrew text, and English text.
 
     Returns:
-        List of dicts with keys: index, he_text, en_text
+        List of dicts with keys: index, he_text, en_text, he_norm
+        (he_norm is the NormalizedText of he_text, computed once here)
     """
     segments = []
 
@@ -645,7 +923,8 @@ def extract_text_segments(sefaria_response: Dict) -> List[Dict]:
             segments.append({
                 "index": 1,
                 "he_text": he,
-                "en_text": en if isinstance(en, str) else ""
+                "en_text": en if isinstance(en, str) else "",
+                "he_norm": NormalizedText(he),
             })
         return segments
 
@@ -672,7 +951,8 @@ def extract_text_segments(sefaria_response: Dict) -> List[Dict]:
                 segments.append({
                     "index": i + 1,  # 1-indexed like Sefaria
                     "he_text": he_text,
-                    "en_text": en_text
+                    "en_text": en_text,
+                    "he_norm": NormalizedText(he_text),
                 })
 
     return segments
@@ -702,31 +982,26 @@ def find_relevant_segments(
 
     matching_indices = []
 
+    matrix = SegmentScoreMatrix(
+        [seg.get("he_norm") or NormalizedText(seg.get("he_text", "")) for seg in segments],
+        focus_terms or []
+    )
+
     # Strategy 1: Look for target_segments text (strip niqqud for matching)
     if target_segments:
         for target in target_segments:
-            target_stripped = strip_niqqud(target)
-            for seg in segments:
-                he_text = seg.get("he_text", "")
-                he_stripped = strip_niqqud(he_text)
-                if target_stripped in he_stripped:
-                    matching_indices.append(seg["index"] - 1)  # Convert to 0-indexed
-                    logger.debug(f"    Found target segment '{target[:30]}...' at index {seg['index']}")
-                    break
-            if matching_indices:
+            row = matrix.first_literal_match(target)
+            if row >= 0:
+                matching_indices.append(segments[row]["index"] - 1)  # Convert to 0-indexed
+                logger.debug(f"    Found target segment '{target[:30]}...' at index {segments[row]['index']}")
                 break
 
     # Strategy 2: Fall back to focus_terms - find ALL matching segments
     if not matching_indices and focus_terms:
-        for i, seg in enumerate(segments):
-            he_text = seg.get("he_text", "")
-            he_stripped = strip_niqqud(he_text)
-            for term in focus_terms:
-                term_stripped = strip_niqqud(term)
-                if term_stripped in he_stripped:
-                    matching_indices.append(i)
-                    logger.debug(f"    Found focus term '{term}' at index {i + 1}")
-                    break  # Only count each segment once
+        for i, has_focus in enumerate(matrix.literal_mask(focus_terms)):
+            if has_focus:
+                matching_indices.append(i)
+                logger.debug(f"    Found focus term at index {i + 1}")
 
     # If no matches, return all segments
     if not matching_indices:
@@ -749,61 +1024,8 @@ def find_relevant_segments(
 
 
 def determine_level(categories: List[str], ref: str) -> SourceLevel:
-    """Determine the source level from Sefaria categories."""
-    ref_lower = ref.lower()
-
-    # Check ref patterns first
-    if "rashi on" in ref_lower:
-        return SourceLevel.RASHI
-    if "tosafot on" in ref_lower or "tosafos on" in ref_lower:
-        return SourceLevel.TOSFOS
-    if "rambam" in ref_lower or "mishneh torah" in ref_lower:
-        return SourceLevel.RAMBAM
-    if "shulchan arukh" in ref_lower or "shulchan aruch" in ref_lower:
-        return SourceLevel.SHULCHAN_ARUCH
-    if "tur " in ref_lower:
-        return SourceLevel.TUR
-
-    # V5: Check for Ran on Rif specifically
-    if "ran on rif" in ref_lower:
-        return SourceLevel.RISHONIM
-
-    # V6 FIX: Check for gemara refs by tractate pattern (e.g., "Pesachim 4a:7-12")
-    # Common Talmud tractate names
-    tractate_patterns = [
-        "berakhot", "shabbat", "eruvin", "pesachim", "shekalim", "yoma",
-        "sukkah", "beitzah", "rosh hashanah", "taanit", "megillah", "moed katan",
-        "chagigah", "yevamot", "ketubot", "nedarim", "nazir", "sotah", "gittin",
-        "kiddushin", "bava kamma", "bava metzia", "bava batra", "sanhedrin",
-        "makkot", "shevuot", "avodah zarah", "horayot", "zevachim", "menachot",
-        "chullin", "bekhorot", "arakhin", "temurah", "keritot", "meilah",
-        "kinnim", "tamid", "middot", "niddah"
-    ]
-    # Check if ref looks like a Talmud tractate ref (tractate name + daf like "4a" or "4b")
-    for tractate in tractate_patterns:
-        if tractate in ref_lower and re.search(r'\d+[ab]', ref_lower):
-            return SourceLevel.GEMARA
-
-    # Check categories
-    for cat in categories:
-        if cat in CATEGORY_TO_LEVEL:
-            return CATEGORY_TO_LEVEL[cat]
-
-    # V6 FIX: Improved rishonim patterns - handle "harosh", "piskei harosh", etc.
-    rishonim_patterns = [
-        "rashba", "ritva", "ramban", "meiri", "nimukei",
-        "ran on", "ran ",  # Ran
-        r"\brosh\b", "harosh", "piskei"  # Rosh variations
-    ]
-    for pattern in rishonim_patterns:
-        if pattern.startswith(r"\b"):
-            # Use regex for word boundary
-            if re.search(pattern, ref_lower):
-                return SourceLevel.RISHONIM
-        elif pattern in ref_lower:
-            return SourceLevel.RISHONIM
-
-    return SourceLevel.OTHER
+    """Determine the source level from Sefaria categories (ref patterns take precedence)."""
+    return get_link_classifier().level(categories, ref)
 
 
 # =============================================================================
@@ -811,33 +1033,43 @@ def determine_level(categories: List[str], ref: str) -> SourceLevel:
 # =============================================================================
 
 def normalize_for_search(text: str) -> str:
-    """Normalize Hebrew text for keyword matching."""
-    if not text:
-        return ""
-    
-    # Strip HTML
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # Remove nikud
-    text = re.sub(r'[\u05B0-\u05BD\u05BF\u05C1\u05C2\u05C4\u05C5\u05C7]', '', text)
-    
-    # Normalize geresh/gershayim
-    text = text.replace('״', '').replace('׳', '')
-    text = text.replace('"', '').replace("'", '')
-    
-    # Normalize sofits
-    sofit_map = {'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ך': 'כ', 'ץ': 'צ'}
-    for sofit, regular in sofit_map.items():
-        text = text.replace(sofit, regular)
-    
-    # Collapse whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text
+    """
+    Normalize Hebrew text for keyword matching.
 
+    Strips HTML, nikud and geresh/gershayim, folds sofits and collapses
+    whitespace (see utils.hebrew_text.fold_for_search).
+    """
+    return fold_for_search(text)
+
+
+# Common Aramaic forms for Hebrew terms
+ARAMAIC_VARIANT_MAPPINGS = {
+    'חזקה': ['חזקא', 'דחזקה', 'דחזקא'],
+    'ממון': ['ממונא', 'דממונא', 'דממון', 'בממון', 'לממון'],
+    'גוף': ['גופא', 'דגופא', 'דגוף'],
+    'מוחזק': ['מוחזקת', 'מוחזקין'],
+    'רוב': ['רובא', 'דרובא'],
+    # V6.1: Add issurin variants - critical for queries like "bari vishema beissurin"
+    'איסור': ['איסורא', 'דאיסורא', 'דאיסור', 'באיסור', 'לאיסור', 'באיסורא', 'לאיסורא'],
+    'איסורין': ['באיסורין', 'דאיסורין', 'לאיסורין', 'אף באיסורין', 'נאמנת באיסורין'],
+    'באיסורין': ['באיסורא', 'לאיסורא', 'דאיסורא', 'איסורא', 'איסורין', 'איסור'],
+    'באיסורא': ['באיסורין', 'לאיסורין', 'דאיסורין', 'איסורין', 'איסור'],
+}
 
-def generate_keyword_variants(keyword: str) -> List[str]:
-    """Generate variations of a keyword for flexible matching."""
+
+def _contrast_variants(keyword: str) -> List[str]:
+    """
+    V6.1: Special handling for issurin/mammon contrast queries.
+
+    If searching for issurin, also look for mammon (often discussed together as contrast).
+    """
+    if any(term in keyword for term in ['איסור', 'איסורין', 'באיסור']):
+        return ['ממון', 'ממונא', 'בממון', 'לממון']
+    return []
+
+
+def _heuristic_keyword_variants(keyword: str) -> List[str]:
+    """Rule-based keyword variations (used when no variant lexicon is built)."""
     variants = [keyword]
 
     # Smichut: ה ↔ ת
@@ -872,30 +1104,70 @@ def generate_keyword_variants(keyword: str) -> List[str]:
                     variants.append(word[:-1] + 'ה')
 
     # Add common Aramaic forms for Hebrew terms
-    aramaic_mappings = {
-        'חזקה': ['חזקא', 'דחזקה', 'דחזקא'],
-        'ממון': ['ממונא', 'דממונא', 'דממון', 'בממון', 'לממון'],
-        'גוף': ['גופא', 'דגופא', 'דגוף'],
-        'מוחזק': ['מוחזקת', 'מוחזקין'],
-        'רוב': ['רובא', 'דרובא'],
-        # V6.1: Add issurin variants - critical for queries like "bari vishema beissurin"
-        'איסור': ['איסורא', 'דאיסורא', 'דאיסור', 'באיסור', 'לאיסור', 'באיסורא', 'לאיסורא'],
-        'איסורין': ['באיסורין', 'דאיסורין', 'לאיסורין', 'אף באיסורין', 'נאמנת באיסורין'],
-        'באיסורין': ['באיסורא', 'לאיסורא', 'דאיסורא', 'איסורא', 'איסורין', 'איסור'],
-        'באיסורא': ['באיסורין', 'לאיסורין', 'דאיסורין', 'איסורין', 'איסור'],
-    }
-    for base, aramaic_forms in aramaic_mappings.items():
+    for base, aramaic_forms in ARAMAIC_VARIANT_MAPPINGS.items():
         if base in keyword:
             variants.extend(aramaic_forms)
 
-    # V6.1: Special handling for issurin/mammon contrast queries
-    # If searching for issurin, also look for mammon (often discussed together as contrast)
-    if any(term in keyword for term in ['איסור', 'איסורין', 'באיסור']):
-        variants.extend(['ממון', 'ממונא', 'בממון', 'לממון'])
+    variants.extend(_contrast_variants(keyword))
 
     return list(set(variants))
 
 
+def _word_variants(word: str, lexicon) -> List[str]:
+    """Attested forms of a single word, or the rule-based ones if it is unattested."""
+    attested = lexicon.variants(word)
+    if attested:
+        return attested
+
+    variants = [word]
+    if word.endswith('ה'):
+        variants.append(word[:-1] + 'ת')
+    if word.endswith('ת'):
+        variants.append(word[:-1] + 'ה')
+    variants.extend(ARAMAIC_VARIANT_MAPPINGS.get(word, []))
+    return variants
+
+
+@lru_cache(maxsize=1024)
+def _cached_keyword_variants(keyword: str) -> Tuple[str, ...]:
+    lexicon = get_variant_lexicon(getattr(settings, 'variant_lexicon_file', None))
+    if lexicon is None:
+        return tuple(_heuristic_keyword_variants(keyword))
+
+    variants = [keyword]
+
+    # Phrase-level spelling rules still apply to the phrase as a whole
+    if ' ד' in keyword:
+        variants.append(keyword.replace(' ד', 'ד'))
+    if 'הגוף' in keyword:
+        variants.append(keyword.replace('הגוף', 'גוף'))
+    if 'גוף' in keyword and 'הגוף' not in keyword:
+        variants.append(keyword.replace('גוף', 'הגוף'))
+
+    words = keyword.split()
+    if len(words) == 1:
+        variants.extend(_word_variants(keyword, lexicon))
+    else:
+        for word in words:
+            if len(word) > 2 and word not in {'את', 'על', 'אל', 'מן', 'עם'}:
+                variants.extend(_word_variants(word, lexicon))
+
+    variants.extend(_contrast_variants(keyword))
+
+    return tuple(set(variants))
+
+
+def generate_keyword_variants(keyword: str) -> List[str]:
+    """
+    Generate variations of a keyword for flexible matching.
+
+    With a built variant lexicon (see variant_lexicon.py) each word expands to
+    the surface forms attested in the corpus; words the lexicon has never seen,
+    and every word when no lexicon is built, use the rule-based variants.
+    """
+    return list(_cached_keyword_variants(keyword))
+
+
 # Generic words that appear everywhere
 GENERIC_KEYWORDS = {
     'חזקה', 'ספק', 'רוב', 'מום', 'גוף', 'ממון', 'טהור', 'טמא',
@@ -933,47 +1205,108 @@ def calculate_keyword_score(keywords_found: List[str], is_focus_term: bool = Fal
     return score
 
 
+class KeywordMatcher:
+    """
+    Keyword matcher compiled once per keyword list.
+
+    All variants of every keyword are generated and normalized up front
+    (spaces removed, so "חזקת הגוף" also matches "חזקתהגוף"), deduplicated,
+    and mapped back to the keywords they belong to. Matching a text is then
+    one normalization pass plus one substring check per distinct variant,
+    skipping variants whose keywords were already found.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(keywords)
+        
+        variant_owners: Dict[str, Set[int]] = {}
+        for idx, keyword in enumerate(self.keywords):
+            for variant in generate_keyword_variants(keyword):
+                variant_no_space = normalize_for_search(variant).replace(" ", "")
+                variant_owners.setdefault(variant_no_space, set()).add(idx)
+        
+        # Longest first: specific phrases settle their keywords before short words are tried
+        self._variants: List[Tuple[str, frozenset]] = sorted(
+            ((variant, frozenset(owners)) for variant, owners in variant_owners.items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self._all = frozenset(range(len(self.keywords)))
+
+    def find(self, text: Union[str, NormalizedText]) -> List[str]:
+        """Keywords (in input order) that appear in text."""
+        found = self.find_indices(text)
+        return [kw for idx, kw in enumerate(self.keywords) if idx in found]
+
+    def find_indices(self, text: Union[str, NormalizedText]) -> Set[int]:
+        """Positions in self.keywords of the keywords that appear in text."""
+        if not text or not self.keywords:
+            return set()
+        
+        if isinstance(text, NormalizedText):
+            text_no_spaces = text.folded_no_space
+        else:
+            text_no_spaces = normalize_for_search(text).replace(" ", "")
+        found: Set[int] = set()
+        
+        for variant, owners in self._variants:
+            if owners <= found:
+                continue
+            if variant in text_no_spaces:
+                found |= owners
+                if len(found) == len(self._all):
+                    break
+        
+        return found
+
+    def verify(
+        self,
+        text: Union[str, NormalizedText],
+        require_all: bool = False,
+        min_score: float = 3.0
+    ) -> Tuple[bool, List[str], float]:
+        """Same contract as verify_text_contains_keywords."""
+        if not text or not self.keywords:
+            return False, [], 0.0
+        
+        keywords_found = self.find(text)
+        score = calculate_keyword_score(keywords_found)
+        
+        if require_all:
+            verified = len(keywords_found) == len(self.keywords)
+        else:
+            verified = score >= min_score
+        
+        return verified, keywords_found, score
+
+
+@lru_cache(maxsize=256)
+def get_keyword_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """
+    Compiled matcher for a keyword list.
+
+    A query reuses the same focus/topic term lists for every segment,
+    landmark and commentary it scores, so each list is compiled once.
+    """
+    return KeywordMatcher(keywords)
+
+
 def verify_text_contains_keywords(
-    text: str,
+    text: Union[str, NormalizedText],
     keywords: List[str],
     require_all: bool = False,
     min_score: float = 3.0
 ) -> Tuple[bool, List[str], float]:
-    """Check if text contains keywords with weighted scoring."""
+    """
+    Check if text contains keywords with weighted scoring.
+
+    Pass a NormalizedText to reuse its precomputed folded form.
+    """
     if not text or not keywords:
         return False, [], 0.0
     
-    text_normalized = normalize_for_search(text)
-    text_no_spaces = text_normalized.replace(" ", "")
-    keywords_found = []
-    
-    for keyword in keywords:
-        variants = generate_keyword_variants(keyword)
-        
-        found = False
-        for variant in variants:
-            variant_normalized = normalize_for_search(variant)
-            
-            if variant in text or variant_normalized in text_normalized:
-                found = True
-                break
-            
-            variant_no_space = variant_normalized.replace(" ", "")
-            if variant_no_space in text_no_spaces:
-                found = True
-                break
-        
-        if found:
-            keywords_found.append(keyword)
-    
-    score = calculate_keyword_score(keywords_found)
-    
-    if require_all:
-        verified = len(keywords_found) == len(keywords)
-    else:
-        verified = score >= min_score
-    
-    return verified, keywords_found, score
+    matcher = get_keyword_matcher(tuple(keywords))
+    return matcher.verify(text, require_all=require_all, min_score=min_score)
 
 
 # =============================================================================
@@ -989,64 +1322,142 @@ def matches_source_target(
     """
     V5: Check if a link matches the target source with proper exclusions.
     """
-    target_lower = target.lower().replace(" ", "_")
-    
-    # Get search patterns
-    search_patterns = SOURCE_NAME_MAP.get(target_lower, [target])
-    
-    # Get exclusion patterns
-    exclusions = EXCLUSION_PATTERNS.get(target_lower, [])
-    
-    # Check exclusions first
-    for excl in exclusions:
-        if excl.lower() in link_ref.lower():
-            return False
-        if excl.lower() in categories.lower():
-            return False
-        if excl.lower() in collective_title.lower():
-            return False
-    
-    # Check for positive match
-    for pattern in search_patterns:
-        pattern_lower = pattern.lower()
-        if pattern_lower in categories.lower():
-            return True
-        if pattern_lower in collective_title.lower():
-            return True
-        if pattern_lower in link_ref.lower():
-            return True
-    
-    return False
+    return get_link_classifier().matches_target(link_ref, categories, collective_title, target)
 
 
 # =============================================================================
 #  V5: SEGMENT-LEVEL ANALYSIS
 # =============================================================================
 
-def analyze_segments(
+class SegmentScoreMatrix:
+    """
+    N segments x K terms hit matrix for one text (usually a daf).
+
+    Columns are focus_terms followed by topic_terms. Each segment is matched
+    once against a single KeywordMatcher for all K terms, and each column is
+    weighted by calculate_keyword_score([term]), so a row's weighted sum is
+    exactly the score verify_text_contains_keywords gives for those terms.
+    Focus/topic scores, relevance masks, literal (niqqud-stripped substring)
+    filters and match ranges are then array operations on the same matrix.
+
+    NumPy-backed when available; falls back to plain lists.
+    """
+
+    def __init__(
+        self,
+        texts: Sequence[NormalizedText],
+        focus_terms: Sequence[str],
+        topic_terms: Sequence[str] = (),
+        segment_indices: Optional[Sequence[int]] = None
+    ):
+        self.texts = list(texts)
+        self.focus_terms = list(focus_terms)
+        self.topic_terms = list(topic_terms)
+        self.terms = self.focus_terms + self.topic_terms
+        self.n_focus = len(self.focus_terms)
+        self.segment_indices = list(segment_indices) if segment_indices is not None else list(range(len(self.texts)))
+        self._weights = [calculate_keyword_score([term]) for term in self.terms]
+        self._hits = None  # Built on first use (literal-only callers never need it)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @property
+    def hits(self):
+        """N x K boolean hit matrix (ndarray, or list of lists without NumPy)."""
+        if self._hits is None:
+            matcher = get_keyword_matcher(tuple(self.terms))
+            rows = [matcher.find_indices(text) for text in self.texts]
+            if NUMPY_AVAILABLE:
+                self._hits = np.zeros((len(rows), len(self.terms)), dtype=bool)
+                for i, found in enumerate(rows):
+                    if found:
+                        self._hits[i, list(found)] = True
+            else:
+                self._hits = [[j in found for j in range(len(self.terms))] for found in rows]
+        return self._hits
+
+    def _weighted_scores(self, start: int, stop: int) -> List[float]:
+        """Per-segment sum of weights over columns [start, stop)."""
+        if NUMPY_AVAILABLE:
+            weights = np.asarray(self._weights[start:stop], dtype=float)
+            return (self.hits[:, start:stop] @ weights).tolist()
+        weights = self._weights[start:stop]
+        return [
+            sum(w for hit, w in zip(row[start:stop], weights) if hit)
+            for row in self.hits
+        ]
+
+    def focus_scores(self) -> List[float]:
+        return self._weighted_scores(0, self.n_focus)
+
+    def topic_scores(self) -> List[float]:
+        return self._weighted_scores(self.n_focus, len(self.terms))
+
+    def combined_scores(self) -> List[float]:
+        """Score over all terms, focus and topic alike."""
+        return self._weighted_scores(0, len(self.terms))
+
+    def total_scores(self) -> List[float]:
+        """Focus terms count double: focus * 2 + topic."""
+        return [f * 2 + t for f, t in zip(self.focus_scores(), self.topic_scores())]
+
+    def found_terms(self, row: int, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """Terms hit in one segment, restricted to columns [start, stop)."""
+        stop = len(self.terms) if stop is None else stop
+        hits_row = self.hits[row]
+        return [self.terms[j] for j in range(start, stop) if hits_row[j]]
+
+    def literal_mask(self, terms: Sequence[str]) -> List[bool]:
+        """Per segment: does it contain any of terms verbatim (niqqud-stripped)?"""
+        stripped = [strip_niqqud(term) for term in terms]
+        return [
+            any(term in text.no_niqqud for term in stripped)
+            for text in self.texts
+        ]
+
+    def first_literal_match(self, term: str) -> int:
+        """Row of the first segment containing term verbatim, or -1."""
+        stripped = strip_niqqud(term)
+        for row, text in enumerate(self.texts):
+            if stripped in text.no_niqqud:
+                return row
+        return -1
+
+    def as_segment_dicts(self, relevance_threshold: float = 3.0) -> List[Dict]:
+        """Rows in the dict shape analyze_segments has always returned."""
+        focus_scores = self.focus_scores()
+        topic_scores = self.topic_scores()
+        results = []
+        for row, text in enumerate(self.texts):
+            total_score = focus_scores[row] * 2 + topic_scores[row]
+            results.append({
+                "segment_index": self.segment_indices[row],
+                "segment_text": text.raw[:200],  # First 200 chars for logging
+                "focus_found": self.found_terms(row, 0, self.n_focus),
+                "topic_found": self.found_terms(row, self.n_focus),
+                "focus_score": focus_scores[row],
+                "topic_score": topic_scores[row],
+                "total_score": total_score,
+                "is_relevant": total_score >= relevance_threshold
+            })
+        return results
+
+
+def build_segment_matrix(
     sefaria_response: Dict,
     focus_terms: List[str],
     topic_terms: List[str]
-) -> List[Dict]:
-    """
-    V5: Analyze each segment of a daf to find which contain the topic.
-    
-    Returns list of dicts with:
-    - segment_index: position in the text
-    - segment_text: the Hebrew text
-    - focus_score: score based on focus terms
-    - topic_score: score based on topic terms
-    - is_relevant: True if above threshold
-    """
+) -> SegmentScoreMatrix:
+    """Segment a Sefaria text response and score it against focus/topic terms."""
     he_content = sefaria_response.get("he", [])
     
     # Handle non-list content
     if not isinstance(he_content, list):
         he_content = [he_content] if he_content else []
     
-    results = []
-    all_keywords = focus_terms + topic_terms
-    
+    texts = []
+    indices = []
     for idx, segment in enumerate(he_content):
         if isinstance(segment, list):
             # Nested structure - flatten
@@ -1057,28 +1468,28 @@ def analyze_segments(
         if not segment_text.strip():
             continue
         
-        # Score this segment
-        _, focus_found, focus_score = verify_text_contains_keywords(
-            segment_text, focus_terms, min_score=0
-        )
-        _, topic_found, topic_score = verify_text_contains_keywords(
-            segment_text, topic_terms, min_score=0
-        )
-        
-        total_score = focus_score * 2 + topic_score
-        
-        results.append({
-            "segment_index": idx,
-            "segment_text": segment_text[:200],  # First 200 chars for logging
-            "focus_found": focus_found,
-            "topic_found": topic_found,
-            "focus_score": focus_score,
-            "topic_score": topic_score,
-            "total_score": total_score,
-            "is_relevant": total_score >= 3.0  # Threshold for relevance
-        })
+        texts.append(NormalizedText(segment_text))
+        indices.append(idx)
+    
+    return SegmentScoreMatrix(texts, focus_terms, topic_terms, segment_indices=indices)
+
+
+def analyze_segments(
+    sefaria_response: Dict,
+    focus_terms: List[str],
+    topic_terms: List[str]
+) -> List[Dict]:
+    """
+    V5: Analyze each segment of a daf to find which contain the topic.
     
-    return results
+    Returns list of dicts with:
+    - segment_index: position in the text
+    - segment_text: the Hebrew text
+    - focus_score: score based on focus terms
+    - topic_score: score based on topic terms
+    - is_relevant: True if above threshold
+    """
+    return build_segment_matrix(sefaria_response, focus_terms, topic_terms).as_segment_dicts()
 
 
 def get_relevant_segment_refs(
@@ -1094,16 +1505,16 @@ def get_relevant_segment_refs(
     For example, if Pesachim 6b has discussion on segment 5,
     returns "Pesachim 6b:5" rather than the whole daf.
     """
-    segments = analyze_segments(sefaria_response, focus_terms, topic_terms)
+    matrix = build_segment_matrix(sefaria_response, focus_terms, topic_terms)
     
     relevant_refs = []
-    for seg in segments:
-        if seg["total_score"] >= min_score:
+    for row, total_score in enumerate(matrix.total_scores()):
+        if total_score >= min_score:
             # Build specific ref
             # Sefaria uses 1-indexed segments
-            segment_ref = f"{base_ref}:{seg['segment_index'] + 1}"
+            segment_ref = f"{base_ref}:{matrix.segment_indices[row] + 1}"
             relevant_refs.append(segment_ref)
-            logger.debug(f"    Relevant segment: {segment_ref} (score: {seg['total_score']})")
+            logger.debug(f"    Relevant segment: {segment_ref} (score: {total_score})")
     
     return relevant_refs
 
@@ -1153,11 +1564,12 @@ async def verify_landmark(
     logger.info(f"  ✓ Landmark exists, text length: {len(he_text)} chars")
     
     # Step 2: Verify it contains focus_terms AND topic_terms
+    he_norm = NormalizedText(he_text)
     _, focus_found, focus_score = verify_text_contains_keywords(
-        he_text, focus_terms, min_score=0
+        he_norm, focus_terms, min_score=0
     )
     _, topic_found, topic_score = verify_text_contains_keywords(
-        he_text, topic_terms, min_score=0
+        he_norm, topic_terms, min_score=0
     )
     
     logger.info(f"  Focus terms found: {focus_found} (score: {focus_score})")
@@ -1298,8 +1710,9 @@ async def discover_via_achronim(
         if not he_text:
             continue
         
-        _, focus_found, _ = verify_text_contains_keywords(he_text, focus_terms, min_score=0)
-        _, topic_found, _ = verify_text_contains_keywords(he_text, topic_terms, min_score=0)
+        he_norm = NormalizedText(he_text)
+        _, focus_found, _ = verify_text_contains_keywords(he_norm, focus_terms, min_score=0)
+        _, topic_found, _ = verify_text_contains_keywords(he_norm, topic_terms, min_score=0)
         
         focus_score = calculate_keyword_score(focus_found, is_focus_term=True)
         topic_score = calculate_keyword_score(topic_found, is_focus_term=False)
@@ -1396,11 +1809,85 @@ def extract_segment_from_commentary_ref(ref: str) -> Optional[int]:
         "Tosafot on Pesachim 4a:5:1" -> 5
         "Rashi on Pesachim 4a" -> None (no segment)
     """
-    # Pattern: look for daf (e.g., "4a") followed by colon and segment number
-    match = re.search(r'\d+[ab]:(\d+)', ref)
-    if match:
-        return int(match.group(1))
-    return None
+    parsed = parse_ref(ref)
+    return parsed.segment if parsed is not None else None
+
+
+def partition_links_by_segment(links: List[Dict]) -> Dict[int, List[Dict]]:
+    """
+    Group daf-level /related links by the (1-indexed) segment they comment on.
+
+    Uses the link's anchorRef ("Pesachim 4a:3"); links anchored on a range
+    are filed under every segment in anchorRefExpanded. Links with no
+    anchor at all fall back to the segment in the commentary ref itself.
+    Links anchored on the whole daf are dropped, matching what the
+    per-segment /related calls would have returned.
+    """
+    by_segment: Dict[int, List[Dict]] = {}
+    
+    for link in links:
+        anchors = link.get("anchorRefExpanded") or [link.get("anchorRef", "")]
+        segments = []
+        for anchor in anchors:
+            seg = extract_segment_from_commentary_ref(anchor or "")
+            if seg is not None and seg not in segments:
+                segments.append(seg)
+        
+        if not segments and not link.get("anchorRef"):
+            seg = extract_segment_from_commentary_ref(link.get("ref", ""))
+            if seg is None:
+                continue
+            segments = [seg]
+        
+        for seg in segments:
+            by_segment.setdefault(seg, []).append(link)
+    
+    return by_segment
+
+
+def rank_commentary_candidates(
+    candidates: List[CommentaryCandidate],
+    target_sources: List[str]
+) -> List[CommentaryCandidate]:
+    """
+    Sort candidates (in place) by how likely they are to be worth fetching.
+
+    Uses only what is known before the text is downloaded:
+    - the score of the gemara segment the commentary sits on
+    - the commentator's place in target_sources (rashi/tosafos first)
+    - accumulated thumbs up/down for the ref from the feedback cache
+    """
+    feedback = _feedback_priorities([c.ref for c in candidates])
+    n_targets = max(len(target_sources), 1)
+    
+    for candidate in candidates:
+        try:
+            target_rank = target_sources.index(candidate.matched_target)
+        except ValueError:
+            target_rank = n_targets
+        title_priority = 2.0 * (1 - target_rank / n_targets)
+        if candidate.matched_target in ("rashi", "tosafos"):
+            title_priority += 2.0
+        
+        candidate.priority = (
+            candidate.anchor_score
+            + title_priority
+            + feedback.get(candidate.ref, 0.0) * 10  # Same scale as FeedbackCache.apply_priority_to_sources
+        )
+    
+    candidates.sort(key=lambda c: c.priority, reverse=True)
+    return candidates
+
+
+def _feedback_priorities(refs: List[str]) -> Dict[str, float]:
+    """Feedback priority adjustment per ref (empty if the feedback cache is unavailable)."""
+    try:
+        from feedback_cache import get_feedback_cache
+        cache_dir = Path(getattr(settings, 'cache_dir', 'cache')) / "feedback"
+        return get_feedback_cache(str(cache_dir)).get_source_priority_adjustments(refs)
+    except Exception as e:
+        logger.debug(f"  Feedback priorities unavailable: {e}")
+        return {}
 
 
 async def trickle_up_filtered(
@@ -1408,11 +1895,17 @@ async def trickle_up_filtered(
     target_sources: List[str],
     focus_terms: List[str],
     topic_terms: List[str],
-    session: aiohttp.ClientSession
+    session: aiohttp.ClientSession,
+    budget: Optional[int] = None
 ) -> Tuple[List[Source], int, int]:
     """
     V5: Fetch commentaries only on segments that contain focus/topic terms.
     
+    Matching links are collected first and only then fetched. With a budget
+    (default COMMENTARY_BUDGET) they are ranked by rank_commentary_candidates
+    and fetching stops once `budget` sources score >= 2.0; budget=0 fetches
+    them all.
+    
     Returns:
     - List of commentary sources
     - Number of segments analyzed
@@ -1431,66 +1924,81 @@ async def trickle_up_filtered(
     logger.info(f"  Focus terms: {focus_terms}")
     logger.info(f"  Topic terms: {topic_terms}")
     
+    commentary_targets = [t for t in target_lower if t != "gemara"]
+    classifier = get_link_classifier()
+    
     commentary_sources = []
+    candidates: List[CommentaryCandidate] = []
     seen_refs = set()
     total_segments = 0
     relevant_segments = 0
     
+    base_texts = await fetch_texts(foundation_refs, session)
+
     for ref in foundation_refs:
         logger.info(f"  Analyzing segments for: {ref}")
         
         # First, fetch the base text and find relevant segments
-        base_response = await fetch_text(ref, session)
+        base_response = base_texts.get(ref)
         if not base_response:
             continue
         
-        # Analyze which segments contain our terms
-        segments = analyze_segments(base_response, focus_terms, topic_terms)
-        total_segments += len(segments)
+        # Score every segment against every term in one pass
+        matrix = build_segment_matrix(base_response, focus_terms, topic_terms)
+        total_segments += len(matrix)
         
         # Get relevant segment refs - V6 FIX: Require CORE focus terms, not just any focus term
-        relevant_seg_indices = []
         # V6 FIX: Use only the first 2 focus terms as "core" terms (usually the most specific)
         # e.g., for "mashkir socher" we want only segments with משכיר or שוכר, not just "בדיקה"
         core_focus_terms = focus_terms[:2] if len(focus_terms) >= 2 else focus_terms
-        for seg in segments:
-            segment_text = seg.get("segment_text", "")
-            # Check if segment contains CORE focus terms (not just any focus term)
-            has_core_focus = any(
-                strip_niqqud(term) in strip_niqqud(segment_text)
-                for term in core_focus_terms
-            )
-            if seg["is_relevant"] and has_core_focus:
-                relevant_segments += 1
-                relevant_seg_indices.append(seg["segment_index"])
+        has_core_focus = matrix.literal_mask(core_focus_terms)
+        total_scores = matrix.total_scores()
+        segment_scores = dict(zip(matrix.segment_indices, total_scores))
+        relevant_seg_indices = [
+            matrix.segment_indices[row]
+            for row, total_score in enumerate(total_scores)
+            if total_score >= 3.0 and has_core_focus[row]
+        ]
+        relevant_segments += len(relevant_seg_indices)
         
-        logger.info(f"    Found {len(relevant_seg_indices)}/{len(segments)} relevant segments")
+        logger.info(f"    Found {len(relevant_seg_indices)}/{len(matrix)} relevant segments")
         
         # If no relevant segments found, use the whole ref but with lower priority
         if not relevant_seg_indices:
             logger.info(f"    No focused segments, using whole ref")
-            relevant_seg_indices = list(range(min(5, len(segments))))  # First 5 at most
+            relevant_seg_indices = list(range(min(5, len(matrix))))  # First 5 at most
+        
+        # One /related call for the whole daf, partitioned locally by segment
+        links_by_segment = None
+        if PARTITION_RELATED_BY_DAF:
+            daf_related = await fetch_related(ref, session)
+            if daf_related:
+                links_by_segment = partition_links_by_segment(daf_related.get("links", []))
+                logger.info(f"    Daf /related: {len(daf_related.get('links', []))} links across {len(links_by_segment)} segments")
         
         # Get related for each relevant segment
         for seg_idx in relevant_seg_indices[:10]:  # Max 10 segments
-            seg_ref = f"{ref}:{seg_idx + 1}"
-            
-            related = await fetch_related(seg_ref, session)
-            if not related:
-                # Fall back to base ref if segment ref doesn't work
-                related = await fetch_related(ref, session)
+            if links_by_segment is not None:
+                links = links_by_segment.get(seg_idx + 1, [])
+            else:
+                seg_ref = f"{ref}:{seg_idx + 1}"
+                
+                related = await fetch_related(seg_ref, session)
                 if not related:
-                    continue
+                    # Fall back to base ref if segment ref doesn't work
+                    related = await fetch_related(ref, session)
+                    if not related:
+                        continue
+                
+                links = related.get("links", [])
             
-            links = related.get("links", [])
-            for link in links:
+            for link, classification in zip(links, classifier.classify_links(links, commentary_targets)):
                 link_ref = link.get("ref", "")
                 if not link_ref or link_ref in seen_refs:
                     continue
 
                 # V6.1: Filter out unconventional sources (Steinsaltz, introductions, etc.)
-                link_categories = link.get("categories", [])
-                if is_unconventional_source(link_ref, link_categories):
+                if classification.excluded:
                     logger.debug(f"      Skipped unconventional source: {link_ref}")
                     continue
 
@@ -1502,63 +2010,88 @@ async def trickle_up_filtered(
                         logger.debug(f"      Skipped off-segment: {link_ref} (seg {commentary_segment} not in relevant)")
                         continue
 
-                categories = link.get("category", "")
-                collective_title = link.get("collectiveTitle", {}).get("en", "")
-                
                 # V5: Use improved matching with exclusions
-                is_target = False
-                matched_target = None
-                
-                for target in target_lower:
-                    if target == "gemara":
-                        continue
-                    
-                    if matches_source_target(link_ref, categories, collective_title, target):
-                        is_target = True
-                        matched_target = target
-                        break
-                
-                if not is_target:
+                matched_target = classification.target
+                if not matched_target:
                     continue
                 
-                seen_refs.add(link_ref)
-                
-                text_response = await fetch_text(link_ref, session)
-                if not text_response:
-                    continue
-                
-                he_text, en_text = extract_text_content(text_response)
-                
-                # V5: Score this commentary by focus terms
-                _, kw_found, score = verify_text_contains_keywords(
-                    he_text, focus_terms + topic_terms, min_score=0
-                )
+                collective_title = link.get("collectiveTitle", {}).get("en", "")
                 
-                source = Source(
+                seen_refs.add(link_ref)
+                candidates.append(CommentaryCandidate(
                     ref=link_ref,
-                    he_ref=text_response.get("heRef", link_ref),
-                    level=determine_level(text_response.get("categories", []), link_ref),
-                    hebrew_text=he_text,
-                    english_text=en_text,
-                    author=collective_title,
-                    categories=text_response.get("categories", []),
-                    is_foundation=False,
-                    is_verified=score >= 2.0,
-                    verification_keywords_found=kw_found,
-                    focus_score=score,
-                    segment_index=seg_idx
-                )
-                
-                # Only add if it has SOME relevance (score > 0) AND either:
-                # - scores >= 2.0 (clearly relevant), OR
-                # - is from primary target (rashi/tosafos) with any positive score
-                if score > 0 and (score >= 2.0 or matched_target in ["rashi", "tosafos"]):
-                    commentary_sources.append(source)
-                    logger.debug(f"      Added: {link_ref} ({matched_target}) score={score}")
-                elif score == 0:
-                    logger.debug(f"      Skipped zero-score: {link_ref} ({matched_target}) - no keyword matches")
-                else:
-                    logger.debug(f"      Skipped low-scoring: {link_ref} score={score}")
+                    segment_index=seg_idx,
+                    matched_target=matched_target,
+                    collective_title=collective_title,
+                    anchor_score=segment_scores.get(seg_idx, 0.0),
+                ))
+    
+    if budget is None:
+        budget = COMMENTARY_BUDGET
+    
+    if budget:
+        rank_commentary_candidates(candidates, target_lower)
+        max_fetches = budget * COMMENTARY_FETCH_LIMIT_FACTOR
+        logger.info(f"  {len(candidates)} candidate commentaries, budget {budget} (max {max_fetches} fetches)")
+    else:
+        max_fetches = len(candidates)
+    
+    keywords = focus_terms + topic_terms
+    strong_sources = 0
+    fetched = 0
+    
+    # Fetch in priority order, a batch at a time, until the budget is met
+    while fetched < min(len(candidates), max_fetches):
+        if budget and strong_sources >= budget:
+            break
+        
+        batch = candidates[fetched:min(fetched + MAX_CONCURRENT_REQUESTS, max_fetches)]
+        fetched += len(batch)
+        responses = await asyncio.gather(*(fetch_text(c.ref, session) for c in batch))
+        
+        for candidate, text_response in zip(batch, responses):
+            if not text_response:
+                continue
+            
+            he_text, en_text = extract_text_content(text_response)
+            he_norm = NormalizedText(he_text)
+            
+            # V5: Score this commentary by focus terms
+            _, kw_found, score = verify_text_contains_keywords(
+                he_norm, keywords, min_score=0
+            )
+            
+            source = Source(
+                ref=candidate.ref,
+                he_ref=text_response.get("heRef", candidate.ref),
+                level=determine_level(text_response.get("categories", []), candidate.ref),
+                hebrew_text=he_text,
+                english_text=en_text,
+                author=candidate.collective_title,
+                categories=text_response.get("categories", []),
+                is_foundation=False,
+                is_verified=score >= 2.0,
+                verification_keywords_found=kw_found,
+                focus_score=score,
+                segment_index=candidate.segment_index,
+                hebrew_normalized=he_norm,
+            )
+            
+            # Only add if it has SOME relevance (score > 0) AND either:
+            # - scores >= 2.0 (clearly relevant), OR
+            # - is from primary target (rashi/tosafos) with any positive score
+            if score > 0 and (score >= 2.0 or candidate.matched_target in ["rashi", "tosafos"]):
+                commentary_sources.append(source)
+                if score >= 2.0:
+                    strong_sources += 1
+                logger.debug(f"      Added: {candidate.ref} ({candidate.matched_target}) score={score}")
+            elif score == 0:
+                logger.debug(f"      Skipped zero-score: {candidate.ref} ({candidate.matched_target}) - no keyword matches")
+            else:
+                logger.debug(f"      Skipped low-scoring: {candidate.ref} score={score}")
+    
+    if budget:
+        logger.info(f"  Fetched {fetched}/{len(candidates)} candidates for {strong_sources} sources above threshold")
     
     # Sort by focus score
     commentary_sources.sort(key=lambda s: s.focus_score, reverse=True)
@@ -1607,15 +2140,16 @@ async def fetch_author_commentary(
     logger.info(f"  Sefaria prefix: {sefaria_prefix}")
     
     for base_ref in foundation_refs:
-        # Extract tractate and daf from base ref
-        # e.g., "Pesachim 6b" -> tractate="Pesachim", daf="6b"
-        parts = base_ref.split()
-        if len(parts) < 2:
+        # Extract tractate from base ref
+        # e.g., "Bava Metzia 6b" -> tractate="Bava Metzia"
+        parsed = parse_ref(base_ref)
+        if parsed is not None:
+            tractate = parsed.book
+        elif " " in base_ref.strip():
+            tractate = base_ref.strip().rsplit(" ", 1)[0]
+        else:
             continue
         
-        tractate = parts[0]
-        daf = parts[1] if len(parts) > 1 else ""
-        
         # Build the correct ref based on what this author writes on
         if writes_on == "rif":
             # Ran writes on Rif - different daf numbers!
@@ -1643,8 +2177,9 @@ async def fetch_author_commentary(
                         continue
                     
                     he_text, en_text = extract_text_content(response)
+                    he_norm = NormalizedText(he_text)
                     _, kw_found, score = verify_text_contains_keywords(
-                        he_text, focus_terms + topic_terms, min_score=0
+                        he_norm, focus_terms + topic_terms, min_score=0
                     )
                     
                     sources.append(Source(
@@ -1659,7 +2194,8 @@ async def fetch_author_commentary(
                         is_verified=score >= 3.0,
                         verification_keywords_found=kw_found,
                         focus_score=score,
-                        is_primary=True
+                        is_primary=True,
+                        hebrew_normalized=he_norm,
                     ))
         
         elif writes_on == "gemara":
@@ -1673,15 +2209,13 @@ async def fetch_author_commentary(
                 segments = extract_text_segments(response)
                 logger.info(f"    Found {len(segments)} segments in {test_ref}")
 
+                matrix = SegmentScoreMatrix([seg["he_norm"] for seg in segments], focus_terms, topic_terms)
                 matching_segments = []
-                for seg in segments:
-                    _, kw_found, score = verify_text_contains_keywords(
-                        seg["he_text"], focus_terms + topic_terms, min_score=0
-                    )
+                for row, score in enumerate(matrix.combined_scores()):
                     if score >= 2.0:  # Only include segments with keyword matches
                         matching_segments.append({
-                            **seg,
-                            "kw_found": kw_found,
+                            **segments[row],
+                            "kw_found": matrix.found_terms(row),
                             "score": score
                         })
 
@@ -1706,7 +2240,8 @@ async def fetch_author_commentary(
                             verification_keywords_found=seg["kw_found"],
                             focus_score=seg["score"],
                             is_primary=True,
-                            segment_index=seg["index"]
+                            segment_index=seg["index"],
+                            hebrew_normalized=seg["he_norm"],
                         ))
                         logger.info(f"      Added segment {seg['index']} (score={seg['score']:.1f}): {seg['kw_found'][:3]}...")
                 else:
@@ -1870,6 +2405,9 @@ async def handle_general_query(
     topic_terms = getattr(analysis, 'topic_terms', [])
     
     log_subsection("VERIFYING REFS")
+
+    # Adjacent amudim (from _ensure_both_amudim / range expansion) go out as one request
+    texts = await fetch_texts([hint.ref for hint in ref_hints], session)
     
     for hint in ref_hints:
         logger.info(f"  Checking: {hint.ref}")
@@ -1879,7 +2417,7 @@ async def handle_general_query(
 
         if hint.confidence.value == "certain":
             verified_refs.append(hint.ref)
-            response = await fetch_text(hint.ref, session)
+            response = texts.get(hint.ref)
             if response:
                 # V6 FIX: For definition queries, find the relevant segments
                 if is_definition and (hint_target_segments or focus_terms):
@@ -1927,7 +2465,7 @@ async def handle_general_query(
         if search_variants:
             keywords.extend(search_variants.aramaic_forms)
 
-        response = await fetch_text(hint.ref, session)
+        response = texts.get(hint.ref)
         if response:
             # V6 FIX: For definition queries, find the relevant segments
             if is_definition and (hint_target_segments or focus_terms):
@@ -1956,8 +2494,10 @@ async def handle_general_query(
                 he_text, en_text = extract_text_content(response)
                 segment_ref = hint.ref
 
+            he_norm = None
             if keywords:
-                verified, found, score = verify_text_contains_keywords(he_text, keywords, min_score=3.0)
+                he_norm = NormalizedText(he_text)
+                verified, found, score = verify_text_contains_keywords(he_norm, keywords, min_score=3.0)
             else:
                 verified = True
                 found = []
@@ -1973,7 +2513,8 @@ async def handle_general_query(
                     categories=response.get("categories", []),
                     is_foundation=True,
                     is_verified=verified,
-                    verification_keywords_found=found
+                    verification_keywords_found=found,
+                    hebrew_normalized=he_norm,
                 )
                 result.foundation_stones.append(source)
     
@@ -2021,6 +2562,8 @@ async def trickle_up_unfiltered(
         return []
     
     target_lower = [t.lower().replace(" ", "_") for t in target_sources]
+    commentary_targets = [t for t in target_lower if t != "gemara"]
+    classifier = get_link_classifier()
     commentary_sources = []
     seen_refs = set()
     
@@ -2032,33 +2575,19 @@ async def trickle_up_unfiltered(
             continue
         
         links = related.get("links", [])
-        for link in links:
+        for link, classification in zip(links, classifier.classify_links(links, commentary_targets)):
             link_ref = link.get("ref", "")
             if not link_ref or link_ref in seen_refs:
                 continue
 
             # V6.1: Filter out unconventional sources (Steinsaltz, introductions, etc.)
-            link_categories = link.get("categories", [])
-            if is_unconventional_source(link_ref, link_categories):
+            if classification.excluded:
                 logger.debug(f"    Skipped unconventional source: {link_ref}")
                 continue
 
-            categories = link.get("category", "")
             collective_title = link.get("collectiveTitle", {}).get("en", "")
-
-            is_target = False
-            matched_target = None
-
-            for target in target_lower:
-                if target == "gemara":
-                    continue
-
-                if matches_source_target(link_ref, categories, collective_title, target):
-                    is_target = True
-                    matched_target = target
-                    break
-
-            if not is_target:
+            matched_target = classification.target
+            if not matched_target:
                 continue
 
             seen_refs.add(link_ref)
@@ -2114,13 +2643,16 @@ async def search(analysis: 'QueryAnalysis') -> SearchResult:
             search_description="Needs clarification before searching"
         )
     
-    async with aiohttp.ClientSession() as session:
-        is_nuance = getattr(analysis, 'is_nuance_query', False)
-        
-        if is_nuance:
-            result = await handle_nuance_query(analysis, session)
-        else:
-            result = await handle_general_query(analysis, session)
+    # One text arena per search: every Source built below stores its text there once
+    with text_arena_scope() as arena:
+        async with client_session() as session:
+            is_nuance = getattr(analysis, 'is_nuance_query', False)
+            
+            if is_nuance:
+                result = await handle_nuance_query(analysis, session)
+            else:
+                result = await handle_general_query(analysis, session)
+    logger.debug(f"  {arena}")
     
     # Organize results
     all_sources = (
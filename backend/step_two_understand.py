@@ -39,6 +39,9 @@ from enum import Enum
 
 from anthropic import Anthropic
 
+from tools.http_replay import sync_http_client
+from utils.refs import MAX_RANGE_AMUDIM, Ref, parse_ref
+
 # Initialize logging
 try:
     from logging_config import setup_logging
@@ -362,49 +365,22 @@ def _expand_daf_range(tractate: str, start_daf: str, end_daf: str) -> List[str]:
         "Pesachim", "4a", "5b" -> ["Pesachim 4a", "Pesachim 4b", "Pesachim 5a", "Pesachim 5b"]
         "Pesachim", "4a", "4b" -> ["Pesachim 4a", "Pesachim 4b"]
     """
-    import re
-
-    # Parse start and end
-    start_match = re.match(r'(\d+)([ab])', start_daf.lower())
-    end_match = re.match(r'(\d+)([ab])', end_daf.lower())
-
-    if not start_match or not end_match:
+    parsed = parse_ref(f"{tractate} {start_daf}-{end_daf}")
+    if parsed is None or parsed.end_daf is None:
         return [f"{tractate} {start_daf}"]
+    return _expand_ref_range(parsed)
 
-    start_num = int(start_match.group(1))
-    start_amud = start_match.group(2)
-    end_num = int(end_match.group(1))
-    end_amud = end_match.group(2)
 
-    refs = []
-    current_num = start_num
-    current_amud = start_amud
-
-    while True:
-        refs.append(f"{tractate} {current_num}{current_amud}")
-
-        # Check if we've reached the end
-        if current_num == end_num and current_amud == end_amud:
-            break
-
-        # Advance to next daf/amud
-        if current_amud == 'a':
-            current_amud = 'b'
-        else:
-            current_amud = 'a'
-            current_num += 1
-
-        # Safety: don't expand more than 10 dapim
-        if len(refs) > 20:
-            logger.warning(f"  Range too large, limiting to first 20 dapim")
-            break
-
-    return refs
+def _expand_ref_range(parsed: Ref) -> List[str]:
+    """Every amud covered by a parsed range ref (capped at MAX_RANGE_AMUDIM)."""
+    amudim = parsed.amudim()
+    if amudim[-1].position != parsed.end_position:
+        logger.warning(f"  Range too large, limiting to first {MAX_RANGE_AMUDIM} amudim")
+    return [amud.amud_ref for amud in amudim]
 
 
 def _validate_and_fix_refs(refs: List[str]) -> List[str]:
     """V5: Validate and fix common ref format issues, expanding ranges."""
-    import re
     fixed_refs = []
 
     for ref in refs:
@@ -412,15 +388,9 @@ def _validate_and_fix_refs(refs: List[str]) -> List[str]:
             continue
 
         # Check for range refs like "Pesachim 2a-6b" and expand them
-        range_pattern = r'(.+?)\s+(\d+[ab])\s*-\s*(\d+[ab])'
-        match = re.match(range_pattern, ref)
-        if match:
-            base = match.group(1).strip()
-            start = match.group(2)
-            end = match.group(3)
-
-            # Expand the range into individual refs
-            expanded = _expand_daf_range(base, start, end)
+        parsed = parse_ref(ref)
+        if parsed is not None and parsed.end_daf is not None:
+            expanded = _expand_ref_range(parsed)
             fixed_refs.extend(expanded)
             logger.info(f"  Expanded range ref '{ref}' to {len(expanded)} refs: {expanded[:3]}{'...' if len(expanded) > 3 else ''}")
             continue
@@ -463,42 +433,32 @@ def _ensure_both_amudim(refs: List[str]) -> List[str]:
         ["Pesachim 4a", "Pesachim 4b"] -> ["Pesachim 4a", "Pesachim 4b"]
         ["Pesachim 4a", "Pesachim 6a"] -> ["Pesachim 4a", "Pesachim 4b", "Pesachim 6a", "Pesachim 6b"]
     """
-    import re
-
-    # Parse all refs to find tractate/daf pairs
-    daf_pattern = r'^(.+?)\s+(\d+)([ab])$'
+    # Parse all refs to find tractate/daf pairs (whole-amud refs only)
     parsed = []
     for ref in refs:
-        match = re.match(daf_pattern, ref.strip())
-        if match:
-            tractate = match.group(1)
-            daf_num = int(match.group(2))
-            amud = match.group(3)
-            parsed.append((tractate, daf_num, amud, ref))
-        else:
-            parsed.append((None, None, None, ref))
+        ref_obj = parse_ref(ref)
+        if ref_obj is not None and (ref_obj.segment is not None or ref_obj.end_daf is not None):
+            ref_obj = None
+        parsed.append((ref_obj, ref))
 
     # Find which dapim are present
-    present_dapim = set()
-    for tractate, daf_num, amud, _ in parsed:
-        if tractate and daf_num:
-            present_dapim.add((tractate, daf_num, amud))
+    present_dapim = {ref_obj for ref_obj, _ in parsed if ref_obj is not None}
 
     # Add missing amudim
     result = list(refs)  # Start with original refs
     added = set()
 
-    for tractate, daf_num, amud, original_ref in parsed:
-        if tractate is None:
+    for ref_obj, original_ref in parsed:
+        if ref_obj is None:
             continue
 
-        other_amud = 'b' if amud == 'a' else 'a'
-        if (tractate, daf_num, other_amud) not in present_dapim:
-            new_ref = f"{tractate} {daf_num}{other_amud}"
+        other = ref_obj.other_amud()
+        if other not in present_dapim:
+            new_ref = other.amud_ref
             if new_ref not in added and new_ref not in refs:
                 # Insert after the original ref to maintain order
                 idx = result.index(original_ref)
-                if amud == 'a':
+                if ref_obj.amud == 'a':
                     # Insert 'b' after 'a'
                     result.insert(idx + 1, new_ref)
                 else:
@@ -970,7 +930,7 @@ async def analyze_with_claude(query: str, hebrew_terms: List[str]) -> QueryAnaly
         try:
             log_subsection("CALLING CLAUDE FOR ENRICHMENT")
             
-            client = Anthropic(api_key=settings.anthropic_api_key)
+            client = Anthropic(api_key=settings.anthropic_api_key, http_client=sync_http_client())
             
             # V4.5: Enhanced prompt to detect qualifiers/nuances beyond the main sugya
             enrich_prompt = f"""Analyze this Torah query. We matched a known sugya, but check for QUALIFIERS or SUB-TOPICS.
@@ -1069,7 +1029,7 @@ Return ONLY valid JSON."""
         import time
         start_time = time.time()
         
-        client = Anthropic(api_key=settings.anthropic_api_key)
+        client = Anthropic(api_key=settings.anthropic_api_key, http_client=sync_http_client())
         
         model = getattr(settings, "claude_model", "claude-sonnet-4-5-20250929")
         max_tokens = min(getattr(settings, "claude_max_tokens", 3000), 3000)
@@ -0,0 +1,268 @@
+"""
+Local Term-Frequency Table
+==========================
+
+Step 1 validates up to 15 spellings per word by asking Sefaria's search API
+how many hits each one has - the biggest source of Step 1 latency. This
+module answers the same question offline.
+
+An offline job walks the local Sefaria export once and counts, for every
+word, bigram and trigram, the number of segments it appears in (which is
+what a Sefaria search "hit" is). The counts are written to a compact binary
+table that is memory-mapped at runtime: lookups are a binary search over
+the mapped file, nothing is parsed or loaded into Python objects.
+
+Text and queries are normalized the same way before counting/lookup: HTML
+and niqqud stripped, geresh/gershayim unified to ' and ", split into Hebrew
+word tokens. Final letters are kept, as in Sefaria's search.
+
+Phrases longer than the table's n-gram size are not covered; callers
+(LocalTermValidator) send those to Sefaria.
+
+FILE LAYOUT (a utils/mmap_table file, magic "OHTF", param = max_n):
+    keys     entries * uint64 (sorted 64-bit hashes of the normalized n-grams)
+    counts   entries * uint32 (segment counts, same order)
+
+BUILD (offline, needs the local export - see README "Local Corpus Setup"):
+    python term_frequency.py --build
+    python term_frequency.py --build --categories Talmud Halakhah --min-count 3
+
+LOOKUP:
+    from term_frequency import get_term_frequency_table
+    table = get_term_frequency_table()
+    if table:
+        table.count("חזקת הגוף")   # segments containing the phrase, None if not covered
+"""
+
+import json
+import logging
+import re
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from local_corpus import iter_text_segments
+from utils.hebrew_text import strip_html, strip_niqqud
+from utils.mmap_table import MappedTable, TableLoader, hash_key, write_mapped_table
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+#  CONFIGURATION
+# =============================================================================
+
+DEFAULT_TABLE_PATH = Path(__file__).resolve().parent / "data" / "term_frequency.bin"
+
+# Corpus sub-trees counted by default (relative to the export's json/ root).
+# Talmud includes the commentaries filed under it, so author names are covered.
+DEFAULT_CATEGORIES = ["Talmud", "Halakhah"]
+
+DEFAULT_MAX_N = 3
+DEFAULT_MIN_COUNT = 2  # n-grams seen in fewer segments are dropped (count as 0)
+
+MAGIC = b"OHTF"
+VERSION = 2
+
+_QUOTE_TABLE = str.maketrans({"״": '"', "׳": "'"})
+_TOKEN_RE = re.compile(r"[א-ת]+(?:[\"'][א-ת]+)*")
+
+
+# =============================================================================
+#  NORMALIZATION
+# =============================================================================
+
+def tokenize(text: str) -> List[str]:
+    """Normalized Hebrew word tokens of a text or query."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(strip_niqqud(strip_html(text)).translate(_QUOTE_TABLE))
+
+
+def ngram_key(tokens: List[str]) -> int:
+    """Stable 64-bit key for an n-gram."""
+    return hash_key(" ".join(tokens))
+
+
+# =============================================================================
+#  TABLE
+# =============================================================================
+
+class TermFrequencyTable(MappedTable):
+    """Read-only, memory-mapped n-gram -> segment count table."""
+
+    def __init__(self, path: Path):
+        super().__init__(path, MAGIC, VERSION, "QI")
+        self.max_n = self.param
+        self._counts = self.sections[1]
+
+    def covers(self, phrase: str) -> bool:
+        """True if the table can answer for this phrase (1..max_n tokens)."""
+        return 0 < len(tokenize(phrase)) <= self.max_n
+
+    def count(self, phrase: str) -> Optional[int]:
+        """
+        Segments containing the phrase.
+
+        0 if it is covered but was not seen (at least min_count times);
+        None if the phrase is longer than the table's n-grams.
+        """
+        tokens = tokenize(phrase)
+        if not tokens or len(tokens) > self.max_n:
+            return None
+        i = self.find(ngram_key(tokens))
+        return self._counts[i] if i is not None else 0
+
+
+_loader: TableLoader[TermFrequencyTable] = TableLoader(
+    TermFrequencyTable,
+    DEFAULT_TABLE_PATH,
+    setting="term_frequency_file",
+    log_prefix="[TERM_FREQ]",
+    describe=lambda table: f"Mapped {len(table)} n-grams (n <= {table.max_n})",
+)
+
+
+def load_table(path: Path = DEFAULT_TABLE_PATH) -> Optional[TermFrequencyTable]:
+    """Open a table file (None if missing or unreadable)."""
+    return _loader.load(path)
+
+
+def get_term_frequency_table(path: Optional[Path] = None) -> Optional[TermFrequencyTable]:
+    """
+    Get the process-wide table (mapped once; path from settings by default).
+
+    Returns None when no table has been built; Step 1 then validates
+    against Sefaria's search API.
+    """
+    return _loader.get(path)
+
+
+# =============================================================================
+#  OFFLINE BUILDER
+# =============================================================================
+
+def iter_corpus_segments(corpus_root: Path, categories: List[str]) -> Iterator[str]:
+    """Every Hebrew segment under the categories."""
+    for category in categories:
+        base = Path(corpus_root) / category
+        if not base.exists():
+            logger.warning(f"[TERM_FREQ] Missing corpus path: {base}")
+            continue
+
+        for path in sorted(base.rglob("merged.json")):
+            if "Hebrew" not in path.parts:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.debug(f"[TERM_FREQ] Failed to load {path}: {e}")
+                continue
+            yield from iter_text_segments(data.get("text", []))
+
+
+def count_ngrams(segments: Iterator[str], max_n: int = DEFAULT_MAX_N) -> Counter:
+    """n-gram key -> number of segments containing it."""
+    counts: Counter = Counter()
+    for segment in segments:
+        tokens = tokenize(segment)
+        keys = set()
+        for n in range(1, max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                keys.add(ngram_key(tokens[i:i + n]))
+        counts.update(keys)
+    return counts
+
+
+def write_table(
+    counts: Counter,
+    path: Path = DEFAULT_TABLE_PATH,
+    max_n: int = DEFAULT_MAX_N,
+    min_count: int = DEFAULT_MIN_COUNT,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Write counts (dropping those below min_count) as a table file. Returns entries written."""
+    items = sorted((key, count) for key, count in counts.items() if count >= min_count)
+    keys = array("Q", (key for key, _ in items))
+    values = array("I", (min(count, 0xFFFFFFFF) for _, count in items))
+
+    write_mapped_table(path, MAGIC, VERSION, [keys, values], param=max_n, metadata={
+        **(metadata or {}),
+        "max_n": max_n,
+        "min_count": min_count,
+        "entries": len(items),
+    })
+    return len(items)
+
+
+def build_table(
+    corpus_root: Path,
+    categories: List[str] = None,
+    path: Path = DEFAULT_TABLE_PATH,
+    max_n: int = DEFAULT_MAX_N,
+    min_count: int = DEFAULT_MIN_COUNT,
+) -> int:
+    """
+    Count the corpus and write the table.
+
+    Counting holds one int per distinct n-gram in memory; restrict
+    --categories or lower --max-n on small machines.
+    """
+    categories = categories or DEFAULT_CATEGORIES
+    counts = count_ngrams(iter_corpus_segments(corpus_root, categories), max_n)
+    logger.info(f"[TERM_FREQ] {len(counts)} distinct n-grams")
+    return write_table(
+        counts, path, max_n, min_count,
+        metadata={"corpus_root": str(corpus_root), "categories": categories},
+    )
+
+
+__all__ = [
+    'TermFrequencyTable',
+    'get_term_frequency_table',
+    'load_table',
+    'build_table',
+    'count_ngrams',
+    'write_table',
+    'tokenize',
+]
+
+
+# =============================================================================
+#  CLI
+# =============================================================================
+
+def main():
+    """Command-line entry point."""
+    import argparse
+    from local_corpus import DEFAULT_CORPUS_ROOT
+
+    parser = argparse.ArgumentParser(description="Build or query the local term-frequency table")
+    parser.add_argument("--build", action="store_true", help="Count the local corpus and write the table")
+    parser.add_argument("--corpus-root", type=Path, default=DEFAULT_CORPUS_ROOT)
+    parser.add_argument("--categories", nargs="+", default=DEFAULT_CATEGORIES)
+    parser.add_argument("--output", type=Path, default=DEFAULT_TABLE_PATH)
+    parser.add_argument("--max-n", type=int, default=DEFAULT_MAX_N)
+    parser.add_argument("--min-count", type=int, default=DEFAULT_MIN_COUNT)
+    parser.add_argument("terms", nargs="*", help="Terms to look up")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s | %(message)s')
+
+    if args.build:
+        entries = build_table(args.corpus_root, args.categories, args.output, args.max_n, args.min_count)
+        print(f"Wrote {entries} n-grams to {args.output}")
+
+    table = load_table(args.output)
+    if table is None:
+        print(f"No table at {args.output} - run with --build first")
+        return
+
+    for term in args.terms:
+        print(f"{term}: {table.count(term)}")
+
+
+if __name__ == "__main__":
+    main()
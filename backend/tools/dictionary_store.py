@@ -0,0 +1,256 @@
+"""
+Word Dictionary Store - SQLite (WAL)
+====================================
+
+Backing store for WordDictionary that several processes can share.
+
+The dictionary used to live only in word_dictionary.json, rewritten in full
+from the in-memory copy of whichever uvicorn worker learned an entry - so
+with several workers, each one overwrote the others' entries, and every
+lookup hit paid a full-file write just to bump usage_count.
+
+Here each entry is a row in an SQLite database in WAL mode:
+- Writers never block readers, and concurrent writers are serialized by
+  SQLite (busy_timeout) instead of racing on a file
+- A write touches one row; usage stats are bumped in place, so
+  concurrent increments are never lost
+- Every write stamps the row with a new version; a worker catches up on
+  what the others learned by reading only the rows newer than the last
+  version it saw (PRAGMA data_version makes "nothing changed" a no-op)
+
+word_dictionary.json stays the human-readable seed: an empty database is
+filled from it on first open, and export_json() writes a snapshot back.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+#  CONFIGURATION
+# ==========================================
+
+# How long a writer waits for another process's write to finish
+BUSY_TIMEOUT_MS = 5000
+
+# Entry fields with their own column; anything else is kept in "extra"
+_COLUMNS = ("hebrew", "confidence", "usage_count", "source", "last_used", "hits")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key         TEXT PRIMARY KEY,
+    hebrew      TEXT NOT NULL,
+    confidence  TEXT,
+    usage_count INTEGER NOT NULL DEFAULT 0,
+    source      TEXT,
+    last_used   TEXT,
+    hits        INTEGER,
+    extra       TEXT,
+    version     INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_version ON entries(version);
+"""
+
+# Next version number, computed inside the (serialized) write transaction
+_NEXT_VERSION = "(SELECT COALESCE(MAX(version), 0) + 1 FROM entries)"
+
+
+def _row_to_entry(row: sqlite3.Row) -> Dict:
+    """Row -> the dict shape WordDictionary has always used."""
+    entry = {
+        "hebrew": row["hebrew"],
+        "confidence": row["confidence"],
+        "usage_count": row["usage_count"],
+        "source": row["source"],
+        "last_used": row["last_used"],
+    }
+    if row["hits"] is not None:
+        entry["hits"] = row["hits"]
+    if row["extra"]:
+        entry.update(json.loads(row["extra"]))
+    return entry
+
+
+def _entry_params(key: str, entry: Dict) -> Dict:
+    extra = {k: v for k, v in entry.items() if k not in _COLUMNS}
+    return {
+        "key": key,
+        "hebrew": entry["hebrew"],
+        "confidence": entry.get("confidence"),
+        "usage_count": entry.get("usage_count") or 0,
+        "source": entry.get("source"),
+        "last_used": entry.get("last_used"),
+        "hits": entry.get("hits"),
+        "extra": json.dumps(extra, ensure_ascii=False) if extra else None,
+    }
+
+
+# ==========================================
+#  STORE
+# ==========================================
+
+class DictionaryStore:
+    """
+    One process's connection to the shared dictionary database.
+
+    Thread-safe (one connection behind a lock); use one store per process.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path),
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,  # Autocommit; transactions are explicit
+            check_same_thread=False,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._data_version: Optional[int] = None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    # ----- reads -----
+
+    def changed(self) -> bool:
+        """
+        True if another connection may have written since the last call.
+
+        PRAGMA data_version only moves for other connections' commits, so
+        this costs no table access when nothing happened.
+        """
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        return True
+
+    def changes_since(self, version: int) -> Tuple[List[Tuple[str, Dict]], int]:
+        """
+        Entries written after a version, and the newest version seen.
+
+        Pass 0 to read everything.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM entries WHERE version > ? ORDER BY version", (version,)
+            ).fetchall()
+        if not rows:
+            return [], version
+        return [(row["key"], _row_to_entry(row)) for row in rows], rows[-1]["version"]
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM entries WHERE key = ?", (key,)).fetchone()
+        return _row_to_entry(row) if row else None
+
+    # ----- writes -----
+
+    def import_entries(self, entries: Dict[str, Dict]) -> int:
+        """
+        Seed entries that are not in the database yet (one transaction).
+
+        Safe when several workers start at once: existing keys are kept.
+        Returns how many were inserted.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = self._conn.total_changes
+                for key, entry in entries.items():
+                    self._conn.execute(
+                        f"INSERT OR IGNORE INTO entries "
+                        f"(key, hebrew, confidence, usage_count, source, last_used, hits, extra, version) "
+                        f"VALUES (:key, :hebrew, :confidence, :usage_count, :source, :last_used, :hits, :extra, "
+                        f"{_NEXT_VERSION})",
+                        _entry_params(key, entry),
+                    )
+                inserted = self._conn.total_changes - before
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return inserted
+
+    def upsert(self, key: str, entry: Dict) -> Dict:
+        """
+        Learn an entry (insert it, or update the existing one).
+
+        An update replaces hebrew/confidence/last_used, keeps the
+        original source, keeps the stored hits unless new ones are given,
+        and adds 1 to the stored usage_count - so two workers learning
+        the same key both count.
+
+        Returns the entry as stored.
+        """
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO entries "
+                f"(key, hebrew, confidence, usage_count, source, last_used, hits, extra, version) "
+                f"VALUES (:key, :hebrew, :confidence, :usage_count, :source, :last_used, :hits, :extra, "
+                f"{_NEXT_VERSION}) "
+                f"ON CONFLICT(key) DO UPDATE SET "
+                f"hebrew = excluded.hebrew, "
+                f"confidence = excluded.confidence, "
+                f"usage_count = entries.usage_count + 1, "
+                f"last_used = excluded.last_used, "
+                f"hits = COALESCE(excluded.hits, entries.hits), "
+                f"version = excluded.version",
+                _entry_params(key, entry),
+            )
+            row = self._conn.execute("SELECT * FROM entries WHERE key = ?", (key,)).fetchone()
+        return _row_to_entry(row)
+
+    def touch(self, keys: Iterable[str], timestamp: str):
+        """Record a use of each key (usage_count + 1, last_used), in one transaction."""
+        keys = list(keys)
+        if not keys:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key in keys:
+                    self._conn.execute(
+                        f"UPDATE entries SET usage_count = usage_count + 1, last_used = ?, "
+                        f"version = {_NEXT_VERSION} WHERE key = ?",
+                        (timestamp, key),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # ----- snapshots -----
+
+    def export_json(self, path: Path):
+        """Write every entry to a JSON file (atomically, same format as the seed)."""
+        entries, _ = self.changes_since(0)
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(entries)), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+
+__all__ = [
+    'DictionaryStore',
+]
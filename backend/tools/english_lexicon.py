@@ -0,0 +1,235 @@
+"""
+English Lexicon - Prebuilt, Memory-Mapped
+=========================================
+
+language_detector used to ask pyenchant whether a word is English, and for
+every word enchant did not know it called Dict.suggest() - tens of
+milliseconds per word - to see whether it was a typo of an English word.
+That made Step 1's query classification slow, and different on machines
+without enchant (or without its en_US dictionary).
+
+This module answers both questions from a file built once, offline, from
+any plain word list:
+
+    words    sorted 64-bit hashes of every word           -> is it English?
+    deletes  sorted 64-bit hashes of every word with one
+             letter deleted (words of NEAR_MISS_MIN_LENGTH+)  -> is it one
+             edit (or a swapped / substituted letter) from an English word?
+
+Both sections are memory-mapped and binary-searched; nothing is parsed at
+startup. A near-miss check is one lookup per letter of the word.
+
+FILE LAYOUT (a utils/mmap_table file, magic "OHEN", param = near-miss min length):
+    words    word count * uint64
+    deletes  delete count * uint64
+
+BUILD (from backend/; any one-word-per-line list, hunspell .dic files work too):
+    python -m tools.english_lexicon --build
+    python -m tools.english_lexicon --build --wordlist /usr/share/dict/words extra.txt
+
+LOOKUP:
+    from tools.english_lexicon import get_english_lexicon
+    lexicon = get_english_lexicon()
+    if lexicon:
+        lexicon.contains("covering")    # True
+        lexicon.near_miss("coverring")  # True
+"""
+
+import logging
+import re
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from utils.mmap_table import MappedTable, TableLoader, hash_key, write_mapped_table
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+#  CONFIGURATION
+# =============================================================================
+
+DEFAULT_LEXICON_PATH = Path(__file__).resolve().parent.parent / "data" / "english_lexicon.bin"
+
+# Word lists tried by --build when none are given
+DEFAULT_WORDLISTS = [
+    Path("/usr/share/dict/words"),
+    Path("/usr/share/dict/american-english"),
+    Path("/usr/share/hunspell/en_US.dic"),
+    Path("/usr/share/myspell/en_US.dic"),
+]
+
+# Shorter words are never treated as typos - too many short transliterations
+# ("bari", "rov") sit one letter away from some English word
+NEAR_MISS_MIN_LENGTH = 4
+
+MAGIC = b"OHEN"
+VERSION = 2
+
+_WORD_RE = re.compile(r"^[a-z]+$")
+
+
+def _deletes(word: str) -> Set[str]:
+    """Every string one deleted letter away from word."""
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+# =============================================================================
+#  LEXICON
+# =============================================================================
+
+class EnglishLexicon(MappedTable):
+    """Read-only, memory-mapped English word set with one-edit near-miss lookups."""
+
+    WORDS, DELETES = 0, 1
+
+    def __init__(self, path: Path):
+        super().__init__(path, MAGIC, VERSION, "QQ")
+        self.near_miss_min_length = self.param
+
+    def contains(self, word: str) -> bool:
+        """True if word (lowercased) is in the word list."""
+        return self.find(hash_key(word.lower()), self.WORDS) is not None
+
+    def near_miss(self, word: str) -> bool:
+        """
+        True if word is one edit from a listed word: a letter added,
+        dropped or substituted, or two adjacent letters swapped.
+
+        Symmetric deletes: word minus a letter is a listed word (added),
+        word is a listed word minus a letter (dropped), or both minus a
+        letter agree (substituted / swapped). A few two-edit pairs also
+        pass this way, as they did with enchant's suggestions.
+        """
+        word = word.lower()
+        if len(word) < self.near_miss_min_length:
+            return False
+        if self.find(hash_key(word), self.DELETES) is not None:
+            return True
+        for deleted in _deletes(word):
+            key = hash_key(deleted)
+            if self.find(key, self.WORDS) is not None or self.find(key, self.DELETES) is not None:
+                return True
+        return False
+
+
+_loader: TableLoader[EnglishLexicon] = TableLoader(
+    EnglishLexicon,
+    DEFAULT_LEXICON_PATH,
+    setting="english_lexicon_file",
+    log_prefix="[ENGLISH_LEXICON]",
+    describe=lambda lexicon: f"Mapped {len(lexicon)} words",
+)
+
+
+def load_lexicon(path: Path = DEFAULT_LEXICON_PATH) -> Optional[EnglishLexicon]:
+    """Open a lexicon file (None if missing or unreadable)."""
+    return _loader.load(path)
+
+
+def get_english_lexicon(path: Optional[Path] = None) -> Optional[EnglishLexicon]:
+    """
+    Get the process-wide lexicon (mapped once; path from settings by default).
+
+    Returns None when no lexicon has been built; language_detector then
+    falls back to pyenchant if installed, else heuristics only.
+    """
+    return _loader.get(path)
+
+
+# =============================================================================
+#  OFFLINE BUILDER
+# =============================================================================
+
+def iter_wordlist(path: Path) -> Iterable[str]:
+    """Lowercased alphabetic words from a word list (hunspell "/FLAGS" suffixes dropped)."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            word = line.split("/", 1)[0].strip().lower()
+            if _WORD_RE.match(word):
+                yield word
+
+
+def write_lexicon(
+    words: Iterable[str],
+    path: Path = DEFAULT_LEXICON_PATH,
+    near_miss_min_length: int = NEAR_MISS_MIN_LENGTH,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Write a lexicon file for a set of words. Returns the word count."""
+    words = set(words)
+    word_keys = array("Q", sorted({hash_key(word) for word in words}))
+    delete_keys = array("Q", sorted({
+        hash_key(deleted)
+        for word in words if len(word) >= near_miss_min_length
+        for deleted in _deletes(word)
+    }))
+
+    write_mapped_table(path, MAGIC, VERSION, [word_keys, delete_keys], param=near_miss_min_length, metadata={
+        **(metadata or {}),
+        "words": len(word_keys),
+        "deletes": len(delete_keys),
+        "near_miss_min_length": near_miss_min_length,
+    })
+    return len(word_keys)
+
+
+def build_lexicon(wordlists: List[Path], path: Path = DEFAULT_LEXICON_PATH) -> int:
+    """Read word lists and write the lexicon. Returns the word count."""
+    words: Set[str] = set()
+    used = []
+    for wordlist in wordlists:
+        if not Path(wordlist).exists():
+            logger.warning(f"[ENGLISH_LEXICON] Missing word list: {wordlist}")
+            continue
+        words.update(iter_wordlist(wordlist))
+        used.append(str(wordlist))
+    if not words:
+        raise ValueError("No words read - pass --wordlist with a one-word-per-line file")
+    return write_lexicon(words, path, metadata={"wordlists": used})
+
+
+__all__ = [
+    'EnglishLexicon',
+    'get_english_lexicon',
+    'load_lexicon',
+    'build_lexicon',
+    'write_lexicon',
+]
+
+
+# =============================================================================
+#  CLI
+# =============================================================================
+
+def main():
+    """Command-line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or query the English lexicon used by language_detector")
+    parser.add_argument("--build", action="store_true", help="Build the lexicon from word lists")
+    parser.add_argument("--wordlist", type=Path, nargs="+", default=None,
+                        help="One-word-per-line files (default: the system dictionaries that exist)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_LEXICON_PATH)
+    parser.add_argument("words", nargs="*", help="Words to look up")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s | %(message)s')
+
+    if args.build:
+        wordlists = args.wordlist or [p for p in DEFAULT_WORDLISTS if p.exists()]
+        count = build_lexicon(wordlists, args.output)
+        print(f"Wrote {count} words to {args.output}")
+
+    lexicon = load_lexicon(args.output)
+    if lexicon is None:
+        print(f"No lexicon at {args.output} - run with --build first")
+        return
+
+    for word in args.words:
+        print(f"{word}: english={lexicon.contains(word)} near_miss={lexicon.near_miss(word)}")
+
+
+if __name__ == "__main__":
+    main()
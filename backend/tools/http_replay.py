@@ -0,0 +1,413 @@
+"""
+HTTP Record / Replay
+====================
+
+Lets the whole pipeline run without the live Sefaria API or a real
+Anthropic key - for benchmarks, CI and air-gapped machines.
+
+Modes (HTTP_REPLAY_MODE):
+- off     (default) Every request goes to the network as usual
+- record  Requests go to the network; each exchange is saved as a fixture
+- replay  Requests never leave the process; fixtures are served back,
+          after HTTP_REPLAY_LATENCY_MS of injected delay
+
+Hooks (each is a no-op when the mode is "off"):
+- httpx_transport()      -> transport= for httpx.AsyncClient
+                            (SefariaClient, SefariaValidator)
+- sync_http_client()     -> http_client= for Anthropic(...)
+- client_session()       -> drop-in for aiohttp.ClientSession()
+                            (Step 3 helpers, cache_warmer)
+
+Fixtures live under HTTP_REPLAY_DIR (default backend/data/http_fixtures),
+one JSON file per exchange, grouped by host. The key is the method, the URL
+with sorted query params, and the canonicalized body - request headers are
+never recorded, so API keys stay out of fixture files.
+
+USAGE:
+    # Capture a run
+    HTTP_REPLAY_MODE=record python console_full_pipeline.py "chezkas haguf"
+
+    # Re-run it offline with 80ms per request
+    HTTP_REPLAY_MODE=replay HTTP_REPLAY_LATENCY_MS=80 ANTHROPIC_API_KEY=replay-dummy-key \
+        python console_full_pipeline.py "chezkas haguf"
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+#  CONFIGURATION
+# ==========================================
+
+MODE_OFF = "off"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+DEFAULT_FIXTURE_DIR = Path(__file__).parent.parent / "data" / "http_fixtures"
+
+_mode: str = os.environ.get("HTTP_REPLAY_MODE", MODE_OFF).strip().lower() or MODE_OFF
+_fixture_dir: Path = Path(os.environ.get("HTTP_REPLAY_DIR", "") or DEFAULT_FIXTURE_DIR)
+_latency_ms: float = float(os.environ.get("HTTP_REPLAY_LATENCY_MS", "0") or 0)
+
+
+def configure(
+    mode: Optional[str] = None,
+    fixture_dir: Optional[Path] = None,
+    latency_ms: Optional[float] = None,
+) -> None:
+    """Override the env-derived settings (e.g. from a benchmark script)."""
+    global _mode, _fixture_dir, _latency_ms
+    if mode is not None:
+        if mode not in (MODE_OFF, MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"Unknown replay mode: {mode}")
+        _mode = mode
+    if fixture_dir is not None:
+        _fixture_dir = Path(fixture_dir)
+    if latency_ms is not None:
+        _latency_ms = float(latency_ms)
+
+
+def get_mode() -> str:
+    """Current mode: "off", "record" or "replay"."""
+    return _mode
+
+
+def is_active() -> bool:
+    """True when recording or replaying."""
+    return _mode in (MODE_RECORD, MODE_REPLAY)
+
+
+# ==========================================
+#  FIXTURE STORE
+# ==========================================
+
+def _canonical_url(url: str, params: Optional[Dict] = None) -> str:
+    """URL with query params (from the URL and params) merged and sorted."""
+    parts = urlsplit(str(url))
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items())
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(query)), ""))
+
+
+def _canonical_body(body: Optional[bytes]) -> str:
+    """Request body as a stable string (JSON bodies are re-serialized with sorted keys)."""
+    if not body:
+        return ""
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False)
+    except (ValueError, UnicodeDecodeError):
+        return hashlib.sha1(body).hexdigest()
+
+
+def fixture_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    """Stable key for one exchange."""
+    material = f"{method.upper()} {url}\n{_canonical_body(body)}"
+    return hashlib.sha1(material.encode("utf-8")).hexdigest()[:20]
+
+
+def _fixture_path(url: str, key: str) -> Path:
+    host = urlsplit(url).netloc or "local"
+    return _fixture_dir / host / f"{key}.json"
+
+
+def save_fixture(
+    method: str,
+    url: str,
+    body: Optional[bytes],
+    status: int,
+    content_type: str,
+    content: bytes,
+) -> None:
+    """Write one recorded exchange (atomic replace, safe under concurrency)."""
+    key = fixture_key(method, url, body)
+    path = _fixture_path(url, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    record: Dict[str, Any] = {
+        "method": method.upper(),
+        "url": url,
+        "request_body": _canonical_body(body),
+        "status": status,
+        "content_type": content_type,
+    }
+    try:
+        record["body"] = content.decode("utf-8")
+    except UnicodeDecodeError:
+        record["body_b64"] = base64.b64encode(content).decode("ascii")
+
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    logger.debug(f"[REPLAY] Recorded {method.upper()} {url} -> {path.name}")
+
+
+def load_fixture(method: str, url: str, body: Optional[bytes]) -> Tuple[int, str, bytes]:
+    """
+    Look up a recorded exchange.
+
+    Returns:
+        (status, content_type, content) - a 404 JSON error if not recorded
+    """
+    key = fixture_key(method, url, body)
+    path = _fixture_path(url, key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except FileNotFoundError:
+        logger.warning(f"[REPLAY] No fixture for {method.upper()} {url}")
+        error = {"error": f"No recorded fixture for {method.upper()} {url}"}
+        return 404, "application/json", json.dumps(error).encode("utf-8")
+
+    if "body_b64" in record:
+        content = base64.b64decode(record["body_b64"])
+    else:
+        content = record.get("body", "").encode("utf-8")
+    return record.get("status", 200), record.get("content_type", "application/json"), content
+
+
+# ==========================================
+#  HTTPX TRANSPORT (SefariaClient, SefariaValidator, Anthropic)
+# ==========================================
+
+class ReplayTransport(httpx.AsyncBaseTransport, httpx.BaseTransport):
+    """
+    httpx transport that records or replays exchanges.
+
+    Works for both httpx.AsyncClient and httpx.Client; in record mode the
+    real network call goes through a regular HTTP transport, built with
+    the given pool limits (httpx ignores a client's limits= once a custom
+    transport is passed).
+    """
+
+    def __init__(self, verify: bool = True, limits: Optional[httpx.Limits] = None):
+        self._transport_kwargs = {"verify": verify}
+        if limits is not None:
+            self._transport_kwargs["limits"] = limits
+        self._async_inner: Optional[httpx.AsyncHTTPTransport] = None
+        self._sync_inner: Optional[httpx.HTTPTransport] = None
+
+    @staticmethod
+    def _request_parts(request: httpx.Request) -> Tuple[str, str, bytes]:
+        return request.method, _canonical_url(request.url), request.content
+
+    @staticmethod
+    def _build_response(request: httpx.Request, status: int, content_type: str, content: bytes) -> httpx.Response:
+        return httpx.Response(
+            status,
+            headers={"content-type": content_type},
+            content=content,
+            request=request,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        method, url, body = self._request_parts(request)
+
+        if _mode == MODE_REPLAY:
+            if _latency_ms:
+                await asyncio.sleep(_latency_ms / 1000)
+            return self._build_response(request, *load_fixture(method, url, body))
+
+        if self._async_inner is None:
+            self._async_inner = httpx.AsyncHTTPTransport(**self._transport_kwargs)
+        response = await self._async_inner.handle_async_request(request)
+        content = await response.aread()
+        content_type = response.headers.get("content-type", "application/json")
+        if _mode == MODE_RECORD:
+            save_fixture(method, url, body, response.status_code, content_type, content)
+        return self._build_response(request, response.status_code, content_type, content)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        method, url, body = self._request_parts(request)
+
+        if _mode == MODE_REPLAY:
+            if _latency_ms:
+                time.sleep(_latency_ms / 1000)
+            return self._build_response(request, *load_fixture(method, url, body))
+
+        if self._sync_inner is None:
+            self._sync_inner = httpx.HTTPTransport(**self._transport_kwargs)
+        response = self._sync_inner.handle_request(request)
+        content = response.read()
+        content_type = response.headers.get("content-type", "application/json")
+        if _mode == MODE_RECORD:
+            save_fixture(method, url, body, response.status_code, content_type, content)
+        return self._build_response(request, response.status_code, content_type, content)
+
+    async def aclose(self) -> None:
+        if self._async_inner is not None:
+            await self._async_inner.aclose()
+
+    def close(self) -> None:
+        if self._sync_inner is not None:
+            self._sync_inner.close()
+
+
+def httpx_transport(verify: bool = True, limits: Optional[httpx.Limits] = None) -> Optional[ReplayTransport]:
+    """
+    transport= argument for an httpx client (None when replay is off).
+
+    Pass the client's limits here too - a client with a custom transport
+    does not apply its own.
+    """
+    if not is_active():
+        return None
+    return ReplayTransport(verify=verify, limits=limits)
+
+
+def sync_http_client() -> Optional[httpx.Client]:
+    """http_client= argument for Anthropic(...) (None when replay is off)."""
+    if not is_active():
+        return None
+    return httpx.Client(transport=ReplayTransport(), timeout=httpx.Timeout(600.0, connect=5.0))
+
+
+# ==========================================
+#  AIOHTTP SESSION (Step 3 helpers)
+# ==========================================
+
+class _ReplayResponse:
+    """The subset of aiohttp.ClientResponse the Step 3 helpers use."""
+
+    def __init__(self, status: int, content_type: str, content: bytes):
+        self.status = status
+        self.content_type = content_type
+        self._content = content
+
+    async def json(self, **kwargs) -> Any:
+        return json.loads(self._content.decode("utf-8"))
+
+    async def text(self, **kwargs) -> str:
+        return self._content.decode("utf-8", errors="replace")
+
+    async def read(self) -> bytes:
+        return self._content
+
+    async def __aenter__(self) -> "_ReplayResponse":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class _RequestContext:
+    """Awaitable / async-context wrapper so session.get() is used exactly like aiohttp's."""
+
+    def __init__(self, coro):
+        self._coro = coro
+        self._response: Optional[_ReplayResponse] = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self) -> _ReplayResponse:
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class ReplayClientSession:
+    """
+    Stand-in for aiohttp.ClientSession in record / replay mode.
+
+    Supports get()/post() with params=, json= and timeout=, which is all the
+    Step 3 helpers use.
+    """
+
+    def __init__(self):
+        self._session = None  # Real aiohttp session, record mode only
+
+    async def __aenter__(self) -> "ReplayClientSession":
+        if _mode == MODE_RECORD:
+            import aiohttp
+            self._session = aiohttp.ClientSession()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> _RequestContext:
+        return _RequestContext(self._request("GET", url, params=params, **kwargs))
+
+    def post(self, url: str, params: Optional[Dict] = None, json: Any = None, **kwargs) -> _RequestContext:
+        return _RequestContext(self._request("POST", url, params=params, json_body=json, **kwargs))
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json_body: Any = None,
+        **kwargs,
+    ) -> _ReplayResponse:
+        full_url = _canonical_url(url, params)
+        body = json.dumps(json_body).encode("utf-8") if json_body is not None else None
+
+        if _mode == MODE_REPLAY:
+            if _latency_ms:
+                await asyncio.sleep(_latency_ms / 1000)
+            return _ReplayResponse(*load_fixture(method, full_url, body))
+
+        if self._session is None:
+            await self.__aenter__()
+        async with self._session.request(method, url, params=params, json=json_body, **kwargs) as response:
+            content = await response.read()
+            content_type = response.headers.get("content-type", "application/json")
+            save_fixture(method, full_url, body, response.status, content_type, content)
+            return _ReplayResponse(response.status, content_type, content)
+
+
+def client_session():
+    """Use instead of aiohttp.ClientSession() so Step 3 traffic can be recorded / replayed."""
+    if not is_active():
+        import aiohttp
+        return aiohttp.ClientSession()
+    return ReplayClientSession()
+
+
+def fixture_stats() -> Dict[str, int]:
+    """Number of recorded fixtures per host."""
+    stats: Dict[str, int] = {}
+    if not _fixture_dir.exists():
+        return stats
+    for host_dir in sorted(p for p in _fixture_dir.iterdir() if p.is_dir()):
+        stats[host_dir.name] = sum(1 for _ in host_dir.glob("*.json"))
+    return stats
+
+
+__all__ = [
+    'MODE_OFF',
+    'MODE_RECORD',
+    'MODE_REPLAY',
+    'configure',
+    'get_mode',
+    'is_active',
+    'fixture_key',
+    'ReplayTransport',
+    'ReplayClientSession',
+    'httpx_transport',
+    'sync_http_client',
+    'client_session',
+    'fixture_stats',
+]
@@ -14,7 +14,12 @@ Hebrew transliterations have specific patterns:
 - Common endings: -os, -is, -ah, -eh, -im, -ot
 - Uncommon consonant clusters for English
 
-We also use pyenchant for spell-checking if available.
+English words are recognized with a prebuilt, memory-mapped English
+lexicon (tools/english_lexicon.py): exact membership plus a one-edit
+"typo of an English word" check, both a few binary searches. pyenchant is
+only a fallback for machines without a built lexicon, and its slow
+suggest() is never called when the lexicon exists. Per-word results are
+memoized, so classifying a query costs microseconds.
 """
 
 import re
@@ -22,10 +27,22 @@ import logging
 from typing import Tuple, Optional
 from functools import lru_cache
 
+from utils.edit_distance import levenshtein
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
-#  ENCHANT SPELL CHECKER (Optional)
+#  ENGLISH LEXICON (prebuilt, preferred)
+# =============================================================================
+
+try:
+    from .english_lexicon import get_english_lexicon
+except ImportError:
+    from tools.english_lexicon import get_english_lexicon
+
+
+# =============================================================================
+#  ENCHANT SPELL CHECKER (Optional fallback)
 # =============================================================================
 
 _enchant_dict = None
@@ -35,11 +52,11 @@ try:
     import enchant
     _enchant_dict = enchant.Dict("en_US")
     _enchant_available = True
-    logger.info("[LANG_DETECT] pyenchant available - using spell checker")
+    logger.info("[LANG_DETECT] pyenchant available - used when no English lexicon is built")
 except ImportError:
-    logger.info("[LANG_DETECT] pyenchant not available - using heuristics only")
+    logger.info("[LANG_DETECT] pyenchant not available - using the English lexicon / heuristics")
 except Exception as e:
-    logger.warning(f"[LANG_DETECT] pyenchant error: {e} - using heuristics only")
+    logger.warning(f"[LANG_DETECT] pyenchant error: {e} - using the English lexicon / heuristics")
 
 
 def is_english_word_enchant(word: str) -> Optional[bool]:
@@ -63,31 +80,20 @@ def is_english_word_enchant(word: str) -> Optional[bool]:
     if suggestions:
         # If the top suggestion is very close (1-2 edits), treat as English
         top = suggestions[0].lower()
-        if _edit_distance(word_clean, top) <= 2:
+        if levenshtein(word_clean, top, max_distance=2) <= 2:
             return True
 
     return False
 
 
-def _edit_distance(s1: str, s2: str) -> int:
-    """Simple Levenshtein edit distance."""
-    if len(s1) < len(s2):
-        return _edit_distance(s2, s1)
-
-    if len(s2) == 0:
-        return len(s1)
-
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-
-    return previous_row[-1]
+def _in_english_dictionary(word: str) -> bool:
+    """Exact dictionary check (lexicon, else enchant); False if neither is available."""
+    lexicon = get_english_lexicon()
+    if lexicon is not None:
+        return lexicon.contains(word)
+    if _enchant_available and _enchant_dict:
+        return _enchant_dict.check(word)
+    return False
 
 
 # =============================================================================
@@ -278,11 +284,22 @@ KNOWN_HEBREW_ROOTS = {
 }
 
 
+# Precompiled forms of the pattern lists above
+_STRONG_HEBREW_RES = [re.compile(pattern) for pattern in STRONG_HEBREW_PATTERNS]
+_YIDDISH_CROSSOVER_RES = [re.compile(pattern) for pattern in YIDDISH_ENGLISH_CROSSOVER_PATTERNS]
+_HEBREW_STRUCTURE_RES = [(re.compile(pattern), min_len) for pattern, min_len in HEBREW_STRUCTURE_PATTERNS]
+
+# One scan for "contains a known root" (roots of 4+ letters, longest first)
+_HEBREW_ROOT_RE = re.compile('|'.join(
+    re.escape(root) for root in sorted((r for r in KNOWN_HEBREW_ROOTS if len(r) >= 4), key=len, reverse=True)
+))
+
+
 # =============================================================================
 #  CORE DETECTION FUNCTIONS
 # =============================================================================
 
-@lru_cache(maxsize=1000)
+@lru_cache(maxsize=8192)
 def is_hebrew_transliteration(word: str) -> Tuple[bool, str]:
     """
     Determine if a word is likely a Hebrew transliteration.
@@ -303,26 +320,27 @@ def is_hebrew_transliteration(word: str) -> Tuple[bool, str]:
         return (True, "known_hebrew_term")
 
     # Check for Hebrew root within the word
-    for root in KNOWN_HEBREW_ROOTS:
-        if len(root) >= 4 and root in word_lower:
-            return (True, f"contains_hebrew_root:{root}")
+    root_match = _HEBREW_ROOT_RE.search(word_lower)
+    if root_match:
+        return (True, f"contains_hebrew_root:{root_match.group()}")
 
     # Check strong Hebrew patterns (regex)
-    for pattern in STRONG_HEBREW_PATTERNS:
-        if re.search(pattern, word_lower):
-            return (True, f"strong_pattern:{pattern}")
+    for regex in _STRONG_HEBREW_RES:
+        if regex.search(word_lower):
+            return (True, f"strong_pattern:{regex.pattern}")
 
-    # Check Yiddish/Hebrew crossover patterns (words enchant thinks are English)
-    for pattern in YIDDISH_ENGLISH_CROSSOVER_PATTERNS:
-        if re.search(pattern, word_lower):
-            return (True, f"yiddish_crossover:{pattern}")
+    # Check Yiddish/Hebrew crossover patterns (words English dictionaries list)
+    for regex in _YIDDISH_CROSSOVER_RES:
+        if regex.search(word_lower):
+            return (True, f"yiddish_crossover:{regex.pattern}")
 
     # Check Hebrew structural patterns (endings, etc.)
-    # IMPORTANT: Only apply if enchant doesn't verify as English
-    for pattern, min_len in HEBREW_STRUCTURE_PATTERNS:
-        if len(word_lower) >= min_len and re.search(pattern, word_lower):
-            # If enchant recognizes it as English, skip structural pattern matching
-            if _enchant_available and _enchant_dict and _enchant_dict.check(word_lower):
+    # IMPORTANT: Only apply if the English dictionary doesn't list the word
+    for regex, min_len in _HEBREW_STRUCTURE_RES:
+        pattern = regex.pattern
+        if len(word_lower) >= min_len and regex.search(word_lower):
+            # If it is a dictionary English word, skip structural pattern matching
+            if _in_english_dictionary(word_lower):
                 continue  # It's a valid English word, don't flag as Hebrew
 
             # Extra validation for patterns that are common in English
@@ -375,6 +393,7 @@ def is_hebrew_transliteration(word: str) -> Tuple[bool, str]:
     return (False, "no_hebrew_pattern")
 
 
+@lru_cache(maxsize=8192)
 def is_english_word(word: str) -> Tuple[bool, str]:
     """
     Determine if a word is likely English.
@@ -390,13 +409,21 @@ def is_english_word(word: str) -> Tuple[bool, str]:
     if word_lower in ENGLISH_LOOKALIKES:
         return (True, "known_english")
 
-    # Try enchant if available
-    enchant_result = is_english_word_enchant(word_lower)
-    if enchant_result is True:
-        return (True, "enchant_verified")
-    elif enchant_result is False:
-        # Enchant says no, but let's not immediately say it's Hebrew
-        pass
+    # Prebuilt lexicon: exact, then a typo of an English word
+    lexicon = get_english_lexicon()
+    if lexicon is not None:
+        if lexicon.contains(word_lower):
+            return (True, "lexicon_verified")
+        if lexicon.near_miss(word_lower):
+            return (True, "lexicon_near_miss")
+    else:
+        # Try enchant if available
+        enchant_result = is_english_word_enchant(word_lower)
+        if enchant_result is True:
+            return (True, "enchant_verified")
+        elif enchant_result is False:
+            # Enchant says no, but let's not immediately say it's Hebrew
+            pass
 
     # Check if it's Hebrew
     is_hebrew, reason = is_hebrew_transliteration(word_lower)
@@ -407,6 +434,7 @@ def is_english_word(word: str) -> Tuple[bool, str]:
     return (True, "default_assume_english")
 
 
+@lru_cache(maxsize=8192)
 def classify_word(word: str) -> Tuple[str, str]:
     """
     Classify a word as 'english', 'hebrew', or 'unknown'.
@@ -0,0 +1,430 @@
+"""
+Link Classifier
+===============
+
+One precompiled classifier for Sefaria refs and /related links, shared by
+Step 3 and SefariaClient.
+
+For every link Step 3 needs three answers: is it an unconventional source
+(Steinsaltz, introductions, ...), which requested commentator does it
+belong to, and what trickle-up level is it. The pattern tables below are
+lowercased and compiled into one regex alternation per question when the
+classifier is built, and answers are memoized per book (the ref without
+its trailing daf/segment), per collective title and per category list, so
+the 60+ links of a daf cost a handful of regex scans.
+
+Usage:
+    from tools.link_classifier import get_link_classifier
+
+    classifier = get_link_classifier()
+    for link, c in zip(links, classifier.classify_links(links, ["rashi", "tosafos"])):
+        if c.excluded or not c.target:
+            continue
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+from models import SourceLevel
+
+
+# ==========================================
+#  PATTERN TABLES
+# ==========================================
+
+# V5: Better category-to-level mapping with exclusions
+CATEGORY_TO_LEVEL = {
+    "Tanakh": SourceLevel.CHUMASH,
+    "Torah": SourceLevel.CHUMASH,
+    "Prophets": SourceLevel.CHUMASH,
+    "Writings": SourceLevel.CHUMASH,
+    "Mishnah": SourceLevel.MISHNA,
+    "Talmud": SourceLevel.GEMARA,
+    "Bavli": SourceLevel.GEMARA,
+    "Yerushalmi": SourceLevel.GEMARA,
+    "Midrash": SourceLevel.RISHONIM,
+    "Rashi": SourceLevel.RASHI,
+    "Tosafot": SourceLevel.TOSFOS,
+    "Rishonim": SourceLevel.RISHONIM,
+    "Rambam": SourceLevel.RAMBAM,
+    "Mishneh Torah": SourceLevel.RAMBAM,
+    "Tur": SourceLevel.TUR,
+    "Shulchan Arukh": SourceLevel.SHULCHAN_ARUCH,
+    "Acharonim": SourceLevel.ACHARONIM,
+}
+
+# V5: Expanded source name map with proper patterns
+SOURCE_NAME_MAP = {
+    "gemara": ["Talmud", "Bavli"],
+    "rashi": ["Rashi on"],
+    "tosafos": ["Tosafot on", "Tosafos on"],
+    "ran": ["Ran on Rif", "Chiddushei HaRan"],  # V5: Fixed - Ran writes on Rif!
+    "rashba": ["Rashba on"],
+    "ritva": ["Ritva on"],
+    "ramban": ["Ramban on"],
+    "rambam": ["Rambam", "Mishneh Torah"],
+    "rosh": ["Rosh on"],
+    "rif": ["Rif "],  # Note the space to avoid matching other things
+    "meiri": ["Meiri on"],
+    "shulchan_arukh": ["Shulchan Arukh"],
+    "mishnah_berurah": ["Mishnah Berurah"],
+    "taz": ["Taz", "Turei Zahav"],
+    "shach": ["Shakh", "Siftei Kohen"],
+    "magen_avraham": ["Magen Avraham"],
+    "ketzos": ["Ketzot HaChoshen", "Ketzos"],
+    "nesivos": ["Netivot HaMishpat", "Nesivos"],
+    "chumash": ["Torah", "Tanakh"],
+}
+
+# V5: Exclusion patterns - refs that should NOT match certain categories
+EXCLUSION_PATTERNS = {
+    "ran": ["Likutei Moharan", "Otzar", "Midrash"],  # These are NOT Ran
+    "rashi": ["Otzar", "Likutei"],
+    "tosafos": ["Piskei Tosafot"],  # This is a summary, not Tosafos itself
+}
+
+# V6.1: Unconventional sources to exclude from results
+# These are modern/academic sources that clutter the marei mekomos
+UNCONVENTIONAL_SOURCE_PATTERNS = [
+    "Steinsaltz",           # Modern Steinsaltz commentary/elucidation
+    "Introductions to the Babylonian Talmud",  # Sefaria introductions
+    "Introduction to",      # Various introductions
+    "Koren",               # Koren translations/editions
+    "William Davidson",     # William Davidson translation
+    "Jastrow",             # Dictionary
+    "Guide for the Perplexed",  # Rambam's philosophical work (usually not relevant)
+    "The Commentators",     # Generic commentary collections
+    "Sefer HaChinukh",      # Usually background, not primary
+    "Encyclopedia",         # Encyclopedia entries
+    "Otzar Laazei Rashi",   # Rashi glossary
+    "Otzar HaGeonim",       # Geonic anthology (usually background)
+]
+
+
+# Talmud tractates (a ref naming one with a daf like "4a" is gemara)
+TRACTATE_PATTERNS = [
+    "berakhot", "shabbat", "eruvin", "pesachim", "shekalim", "yoma",
+    "sukkah", "beitzah", "rosh hashanah", "taanit", "megillah", "moed katan",
+    "chagigah", "yevamot", "ketubot", "nedarim", "nazir", "sotah", "gittin",
+    "kiddushin", "bava kamma", "bava metzia", "bava batra", "sanhedrin",
+    "makkot", "shevuot", "avodah zarah", "horayot", "zevachim", "menachot",
+    "chullin", "bekhorot", "arakhin", "temurah", "keritot", "meilah",
+    "kinnim", "tamid", "middot", "niddah"
+]
+
+# V6 FIX: Improved rishonim patterns - handle "harosh", "piskei harosh", etc.
+RISHONIM_REF_PATTERNS = [
+    "rashba", "ritva", "ramban", "meiri", "nimukei",
+    "ran on", "ran ",  # Ran
+    r"\brosh\b", "harosh", "piskei"  # Rosh variations
+]
+
+_DAF_RE = re.compile(r'\d+[ab]')
+
+# Trailing " 4a:3:1" / " 12:4" / " 4a:7-12" of a ref (never part of a pattern match)
+_REF_LOCATION_RE = re.compile(r' \d[\dab:.\-]*$')
+
+
+def _compile_any(patterns: Iterable[str], escape: bool = True) -> Optional[Pattern]:
+    """One alternation regex over lowercased patterns (None if there are none)."""
+    parts = [re.escape(p.lower()) if escape else p.lower() for p in patterns]
+    if not parts:
+        return None
+    return re.compile("|".join(parts))
+
+
+def _book_of(ref_lower: str) -> str:
+    """Ref without its location: "rashi on pesachim 4a:1:1" -> "rashi on pesachim "."""
+    match = _REF_LOCATION_RE.search(ref_lower)
+    if match:
+        return ref_lower[:match.start() + 1]
+    return ref_lower
+
+
+# ==========================================
+#  CLASSIFIER
+# ==========================================
+
+@dataclass(frozen=True)
+class LinkClassification:
+    """What Step 3 needs to know about one /related link."""
+    level: SourceLevel
+    target: Optional[str]   # First requested target the link matches
+    excluded: bool          # Unconventional source - drop it
+
+
+class LinkClassifier:
+    """
+    Precompiled, memoized classification of refs and links.
+
+    All answers depend only on the book part of a ref, the collective title
+    and the category strings, so they are cached on those.
+    """
+
+    def __init__(
+        self,
+        source_name_map: Dict[str, List[str]] = SOURCE_NAME_MAP,
+        exclusion_patterns: Dict[str, List[str]] = EXCLUSION_PATTERNS,
+        unconventional_patterns: List[str] = UNCONVENTIONAL_SOURCE_PATTERNS,
+        category_to_level: Dict[str, SourceLevel] = CATEGORY_TO_LEVEL,
+        cache_size: int = 4096,
+    ):
+        self.source_name_map = source_name_map
+        self.exclusion_patterns = exclusion_patterns
+        self.category_to_level = category_to_level
+
+        self._unconventional_re = _compile_any(unconventional_patterns)
+        self._tractate_re = _compile_any(TRACTATE_PATTERNS)
+        self._rishonim_re = _compile_any(RISHONIM_REF_PATTERNS, escape=False)
+        self._target_res: Dict[str, Tuple[Optional[Pattern], Optional[Pattern]]] = {}
+
+        # Per-instance LRUs over the pure helpers
+        self._book_unconventional = lru_cache(maxsize=cache_size)(self._match_unconventional)
+        self._target_match = lru_cache(maxsize=cache_size)(self._match_target)
+        self._ref_level = lru_cache(maxsize=cache_size)(self._level)
+        self._category_level = lru_cache(maxsize=cache_size)(self._level_from_categories)
+
+    # ------------------------------------------------------------------
+    #  Unconventional sources
+    # ------------------------------------------------------------------
+
+    def _match_unconventional(self, text_lower: str) -> bool:
+        return bool(self._unconventional_re and self._unconventional_re.search(text_lower))
+
+    def is_unconventional(self, ref: str, categories: Optional[Sequence[str]] = None) -> bool:
+        """True if the source should be excluded from results."""
+        if self._book_unconventional(_book_of(ref.lower())):
+            return True
+        if categories:
+            return self._book_unconventional(" ".join(categories).lower())
+        return False
+
+    # ------------------------------------------------------------------
+    #  Target (commentator) matching
+    # ------------------------------------------------------------------
+
+    def _target_patterns(self, target: str) -> Tuple[Optional[Pattern], Optional[Pattern]]:
+        """(exclusion regex, positive regex) for a target, compiled on first use."""
+        compiled = self._target_res.get(target)
+        if compiled is None:
+            key = target.lower().replace(" ", "_")
+            compiled = (
+                _compile_any(self.exclusion_patterns.get(key, [])),
+                _compile_any(self.source_name_map.get(key, [target])),
+            )
+            self._target_res[target] = compiled
+        return compiled
+
+    def _match_target(self, book_lower: str, categories_lower: str, title_lower: str, target: str) -> bool:
+        exclusion_re, pattern_re = self._target_patterns(target)
+        # Fields are joined with newlines so no pattern can span two of them
+        haystack = f"{categories_lower}\n{title_lower}\n{book_lower}"
+        if exclusion_re and exclusion_re.search(haystack):
+            return False
+        return bool(pattern_re and pattern_re.search(haystack))
+
+    def matches_target(self, ref: str, categories: str, collective_title: str, target: str) -> bool:
+        """Does the link belong to target (e.g. "rashi"), honouring EXCLUSION_PATTERNS?"""
+        return self._target_match(
+            _book_of(ref.lower()), (categories or "").lower(), (collective_title or "").lower(), target
+        )
+
+    def match_target(
+        self, ref: str, categories: str, collective_title: str, targets: Sequence[str]
+    ) -> Optional[str]:
+        """First of targets the link matches, or None."""
+        book = _book_of(ref.lower())
+        categories_lower = (categories or "").lower()
+        title_lower = (collective_title or "").lower()
+        for target in targets:
+            if self._target_match(book, categories_lower, title_lower, target):
+                return target
+        return None
+
+    # ------------------------------------------------------------------
+    #  Levels
+    # ------------------------------------------------------------------
+
+    def _level(self, book_lower: str, has_daf: bool, categories: Tuple[str, ...]) -> SourceLevel:
+        # Check ref patterns first
+        if "rashi on" in book_lower:
+            return SourceLevel.RASHI
+        if "tosafot on" in book_lower or "tosafos on" in book_lower:
+            return SourceLevel.TOSFOS
+        if "rambam" in book_lower or "mishneh torah" in book_lower:
+            return SourceLevel.RAMBAM
+        if "shulchan arukh" in book_lower or "shulchan aruch" in book_lower:
+            return SourceLevel.SHULCHAN_ARUCH
+        if "tur " in book_lower:
+            return SourceLevel.TUR
+
+        # V5: Check for Ran on Rif specifically
+        if "ran on rif" in book_lower:
+            return SourceLevel.RISHONIM
+
+        # V6 FIX: Talmud tractate name + daf like "4a" or "4b"
+        if has_daf and self._tractate_re.search(book_lower):
+            return SourceLevel.GEMARA
+
+        for cat in categories:
+            if cat in self.category_to_level:
+                return self.category_to_level[cat]
+
+        if self._rishonim_re.search(book_lower):
+            return SourceLevel.RISHONIM
+
+        return SourceLevel.OTHER
+
+    def level(self, categories: Sequence[str], ref: str) -> SourceLevel:
+        """
+        Step 3 level: ref patterns first (Rashi on, Tosafot on, tractate + daf),
+        then CATEGORY_TO_LEVEL, then rishonim names.
+        """
+        ref_lower = ref.lower()
+        return self._ref_level(
+            _book_of(ref_lower), bool(_DAF_RE.search(ref_lower)), tuple(categories or ())
+        )
+
+    def _level_from_categories(self, categories: Tuple[str, ...]) -> SourceLevel:
+        if not categories:
+            return SourceLevel.OTHER
+
+        cat_str = " ".join(categories).lower()
+
+        # Chumash / Tanakh
+        if "tanakh" in cat_str or "torah" in cat_str:
+            if "commentary" in cat_str:
+                # Commentary on Tanakh
+                if "rashi" in cat_str:
+                    return SourceLevel.RASHI
+                return SourceLevel.RISHONIM
+            return SourceLevel.CHUMASH
+
+        # Mishna
+        if "mishnah" in cat_str or "mishna" in cat_str:
+            if "commentary" in cat_str:
+                return SourceLevel.RISHONIM
+            return SourceLevel.MISHNA
+
+        # Talmud
+        if "talmud" in cat_str:
+            if "commentary" in cat_str:
+                if "rashi" in cat_str:
+                    return SourceLevel.RASHI
+                if "tosafot" in cat_str or "tosfos" in cat_str:
+                    return SourceLevel.TOSFOS
+                # Other Talmud commentaries are Rishonim/Acharonim
+                if any(name in cat_str for name in ["ritva", "rashba", "ran", "ramban", "rosh"]):
+                    return SourceLevel.RISHONIM
+                if any(name in cat_str for name in ["pnei yehoshua", "maharsha", "maharam"]):
+                    return SourceLevel.ACHARONIM
+                return SourceLevel.RISHONIM  # Default for Talmud commentary
+            return SourceLevel.GEMARA
+
+        # Rambam - special handling
+        if "rambam" in cat_str or "mishneh torah" in cat_str:
+            return SourceLevel.RAMBAM
+
+        # Shulchan Aruch
+        if "shulchan" in cat_str or "shulkhan" in cat_str:
+            return SourceLevel.SHULCHAN_ARUCH
+
+        # Tur
+        if "tur" in cat_str and "arba" in cat_str:
+            return SourceLevel.TUR
+
+        # Nosei Keilim on Shulchan Aruch
+        if any(name in cat_str for name in ["shakh", "taz", "magen avraham", "mishnah berurah"]):
+            return SourceLevel.NOSEI_KEILIM
+
+        # Rishonim (general)
+        if "rishonim" in cat_str:
+            return SourceLevel.RISHONIM
+
+        # Acharonim (general)
+        if "acharonim" in cat_str or "responsa" in cat_str:
+            return SourceLevel.ACHARONIM
+
+        # Halakhah general
+        if "halakhah" in cat_str or "halacha" in cat_str:
+            return SourceLevel.SHULCHAN_ARUCH  # Default for halakha
+
+        return SourceLevel.OTHER
+
+    def category_level(self, categories: Sequence[str]) -> SourceLevel:
+        """
+        SefariaClient level, from Sefaria categories alone.
+
+        Sefaria categories look like:
+        - ["Talmud", "Bavli", "Seder Nashim", "Kesubos"]
+        - ["Tanakh", "Torah", "Genesis"]
+        - ["Commentary", "Talmud", "Rashi"]
+        - ["Halakhah", "Shulchan Arukh", "Orach Chaim"]
+        """
+        return self._category_level(tuple(categories or ()))
+
+    # ------------------------------------------------------------------
+    #  Bulk
+    # ------------------------------------------------------------------
+
+    def classify(self, link: Dict, targets: Sequence[str] = ()) -> LinkClassification:
+        """Classify one /related link against the requested targets."""
+        ref_lower = link.get("ref", "").lower()
+        book = _book_of(ref_lower)
+        categories = tuple(link.get("categories") or ())
+
+        excluded = self._book_unconventional(book) or (
+            bool(categories) and self._book_unconventional(" ".join(categories).lower())
+        )
+
+        categories_lower = (link.get("category") or "").lower()
+        title_lower = (link.get("collectiveTitle", {}).get("en") or "").lower()
+        target = None
+        for candidate in targets:
+            if self._target_match(book, categories_lower, title_lower, candidate):
+                target = candidate
+                break
+
+        return LinkClassification(
+            level=self._ref_level(book, bool(_DAF_RE.search(ref_lower)), categories),
+            target=target,
+            excluded=excluded,
+        )
+
+    def classify_links(self, links: List[Dict], targets: Sequence[str] = ()) -> List[LinkClassification]:
+        """Classify a batch of /related links (one result per link, same order)."""
+        return [self.classify(link, targets) for link in links]
+
+    def cache_info(self) -> Dict[str, Tuple[int, int]]:
+        """(hits, misses) per memo table."""
+        tables = {
+            "unconventional": self._book_unconventional,
+            "target": self._target_match,
+            "level": self._ref_level,
+            "category_level": self._category_level,
+        }
+        return {name: (fn.cache_info().hits, fn.cache_info().misses) for name, fn in tables.items()}
+
+
+_link_classifier: Optional[LinkClassifier] = None
+
+
+def get_link_classifier() -> LinkClassifier:
+    """Get the shared classifier (built once)."""
+    global _link_classifier
+    if _link_classifier is None:
+        _link_classifier = LinkClassifier()
+    return _link_classifier
+
+
+__all__ = [
+    'CATEGORY_TO_LEVEL',
+    'SOURCE_NAME_MAP',
+    'EXCLUSION_PATTERNS',
+    'UNCONVENTIONAL_SOURCE_PATTERNS',
+    'LinkClassification',
+    'LinkClassifier',
+    'get_link_classifier',
+]
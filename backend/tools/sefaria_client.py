@@ -21,7 +21,7 @@ import httpx
 import asyncio
 import json
 import re
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Callable, Awaitable, AsyncIterator
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
@@ -33,6 +33,14 @@ logger = logging.getLogger(__name__)
 
 # Import centralized SourceLevel definition from models.py
 from models import SourceLevel
+from utils.refs import parse_ref
+
+try:
+    from .http_replay import httpx_transport
+    from .link_classifier import get_link_classifier
+except ImportError:
+    from tools.http_replay import httpx_transport
+    from tools.link_classifier import get_link_classifier
 
 
 # ==========================================
@@ -122,6 +130,41 @@ class RelatedContent:
     sheets: int                         # Number of source sheets (popularity indicator)
 
 
+# ==========================================
+#  TEXT LANGUAGE SELECTION
+# ==========================================
+
+# Sefaria v3 /texts `version` selectors per language mode. Scoring only
+# ever looks at the Hebrew, so "he" is the default everywhere; English is
+# fetched on its own, and only for sources a client asked to see it for.
+TEXT_VERSION_PARAMS: Dict[str, List[Tuple[str, str]]] = {
+    "he": [("version", "hebrew")],
+    "en": [("version", "english")],
+    "all": [("version", "hebrew"), ("version", "english")],
+}
+
+
+def legacy_text_shape(response: Optional[Dict]) -> Optional[Dict]:
+    """
+    Map a v3 /texts response onto the legacy {"he": ..., "text": ...} keys.
+
+    v3 returns the text inside a "versions" list (one entry per requested
+    version, tagged with its language). Legacy-shaped responses are
+    returned unchanged.
+    """
+    if not response or "versions" not in response:
+        return response
+
+    shaped = {key: value for key, value in response.items() if key != "versions"}
+    shaped["he"] = []
+    shaped["text"] = []
+    for version in response.get("versions") or []:
+        key = "he" if version.get("language") == "he" else "text"
+        if not shaped[key]:
+            shaped[key] = version.get("text") or []
+    return shaped
+
+
 # ==========================================
 #  CATEGORY MAPPING
 # ==========================================
@@ -135,72 +178,10 @@ def determine_source_level(categories: List[str], ref: str = "") -> SourceLevel:
     - ["Tanakh", "Torah", "Genesis"]
     - ["Commentary", "Talmud", "Rashi"]
     - ["Halakhah", "Shulchan Arukh", "Orach Chaim"]
-    """
-    if not categories:
-        return SourceLevel.OTHER
-    
-    cat_str = " ".join(categories).lower()
-    ref_lower = ref.lower()
-    
-    # Chumash / Tanakh
-    if "tanakh" in cat_str or "torah" in cat_str:
-        if "commentary" in cat_str:
-            # Commentary on Tanakh
-            if "rashi" in cat_str:
-                return SourceLevel.RASHI
-            return SourceLevel.RISHONIM
-        return SourceLevel.CHUMASH
-    
-    # Mishna
-    if "mishnah" in cat_str or "mishna" in cat_str:
-        if "commentary" in cat_str:
-            return SourceLevel.RISHONIM
-        return SourceLevel.MISHNA
-    
-    # Talmud
-    if "talmud" in cat_str:
-        if "commentary" in cat_str:
-            if "rashi" in cat_str:
-                return SourceLevel.RASHI
-            if "tosafot" in cat_str or "tosfos" in cat_str:
-                return SourceLevel.TOSFOS
-            # Other Talmud commentaries are Rishonim/Acharonim
-            if any(name in cat_str for name in ["ritva", "rashba", "ran", "ramban", "rosh"]):
-                return SourceLevel.RISHONIM
-            if any(name in cat_str for name in ["pnei yehoshua", "maharsha", "maharam"]):
-                return SourceLevel.ACHARONIM
-            return SourceLevel.RISHONIM  # Default for Talmud commentary
-        return SourceLevel.GEMARA
-    
-    # Rambam - special handling
-    if "rambam" in cat_str or "mishneh torah" in cat_str:
-        return SourceLevel.RAMBAM
     
-    # Shulchan Aruch
-    if "shulchan" in cat_str or "shulkhan" in cat_str:
-        return SourceLevel.SHULCHAN_ARUCH
-    
-    # Tur
-    if "tur" in cat_str and "arba" in cat_str:
-        return SourceLevel.TUR
-    
-    # Nosei Keilim on Shulchan Aruch
-    if any(name in cat_str for name in ["shakh", "taz", "magen avraham", "mishnah berurah"]):
-        return SourceLevel.NOSEI_KEILIM
-    
-    # Rishonim (general)
-    if "rishonim" in cat_str:
-        return SourceLevel.RISHONIM
-    
-    # Acharonim (general)
-    if "acharonim" in cat_str or "responsa" in cat_str:
-        return SourceLevel.ACHARONIM
-    
-    # Halakhah general
-    if "halakhah" in cat_str or "halacha" in cat_str:
-        return SourceLevel.SHULCHAN_ARUCH  # Default for halakha
-    
-    return SourceLevel.OTHER
+    The rules live in tools/link_classifier.py (memoized per category list).
+    """
+    return get_link_classifier().category_level(categories)
 
 
 # ==========================================
@@ -269,6 +250,12 @@ def extract_masechta_from_ref(ref: str) -> Optional[str]:
     - "Rashi on Ketubot 9a:1" → "Ketubot"
     - "Tosafot on Pesachim 10a:2:1" → "Pesachim"
     """
+    parsed = parse_ref(ref)
+    if parsed is not None:
+        canonical = MASECHTOT.get(parsed.book.lower())
+        if canonical:
+            return canonical
+
     ref_lower = ref.lower()
     
     # Check each masechta name
@@ -294,25 +281,84 @@ def extract_masechta_from_path(path: List[str]) -> Optional[str]:
 #  SIMPLE FILE CACHE
 # ==========================================
 
+@dataclass
+class CachePolicy:
+    """
+    Freshness policy for one kind of cached response.
+
+    - Younger than ttl: fresh, served directly
+    - Between ttl and max_age: stale, served immediately while a
+      background refresh replaces it (stale-while-revalidate)
+    - Older than max_age: refused and deleted, caller fetches
+    """
+    ttl: timedelta
+    max_age: timedelta
+
+
+# Per-endpoint policies, keyed by the first segment of the cache key
+# ("search:...", "text:...", "related:..."; Step 3 keys are "step3:text:...").
+# Search hits shift as Sefaria reindexes; canonical texts almost never change.
+CACHE_POLICIES: Dict[str, CachePolicy] = {
+    "search": CachePolicy(ttl=timedelta(hours=6), max_age=timedelta(days=3)),
+    "text": CachePolicy(ttl=timedelta(days=30), max_age=timedelta(days=365)),
+    "related": CachePolicy(ttl=timedelta(days=7), max_age=timedelta(days=90)),
+}
+
+
+def cache_endpoint(key: str) -> str:
+    """Endpoint name a cache key belongs to ("search", "text", "related", ...)."""
+    parts = key.split(":", 2)
+    if parts[0] == "step3" and len(parts) > 1:
+        return parts[1]
+    return parts[0]
+
+
 class FileCache:
-    """Simple file-based cache for Sefaria API responses."""
+    """
+    Simple file-based cache for Sefaria API responses.
+
+    Entries past their TTL are still returned (flagged stale) until the
+    endpoint's hard max-age, so callers can answer immediately and refresh
+    in the background via revalidate().
+    """
     
-    def __init__(self, cache_dir: str = "cache/sefaria_v2", ttl_hours: int = 168):
+    def __init__(
+        self,
+        cache_dir: str = "cache/sefaria_v2",
+        ttl_hours: int = 168,
+        max_age_hours: Optional[int] = None,
+        policies: Optional[Dict[str, CachePolicy]] = None,
+    ):
         self.cache_dir = Path(__file__).parent.parent / cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.ttl = timedelta(hours=ttl_hours)
+        self.default_policy = CachePolicy(
+            ttl=self.ttl,
+            max_age=timedelta(hours=max_age_hours) if max_age_hours else self.ttl * 4,
+        )
+        self.policies = CACHE_POLICIES if policies is None else policies
+        self._revalidating: Dict[str, asyncio.Task] = {}
     
     def _get_cache_path(self, key: str) -> Path:
         """Generate cache file path from key."""
         key_hash = hashlib.md5(key.encode()).hexdigest()
         return self.cache_dir / f"{key_hash}.json"
+
+    def policy_for(self, key: str) -> CachePolicy:
+        """Freshness policy that applies to a cache key."""
+        return self.policies.get(cache_endpoint(key), self.default_policy)
     
-    def get(self, key: str) -> Optional[Dict]:
-        """Get cached value if exists and not expired."""
+    def get_entry(self, key: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Get a cached value along with its staleness.
+
+        Returns:
+            (value, is_stale) - value is None on miss or past max-age
+        """
         cache_path = self._get_cache_path(key)
         
         if not cache_path.exists():
-            return None
+            return None, False
         
         try:
             with open(cache_path, 'r', encoding='utf-8') as f:
@@ -320,14 +366,23 @@ class FileCache:
             
             # Check expiration
             cached_time = datetime.fromisoformat(data.get('_cached_at', '2000-01-01'))
-            if datetime.now() - cached_time > self.ttl:
+            age = datetime.now() - cached_time
+            policy = self.policy_for(key)
+            if age > policy.max_age:
                 cache_path.unlink()
-                return None
+                return None, False
             
-            return data.get('value')
+            return data.get('value'), age > policy.ttl
         except Exception as e:
             logger.warning(f"Cache read error: {e}")
+            return None, False
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Dict]:
+        """Get cached value if exists and not expired (or merely stale, if allowed)."""
+        value, is_stale = self.get_entry(key)
+        if is_stale and not allow_stale:
             return None
+        return value
     
     def set(self, key: str, value: Dict):
         """Save value to cache."""
@@ -344,11 +399,50 @@ class FileCache:
         except Exception as e:
             logger.warning(f"Cache write error: {e}")
 
+    def revalidate(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Refresh a stale entry in the background.
+
+        refresh() must fetch and set() the new value itself. At most one
+        refresh per key is in flight; if it fails the stale entry stays
+        until its max-age.
+        """
+        if key in self._revalidating:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        async def _run():
+            try:
+                await refresh()
+            except Exception as e:
+                logger.debug(f"Background revalidation failed for {key[:50]}: {e}")
+            finally:
+                self._revalidating.pop(key, None)
+
+        logger.debug(f"Serving stale, revalidating: {key[:50]}...")
+        self._revalidating[key] = loop.create_task(_run())
+
+    def entry_size(self, key: str) -> int:
+        """Size in bytes of the cached entry for key (0 if not cached)."""
+        cache_path = self._get_cache_path(key)
+        try:
+            return cache_path.stat().st_size
+        except OSError:
+            return 0
+
 
 # ==========================================
 #  SEFARIA CLIENT
 # ==========================================
 
+# _source fields read by _parse_search_hit; everything else (the full text in
+# "exact"/"naive_lemmatizer", version metadata, ...) is left on the server.
+SEARCH_SOURCE_FIELDS = ["ref", "heRef", "path"]
+
+
 class SefariaClient:
     """
     Main client for interacting with Sefaria's API.
@@ -396,17 +490,35 @@ class SefariaClient:
         Returns:
             JSON response as dict, or None on error
         """
-        # Check cache first
+        # Check cache first (stale entries are served while refreshing)
         if cache_key and self.cache:
-            cached = self.cache.get(cache_key)
+            cached, is_stale = self.cache.get_entry(cache_key)
             if cached is not None:
                 logger.debug(f"Cache hit: {cache_key[:50]}...")
+                if is_stale:
+                    self.cache.revalidate(cache_key, lambda: self._fetch(
+                        method, endpoint, params, json_data, cache_key, skip_cache_if_empty_text
+                    ))
                 return cached
         
+        return await self._fetch(method, endpoint, params, json_data, cache_key, skip_cache_if_empty_text)
+
+    async def _fetch(
+        self,
+        method: str,
+        endpoint: str,
+        params: Dict = None,
+        json_data: Dict = None,
+        cache_key: str = None,
+        skip_cache_if_empty_text: bool = False
+    ) -> Optional[Dict]:
+        """Network half of _request: call Sefaria and cache a successful response."""
         url = f"{self.BASE_URL}{endpoint}"
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, verify=False) as client:
+            async with httpx.AsyncClient(
+                timeout=self.timeout, verify=False, transport=httpx_transport(verify=False)
+            ) as client:
                 if method.upper() == "GET":
                     response = await client.get(url, params=params)
                 elif method.upper() == "POST":
@@ -421,8 +533,9 @@ class SefariaClient:
                     should_cache = True
                     if skip_cache_if_empty_text:
                         # Check if this is an empty text response
-                        he_content = data.get("he", "")
-                        text_content = data.get("text", "")
+                        shaped = legacy_text_shape(data)
+                        he_content = shaped.get("he", "")
+                        text_content = shaped.get("text", "")
                         if isinstance(he_content, list):
                             he_content = "".join(str(x) for x in he_content if x)
                         if isinstance(text_content, list):
@@ -517,29 +630,21 @@ class SefariaClient:
     #  SEARCH API
     # ------------------------------------------
     
-    async def search(
-        self, 
-        query: str, 
-        size: int = 100,
-        filters: List[str] = None
-    ) -> SearchResults:
+    def _build_search_query(
+        self,
+        query: str,
+        size: int,
+        filters: List[str] = None,
+        start: int = 0,
+        lean: bool = True,
+        highlight: bool = True,
+    ) -> Dict[str, Any]:
         """
-        Search for a term across Sefaria's corpus.
-        
-        Uses Sefaria's ElasticSearch proxy.
-        
-        Args:
-            query: Hebrew or English term to search for
-            size: Number of results to return (max 100)
-            filters: Category filters (e.g., ["Talmud", "Midrash"])
-        
-        Returns:
-            SearchResults with hits and aggregations
+        Build the ElasticSearch body for a Sefaria text search.
+
+        Lean mode projects _source down to SEARCH_SOURCE_FIELDS and asks for a
+        single highlight fragment, which is all the parser below reads.
         """
-        logger.info(f"Searching Sefaria for: '{query}'")
-        
-        # Build ElasticSearch query (via Sefaria ES proxy).
-        #
         # IMPORTANT:
         # - Sefaria's "text" search supports filtering on the *path* field (not "categories").
         # - Using match_phrase on "naive_lemmatizer" is generally more reliable for Hebrew.
@@ -555,13 +660,6 @@ class SefariaClient:
 
         es_query: Dict[str, Any] = {
             "size": size,
-            "highlight": {
-                "pre_tags": ["<b>"],
-                "post_tags": ["</b>"],
-                "fields": {
-                    "exact": {"fragment_size": 200}
-                }
-            },
             "query": {
                 "function_score": {
                     "field_value_factor": {
@@ -577,6 +675,22 @@ class SefariaClient:
             }
         }
 
+        if start:
+            es_query["from"] = start
+
+        if lean:
+            es_query["_source"] = SEARCH_SOURCE_FIELDS if size else False
+
+        if highlight and size:
+            es_query["highlight"] = {
+                "pre_tags": ["<b>"],
+                "post_tags": ["</b>"],
+                "fields": {
+                    "exact": {"fragment_size": 200, "number_of_fragments": 1} if lean
+                    else {"fragment_size": 200}
+                }
+            }
+
         # Apply filters on the 'path' field (AND semantics).
         if filters:
             path_regexes = self._filters_to_path_regexes(filters)
@@ -587,14 +701,89 @@ class SefariaClient:
                     }
                 }
 
+        return es_query
+
+    @staticmethod
+    def _parse_total_hits(response: Dict) -> int:
+        """hits.total is an int on older ES versions and {"value": n} on newer ones."""
+        total_hits = response.get("hits", {}).get("total", 0)
+        if isinstance(total_hits, dict):
+            total_hits = total_hits.get("value", 0)
+        return total_hits or 0
+
+    @staticmethod
+    def _parse_search_hit(hit: Dict) -> SearchHit:
+        """Convert one raw ES hit into a SearchHit."""
+        source = hit.get("_source", {})
+        
+        ref = source.get("ref", "")
+        path = source.get("path", "").split("/") if source.get("path") else []
+        
+        # Extract text snippets
+        highlight = hit.get("highlight", {})
+        text_snippet = ""
+        if highlight.get("exact"):
+            text_snippet = highlight["exact"][0]
+        elif source.get("exact"):
+            text_snippet = source["exact"][:300]
+        
+        return SearchHit(
+            ref=ref,
+            he_ref=source.get("heRef", ref),
+            text_snippet=text_snippet,
+            english_snippet="",  # Would need separate query for English
+            score=hit.get("_score", 0),
+            category=path[0] if path else "",
+            path=path
+        )
+
+    async def _search_page(
+        self,
+        query: str,
+        size: int,
+        filters: List[str] = None,
+        start: int = 0,
+        lean: bool = True,
+    ) -> Optional[Dict]:
+        """Fetch one raw page of search results (cached)."""
+        es_query = self._build_search_query(query, size, filters, start=start, lean=lean)
         cache_key = f"search:{query}:{size}:{filters}"
+        if start:
+            cache_key += f":from={start}"
+        if not lean:
+            cache_key += ":full"
         
-        response = await self._request(
+        return await self._request(
             "POST",
             "/api/search/text/_search",
             json_data=es_query,
             cache_key=cache_key
         )
+
+    async def search(
+        self, 
+        query: str, 
+        size: int = 100,
+        filters: List[str] = None,
+        lean: bool = True
+    ) -> SearchResults:
+        """
+        Search for a term across Sefaria's corpus.
+        
+        Uses Sefaria's ElasticSearch proxy.
+        
+        Args:
+            query: Hebrew or English term to search for
+            size: Number of results to return (max 100)
+            filters: Category filters (e.g., ["Talmud", "Midrash"])
+            lean: Only request the _source fields we parse (ref, heRef, path)
+        
+        Returns:
+            SearchResults with hits and aggregations
+        """
+        logger.info(f"Searching Sefaria for: '{query}'")
+        
+        response = await self._search_page(query, size, filters, lean=lean)
         
         if not response:
             return SearchResults(
@@ -607,47 +796,23 @@ class SefariaClient:
             )
         
         # Parse response
-        total_hits = response.get("hits", {}).get("total", {})
-        if isinstance(total_hits, dict):
-            total_hits = total_hits.get("value", 0)
+        total_hits = self._parse_total_hits(response)
         
         hits = []
         hits_by_category = {}
         hits_by_masechta = {}
         
         for hit in response.get("hits", {}).get("hits", []):
-            source = hit.get("_source", {})
-            
-            ref = source.get("ref", "")
-            path = source.get("path", "").split("/") if source.get("path") else []
-            
-            # Extract text snippets
-            highlight = hit.get("highlight", {})
-            text_snippet = ""
-            if highlight.get("exact"):
-                text_snippet = highlight["exact"][0]
-            elif source.get("exact"):
-                text_snippet = source["exact"][:300]
-            
-            search_hit = SearchHit(
-                ref=ref,
-                he_ref=source.get("heRef", ref),
-                text_snippet=text_snippet,
-                english_snippet="",  # Would need separate query for English
-                score=hit.get("_score", 0),
-                category=path[0] if path else "",
-                path=path
-            )
-            
+            search_hit = self._parse_search_hit(hit)
             hits.append(search_hit)
             
             # Aggregate by category
-            if path:
-                cat = path[0]
+            if search_hit.path:
+                cat = search_hit.path[0]
                 hits_by_category[cat] = hits_by_category.get(cat, 0) + 1
             
             # Aggregate by masechta (for Talmud refs)
-            masechta = extract_masechta_from_ref(ref) or extract_masechta_from_path(path)
+            masechta = extract_masechta_from_ref(search_hit.ref) or extract_masechta_from_path(search_hit.path)
             if masechta:
                 hits_by_masechta[masechta] = hits_by_masechta.get(masechta, 0) + 1
         
@@ -673,6 +838,52 @@ class SefariaClient:
             hits_by_masechta=hits_by_masechta,
             top_refs=top_refs
         )
+
+    async def count(self, query: str, filters: List[str] = None) -> int:
+        """
+        Number of hits for a term, without fetching any documents.
+
+        Sends size=0 with no _source and no highlighting, so the response
+        is just hits.total.
+        """
+        response = await self._search_page(query, 0, filters)
+        if not response:
+            return 0
+        return self._parse_total_hits(response)
+
+    async def iter_search(
+        self,
+        query: str,
+        page_size: int = 20,
+        max_hits: int = 100,
+        filters: List[str] = None
+    ) -> AsyncIterator[SearchHit]:
+        """
+        Lazily page through search hits.
+
+        The next page is only requested once the caller has consumed the
+        current one, so callers that stop early (e.g. after finding the
+        first matching ref) never pay for the remaining pages.
+
+        Usage:
+            async for hit in client.iter_search("חזקת הגוף"):
+                if extract_masechta_from_ref(hit.ref) == "Ketubot":
+                    break
+        """
+        start = 0
+        while start < max_hits:
+            size = min(page_size, max_hits - start)
+            response = await self._search_page(query, size, filters, start=start)
+            if not response:
+                return
+            
+            page = response.get("hits", {}).get("hits", [])
+            for hit in page:
+                yield self._parse_search_hit(hit)
+            
+            if len(page) < size:
+                return
+            start += size
     
     # ------------------------------------------
     #  TEXT API
@@ -687,6 +898,7 @@ class SefariaClient:
         """
         if not response:
             return False
+        response = legacy_text_shape(response)
         
         # Check Hebrew text
         hebrew = response.get("he", "")
@@ -707,7 +919,8 @@ class SefariaClient:
         self, 
         ref: str,
         with_context: bool = False,
-        context_padding: int = 0
+        context_padding: int = 0,
+        language: str = "he"
     ) -> Optional[TextContent]:
         """
         Fetch the text content for a specific reference.
@@ -716,16 +929,17 @@ class SefariaClient:
             ref: Sefaria reference (e.g., "Ketubot 9a", "Rashi on Ketubot 9a:1")
             with_context: Include surrounding context
             context_padding: Number of segments before/after to include
+            language: "he" (default), "en" or "all" - which versions to fetch
         
         Returns:
-            TextContent with Hebrew and English text
+            TextContent with the requested language(s)
         """
-        logger.debug(f"Fetching text: {ref}")
+        logger.debug(f"Fetching text: {ref} ({language})")
         
         # URL-encode the ref
         encoded_ref = ref.replace(" ", "%20")
         
-        cache_key = f"text:{ref}:{with_context}:{context_padding}"
+        cache_key = f"text:{ref}:{with_context}:{context_padding}:{language}"
         
         params = {}
         if with_context:
@@ -735,10 +949,11 @@ class SefariaClient:
         response = await self._request(
             "GET",
             f"/api/v3/texts/{encoded_ref}",
-            params=params,
+            params=list(params.items()) + TEXT_VERSION_PARAMS[language],
             cache_key=cache_key,
             skip_cache_if_empty_text=True  # Don't cache empty text responses
         )
+        response = legacy_text_shape(response)
         
         # Check if v3 returned empty content - if so, try legacy API
         # This handles cases where v3 returns 200 OK but with empty text fields
@@ -947,6 +1162,10 @@ class SefariaClient:
         
         "Ketubot 9a:5" → "Ketubot 9a"
         """
+        parsed = parse_ref(ref)
+        if parsed is not None:
+            return parsed.amud_ref
+
         # Remove segment numbers
         parts = ref.split(":")
         if len(parts) > 1:
@@ -956,7 +1175,8 @@ class SefariaClient:
     async def get_sugya_sources(
         self, 
         gemara_ref: str,
-        depth: str = "standard"
+        depth: str = "standard",
+        language: str = "he"
     ) -> Dict[SourceLevel, List[TextContent]]:
         """
         Get all sources for a sugya organized by level.
@@ -968,6 +1188,7 @@ class SefariaClient:
             gemara_ref: Reference to the Gemara (e.g., "Ketubot 9a")
             depth: "basic" (gemara only), "standard" (+ rashi/tosfos), 
                    "expanded" (+ rishonim), "full" (everything)
+            language: Passed to get_text ("all" to include English)
         
         Returns:
             Dict mapping SourceLevel to list of TextContent
@@ -979,7 +1200,7 @@ class SefariaClient:
         }
         
         # Get the Gemara text
-        gemara = await self.get_text(gemara_ref)
+        gemara = await self.get_text(gemara_ref, language=language)
         if gemara:
             sources[SourceLevel.GEMARA].append(gemara)
         
@@ -1012,7 +1233,7 @@ class SefariaClient:
         # Fetch commentaries
         for commentary in related.commentaries:
             if commentary.level in levels_to_include:
-                text = await self.get_text(commentary.ref)
+                text = await self.get_text(commentary.ref, language=language)
                 if text:
                     sources[text.level].append(text)
         
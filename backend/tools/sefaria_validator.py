@@ -27,6 +27,13 @@ from typing import List, Dict, Optional, Set
 import logging
 import atexit
 
+try:
+    from .http_replay import httpx_transport
+except ImportError:
+    from tools.http_replay import httpx_transport
+
+from utils.edit_distance import within
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,10 +52,21 @@ class SefariaValidator:
     """
     
     BASE_URL = "https://www.sefaria.org/api/search-wrapper"
+
+    # Validation only needs hits.total. Set > 0 to also pull that many
+    # sample refs (taken from each hit's _id, so no _source is requested).
+    SAMPLE_REF_COUNT = 0
     
     # Class-level shared client for connection pooling
     _shared_client: Optional[httpx.AsyncClient] = None
     _client_lock = asyncio.Lock() if hasattr(asyncio, 'Lock') else None
+
+    # Shared budget for in-flight search requests. Step 1 validates every
+    # word of a query concurrently, each word with its own validate_batch;
+    # this caps the total sent to Sefaria at once.
+    MAX_CONCURRENT_REQUESTS = 16  # Stays under the client pool's max_connections
+    _request_slots: Optional[asyncio.Semaphore] = None
+    _request_slots_loop = None
     
     def __init__(self, timeout: float = 10.0):
         self.timeout = timeout
@@ -64,20 +82,31 @@ class SefariaValidator:
         """
         if SefariaValidator._shared_client is None or SefariaValidator._shared_client.is_closed:
             # Create client with connection pooling settings
+            limits = httpx.Limits(
+                max_connections=20,
+                max_keepalive_connections=10,
+                keepalive_expiry=30.0
+            )
             SefariaValidator._shared_client = httpx.AsyncClient(
                 verify=False,  # Sefaria uses valid certs, but some envs have issues
                 timeout=httpx.Timeout(self.timeout, connect=5.0),
                 http2=False,  # Disabled HTTP/2 (requires h2 package)
-                limits=httpx.Limits(
-                    max_connections=20,
-                    max_keepalive_connections=10,
-                    keepalive_expiry=30.0
-                )
+                limits=limits,
+                # Record/replay hook (None = network); carries the same pool limits
+                transport=httpx_transport(verify=False, limits=limits),
             )
             logger.debug("[VALIDATOR] Created shared HTTP client with connection pooling")
         
         return SefariaValidator._shared_client
     
+    def _request_budget(self) -> asyncio.Semaphore:
+        """The shared request semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if SefariaValidator._request_slots is None or SefariaValidator._request_slots_loop is not loop:
+            SefariaValidator._request_slots = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+            SefariaValidator._request_slots_loop = loop
+        return SefariaValidator._request_slots
+    
     async def close(self):
         """Close the shared HTTP client (call on shutdown)."""
         if SefariaValidator._shared_client and not SefariaValidator._shared_client.is_closed:
@@ -136,27 +165,6 @@ class SefariaValidator:
             return ""
         return re.sub(r"[^a-z]", "", s.lower())
 
-    @staticmethod
-    def _levenshtein(a: str, b: str) -> int:
-        """Small Levenshtein distance implementation (no dependencies)."""
-        if a == b:
-            return 0
-        if not a:
-            return len(b)
-        if not b:
-            return len(a)
-        # DP with two rows
-        prev = list(range(len(b) + 1))
-        for i, ca in enumerate(a, 1):
-            cur = [i]
-            for j, cb in enumerate(b, 1):
-                ins = cur[j-1] + 1
-                dele = prev[j] + 1
-                sub = prev[j-1] + (0 if ca == cb else 1)
-                cur.append(min(ins, dele, sub))
-            prev = cur
-        return prev[-1]
-
     def _candidate_tokens(self, cand: Dict[str, str]) -> Set[str]:
         """Generate plausible latin tokens for an author candidate."""
         import re
@@ -194,15 +202,52 @@ class SefariaValidator:
                 continue
             if o == t or o in t or t in o:
                 return True
-            # allow small typos for longer names
-            if len(o) >= 5 and len(t) >= 5 and self._levenshtein(o, t) <= 1:
-                return True
+        # allow small typos for longer names
+        if len(o) >= 5 and within(o, [t for t in tokens if len(t) >= 5], max_distance=1):
+            return True
         return False
 
     # ==========================================
     #  SINGLE TERM VALIDATION
     # ==========================================
     
+    def _build_result(self, hebrew_term: str, hits: int, sample_refs: List[str]) -> Dict:
+        """Validation result for a term with a known hit count (adds author detection)."""
+        # Check if this is an author name
+        is_author = self.is_author_name(hebrew_term)
+
+        # If it looks like an author, capture which author(s) we think it is.
+        author_candidates = []
+        if is_author:
+            try:
+                from .torah_authors_master import get_author_matches
+            except Exception:
+                try:
+                    from tools.torah_authors_master import get_author_matches
+                except Exception:
+                    get_author_matches = None
+
+            if get_author_matches:
+                try:
+                    matches = get_author_matches(hebrew_term)
+                    for a in matches:
+                        author_candidates.append({
+                            "id": a.get("id", ""),
+                            "primary_name_en": a.get("primary_name_en", ""),
+                            "primary_name_he": a.get("primary_name_he", ""),
+                        })
+                except Exception:
+                    author_candidates = []
+
+        return {
+            "found": hits > 0,
+            "hits": hits,
+            "sample_refs": sample_refs,
+            "term": hebrew_term,
+            "is_author": is_author,
+            "author_candidates": author_candidates
+        }
+    
     async def validate_term(self, hebrew_term: str) -> Dict:
         """
         Check if a Hebrew term exists in Sefaria.
@@ -226,13 +271,16 @@ class SefariaValidator:
         try:
             client = await self._get_client()
             
+            # Counts-only: no documents, no _source, no highlights
             payload = {
                 "query": hebrew_term,
                 "type": "text",
-                "size": 5,
+                "size": self.SAMPLE_REF_COUNT,
+                "source_proj": False,
             }
             
-            response = await client.post(self.BASE_URL, json=payload)
+            async with self._request_budget():
+                response = await client.post(self.BASE_URL, json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -249,50 +297,17 @@ class SefariaValidator:
                 # Extract sample references
                 results = data.get("hits", {}).get("hits", [])
                 sample_refs = []
-                for hit in results[:5]:
+                for hit in results[:self.SAMPLE_REF_COUNT]:
                     ref = hit.get("_id", "")
                     if ref:
                         clean_ref = ref.split(" (")[0] if " (" in ref else ref
                         sample_refs.append(clean_ref)
                 
-                # Check if this is an author name
-                is_author = self.is_author_name(hebrew_term)
-
-                # If it looks like an author, capture which author(s) we think it is.
-                author_candidates = []
-                if is_author:
-                    try:
-                        from .torah_authors_master import get_author_matches
-                    except Exception:
-                        try:
-                            from tools.torah_authors_master import get_author_matches
-                        except Exception:
-                            get_author_matches = None
-
-                    if get_author_matches:
-                        try:
-                            matches = get_author_matches(hebrew_term)
-                            for a in matches:
-                                author_candidates.append({
-                                    "id": a.get("id", ""),
-                                    "primary_name_en": a.get("primary_name_en", ""),
-                                    "primary_name_he": a.get("primary_name_he", ""),
-                                })
-                        except Exception:
-                            author_candidates = []
-                
-                result = {
-                    "found": hits > 0,
-                    "hits": hits,
-                    "sample_refs": sample_refs,
-                    "term": hebrew_term,
-                    "is_author": is_author,
-                    "author_candidates": author_candidates
-                }
+                result = self._build_result(hebrew_term, hits, sample_refs)
                 
                 self._cache[hebrew_term] = result
                 
-                logger.debug(f"    → {hebrew_term}: {hits} hits" + (" [AUTHOR]" if is_author else ""))
+                logger.debug(f"    → {hebrew_term}: {hits} hits" + (" [AUTHOR]" if result["is_author"] else ""))
                 
                 return result
             else:
@@ -522,6 +537,47 @@ class SefariaValidator:
         logger.info("  Cache cleared")
 
 
+# ==========================================
+#  LOCAL TERM-FREQUENCY BACKEND
+# ==========================================
+
+class LocalTermValidator(SefariaValidator):
+    """
+    Answers validate_term / validate_batch from the local term-frequency
+    table (term_frequency.py) instead of Sefaria's search API.
+
+    Hits are segment counts over the mined corpus. Phrases longer than the
+    table's n-grams fall through to Sefaria.
+    """
+
+    def __init__(self, table, timeout: float = 10.0):
+        super().__init__(timeout)
+        self.table = table
+
+    async def validate_term(self, hebrew_term: str) -> Dict:
+        if hebrew_term in self._cache:
+            return self._cache[hebrew_term]
+
+        hits = self.table.count(hebrew_term)
+        if hits is None:
+            logger.debug(f"  Not covered locally, asking Sefaria: {hebrew_term}")
+            return await super().validate_term(hebrew_term)
+
+        result = self._build_result(hebrew_term, hits, [])
+        self._cache[hebrew_term] = result
+        logger.debug(f"    → {hebrew_term}: {hits} local hits" + (" [AUTHOR]" if result["is_author"] else ""))
+        return result
+
+
+def _load_term_frequency_table():
+    """The local table if one has been built (None when term_frequency is not importable)."""
+    try:
+        from term_frequency import get_term_frequency_table
+    except ImportError:
+        return None
+    return get_term_frequency_table()
+
+
 # ==========================================
 #  GLOBAL INSTANCE
 # ==========================================
@@ -530,10 +586,20 @@ _validator: Optional[SefariaValidator] = None
 
 
 def get_validator() -> SefariaValidator:
-    """Get global validator instance."""
+    """
+    Get global validator instance.
+
+    Uses the local term-frequency table when one has been built,
+    Sefaria's search API otherwise.
+    """
     global _validator
     if _validator is None:
-        _validator = SefariaValidator()
+        table = _load_term_frequency_table()
+        if table is not None:
+            logger.info("[VALIDATOR] Validating against the local term-frequency table")
+            _validator = LocalTermValidator(table)
+        else:
+            _validator = SefariaValidator()
     return _validator
 
 
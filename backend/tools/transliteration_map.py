@@ -16,9 +16,18 @@ MINIMAL EXCEPTIONS: Only truly ambiguous cases where rules fail
 (e.g., "lo" = לא vs לו, "kol" = כל vs "kal" = קל)
 """
 
-from typing import List, Dict, Tuple, Optional, Set
+from typing import List, Dict, Tuple, Optional, Set, Iterable
+import hashlib
+import heapq
+import json
+import logging
 import re
 from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
 
 # ==============================================================================
 # V8 FIX: Word-Final Sav Handling
@@ -932,6 +941,44 @@ INITIAL_PATTERNS: Dict[str, List[str]] = {
 }
 
 
+class _PrefixTrie:
+    """Character trie over TRANSLIT_MAP keys for longest-match lookup."""
+
+    __slots__ = ('children', 'is_key')
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self.children: Dict[str, "_PrefixTrie"] = {}
+        self.is_key = False
+        for key in keys:
+            self.add(key)
+
+    def add(self, key: str) -> None:
+        node = self
+        for char in key:
+            node = node.children.setdefault(char, _PrefixTrie())
+        node.is_key = True
+
+    def longest_match(self, text: str, start: int = 0, max_length: int = None) -> str:
+        """Longest key that text[start:] begins with ("" if none)."""
+        end = len(text) if max_length is None else min(len(text), start + max_length)
+        node = self
+        best = start
+        for i in range(start, end):
+            node = node.children.get(text[i])
+            if node is None:
+                break
+            if node.is_key:
+                best = i + 1
+        return text[start:best]
+
+
+TRANSLIT_TRIE = _PrefixTrie(TRANSLIT_MAP)
+
+# Partial variants kept per position in _build_variants_v2 (times max_variants);
+# work per word is O(len(word) * beam width), whatever the word looks like.
+BEAM_WIDTH_FACTOR = 3
+
+
 # ==========================================
 #  SECTION 7: VARIANT GENERATION
 # ==========================================
@@ -1003,11 +1050,11 @@ def _build_variants_v2(
     max_variants: int
 ) -> List[str]:
     """
-    Build variants by processing the word character by character,
+    Build variants by processing the word position by position,
     applying detected patterns at their positions.
+
+    Returns up to max_variants * BEAM_WIDTH_FACTOR variants, best first.
     """
-    results: List[Tuple[str, float]] = []
-    
     # Build a position map of all special patterns
     # Key: position, Value: list of (pattern_type, detection_result)
     position_patterns: Dict[int, List[Tuple[str, DetectionResult]]] = {}
@@ -1043,88 +1090,85 @@ def _build_variants_v2(
     elif feminine_ending:
         end_pattern = ('feminine', feminine_ending)
     
-    def build_recursive(pos: int, current: str, score: float, depth: int = 0):
-        if depth > 50 or len(results) >= max_variants * 4:
-            return
-        
-        if pos >= len(word):
-            if current:
-                results.append((current, score))
-            return
-        
+    # Beam search over positions. Every transition depends only on the
+    # position, never on the Hebrew built so far, so the edges out of each
+    # position are computed once and keeping the best `width` partial
+    # strings per position yields exactly the best `width` completions.
+    # Ties are broken by choice order (the order a depth-first walk would
+    # have produced them in), encoded as a string so it compares cheaply.
+    n = len(word)
+    width = max_variants * BEAM_WIDTH_FACTOR
+
+    def edges_from(pos: int) -> List[Tuple[Optional[int], str, float]]:
+        """(next position or None for a finished variant, hebrew, score delta), in choice order."""
+        edges = []
         remaining = word[pos:]
-        
-        # Check for patterns at this position
-        if pos in position_patterns:
-            for pattern_type, pattern in position_patterns[pos]:
-                for i, hebrew in enumerate(pattern.likely_hebrew[:2]):
-                    option_score = score + pattern.confidence * (1 - i * 0.3)
-                    build_recursive(
-                        pos + pattern.length,
-                        current + hebrew,
-                        option_score,
-                        depth + 1
-                    )
-            # Don't return - also try without the pattern as fallback
-        
+
+        # Check for patterns at this position (and also try without them below)
+        for pattern_type, pattern in position_patterns.get(pos, ()):
+            for i, hebrew in enumerate(pattern.likely_hebrew[:2]):
+                edges.append((pos + pattern.length, hebrew, pattern.confidence * (1 - i * 0.3)))
+
         # Check for end-of-word pattern
         if end_pattern and pos == end_pattern[1].position:
             pattern_type, pattern = end_pattern
             # Process everything up to the ending, then add the ending
             pre_ending = word[pos:pos + pattern.length - 1] if pattern.length > 1 else ""
             for hebrew in pattern.likely_hebrew[:2]:
-                if pre_ending:
-                    for pre_heb in _transliterate_chunk(pre_ending)[:2]:
-                        results.append((current + pre_heb + hebrew, score + pattern.confidence))
-                else:
-                    results.append((current + hebrew, score + pattern.confidence))
-        
+                for pre_heb in (_transliterate_chunk(pre_ending)[:2] if pre_ending else [""]):
+                    edges.append((None, pre_heb + hebrew, pattern.confidence))
+
         # Check initial patterns (word start)
         if pos == 0:
             for pattern_str, hebrew_options in INITIAL_PATTERNS.items():
                 if word.startswith(pattern_str):
                     for i, heb in enumerate(hebrew_options[:2]):
-                        build_recursive(
-                            pos + len(pattern_str),
-                            current + heb,
-                            score + 0.2 * (1 - i * 0.3),
-                            depth + 1
-                        )
-                    # Continue to also try regular transliteration
-        
-        # Check for final patterns (near word end)
-        if len(remaining) <= 4:
-            for pattern_str, hebrew_options in sorted(FINAL_PATTERNS.items(), key=lambda x: -len(x[0])):
-                if remaining == pattern_str:
-                    for heb in hebrew_options[:2]:
-                        results.append((current + heb, score + 0.3))
-                    return
-        
-        # Regular transliteration - try longest matches first
-        matched = False
-        for length in range(min(4, len(remaining)), 0, -1):
-            chunk = remaining[:length]
-            if chunk in TRANSLIT_MAP:
-                for i, hebrew in enumerate(TRANSLIT_MAP[chunk][:3]):  # Try top 3 options
-                    build_recursive(
-                        pos + length,
-                        current + hebrew,
-                        score - i * 0.1,  # Slight penalty for non-first options
-                        depth + 1
-                    )
-                matched = True
-                break
-        
-        if not matched:
+                        edges.append((len(pattern_str), heb, 0.2 * (1 - i * 0.3)))
+
+        # Check for final patterns (whole remainder)
+        if len(remaining) <= 4 and remaining in FINAL_PATTERNS:
+            for heb in FINAL_PATTERNS[remaining][:2]:
+                edges.append((None, heb, 0.3))
+            return edges
+
+        # Regular transliteration - longest match first
+        chunk = TRANSLIT_TRIE.longest_match(word, pos, max_length=4)
+        if chunk:
+            for i, hebrew in enumerate(TRANSLIT_MAP[chunk][:3]):  # Try top 3 options
+                edges.append((pos + len(chunk), hebrew, -i * 0.1))  # Slight penalty for non-first options
+        else:
             # Skip unknown character
-            build_recursive(pos + 1, current, score - 0.2, depth + 1)
-    
-    build_recursive(0, "", 0.0)
-    
+            edges.append((pos + 1, "", -0.2))
+        return edges
+
+    # frontier[pos]: (-score, choice order, hebrew so far)
+    frontier: List[List[Tuple[float, str, str]]] = [[] for _ in range(n)]
+    finished: List[Tuple[float, str, str]] = []
+    if n:
+        frontier[0].append((-0.0, "", ""))
+
+    for pos in range(n):
+        states = frontier[pos]
+        if not states:
+            continue
+        if len(states) > width:
+            states = heapq.nsmallest(width, states)
+        frontier[pos] = []
+
+        edges = edges_from(pos)
+        for neg_score, order, current in states:
+            for choice, (next_pos, hebrew, delta) in enumerate(edges):
+                item = (neg_score - delta, order + chr(choice), current + hebrew)
+                if next_pos is None or next_pos >= n:
+                    if item[2]:
+                        finished.append(item)
+                else:
+                    frontier[next_pos].append(item)
+
     # Sort by score (higher is better)
-    results.sort(key=lambda x: -x[1])
-    
-    return [r[0] for r in results]
+    finished.sort()
+
+    return [r[2] for r in finished[:width]]
 
 
 def _transliterate_chunk(text: str) -> List[str]:
@@ -1180,22 +1224,8 @@ def generate_smart_variants(query: str, max_variants: int = 15) -> List[str]:
         all_word_variants: List[List[str]] = []
         
         for word in words:
-            # Split prefixes
-            prefix_hebrew, root = split_all_prefixes(word)
-            
-            # Check if root is in exceptions
-            if root in MINIMAL_EXCEPTIONS:
-                root_variants = MINIMAL_EXCEPTIONS[root]
-            else:
-                root_variants = generate_word_variants(root)
-            
-            # Combine prefix with root variants
-            if prefix_hebrew:
-                word_variants = [prefix_hebrew + rv for rv in root_variants]
-            else:
-                word_variants = root_variants
-            
-            all_word_variants.append(word_variants if word_variants else [word])
+            word_variants = _cached_word_variants(word)
+            all_word_variants.append(list(word_variants) if word_variants else [word])
         
         # Combine into phrases
         phrase_variants = _combine_words(all_word_variants, max_variants // len(query_variants))
@@ -1212,6 +1242,36 @@ def generate_smart_variants(query: str, max_variants: int = 15) -> List[str]:
     return final[:max_variants]
 
 
+def _compute_word_variants(word: str) -> List[str]:
+    """Variants for one (normalized) query word: prefixes split off, root transliterated."""
+    prefix_hebrew, root = split_all_prefixes(word)
+
+    # Check if root is in exceptions
+    if root in MINIMAL_EXCEPTIONS:
+        root_variants = MINIMAL_EXCEPTIONS[root]
+    else:
+        root_variants = generate_word_variants(root)
+
+    # Combine prefix with root variants
+    if prefix_hebrew:
+        return [prefix_hebrew + rv for rv in root_variants]
+    return list(root_variants)
+
+
+@lru_cache(maxsize=4096)
+def _cached_word_variants(word: str) -> Tuple[str, ...]:
+    """
+    Per-word variants, memoized.
+
+    Users keep typing the same yeshivish vocabulary, so the common case is
+    a hit here or in the precomputed table (see build_variant_table).
+    """
+    table = get_variant_table()
+    if table and word in table:
+        return tuple(table[word])
+    return tuple(_compute_word_variants(word))
+
+
 def _combine_words(all_variants: List[List[str]], max_total: int) -> List[str]:
     """Combine word variants into phrase variants."""
     if not all_variants:
@@ -1280,10 +1340,134 @@ def normalize_query(query: str) -> str:
 
 
 # ==========================================
-#  SECTION 9: TESTING
+#  SECTION 9: PRECOMPUTED VARIANT TABLE
 # ==========================================
 
-if __name__ == "__main__":
+VARIANT_TABLE_FILE = Path(__file__).parent.parent / "data" / "transliteration_variants.json"
+LOGS_DIR = Path(__file__).parent.parent / "logging" / "logs"
+
+# Query lines written by step_one_decipher / main_pipeline
+_LOGGED_QUERY_RE = re.compile(r"(?:\[DECIPHER_SINGLE\] Processing|\| Query): '([^']+)'")
+
+_variant_table: Optional[Dict[str, List[str]]] = None
+_variant_table_loaded = False
+
+
+def rules_fingerprint() -> str:
+    """Hash of this module's source - a table built from other rules is stale."""
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()[:16]
+
+
+def get_variant_table(path: Path = None) -> Optional[Dict[str, List[str]]]:
+    """
+    Load the precomputed word -> variants table (once).
+
+    Returns None if the table hasn't been built or was built from a
+    different version of the rules; callers then compute variants.
+    """
+    global _variant_table, _variant_table_loaded
+    if _variant_table_loaded:
+        return _variant_table
+    _variant_table_loaded = True
+
+    path = Path(path or VARIANT_TABLE_FILE)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception as e:
+        logger.warning(f"[TRANSLIT] Could not load variant table {path}: {e}")
+        return None
+
+    if data.get("metadata", {}).get("rules") != rules_fingerprint():
+        logger.info("[TRANSLIT] Variant table was built from older rules - ignoring it (rebuild with --build-table)")
+        return None
+
+    _variant_table = data.get("words", {})
+    logger.info(f"[TRANSLIT] Loaded {len(_variant_table)} precomputed word variants")
+    return _variant_table
+
+
+def iter_table_queries(
+    dictionary_file: Path = None,
+    logs_dir: Path = None,
+    dictionary_db: Path = None,
+) -> Iterable[str]:
+    """
+    Queries to precompute: word dictionary keys plus queries from the logs.
+
+    Dictionary keys come from the JSON seed and from the shared store,
+    which holds everything learned at runtime.
+    """
+    try:
+        from tools.word_dictionary import DICTIONARY_DB_FILE, DICTIONARY_FILE
+        from tools.dictionary_store import DictionaryStore
+    except ImportError:
+        from word_dictionary import DICTIONARY_DB_FILE, DICTIONARY_FILE
+        from dictionary_store import DictionaryStore
+
+    dictionary_file = Path(dictionary_file or DICTIONARY_FILE)
+    if dictionary_file.exists():
+        with open(dictionary_file, 'r', encoding='utf-8') as f:
+            yield from json.load(f).keys()
+
+    dictionary_db = Path(dictionary_db or DICTIONARY_DB_FILE)
+    if dictionary_db.exists():
+        store = DictionaryStore(dictionary_db)
+        try:
+            entries, _ = store.changes_since(0)
+        finally:
+            store.close()
+        for key, _ in entries:
+            yield key
+
+    logs_dir = Path(logs_dir or LOGS_DIR)
+    if logs_dir.exists():
+        for log_path in sorted(logs_dir.glob("*.log*")):
+            with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    match = _LOGGED_QUERY_RE.search(line)
+                    if match:
+                        yield match.group(1)
+
+
+def build_variant_table(queries: Iterable[str]) -> Dict[str, List[str]]:
+    """Variants for every word generate_smart_variants would look up for these queries."""
+    words: Dict[str, List[str]] = {}
+    for query in queries:
+        query = normalize_input(query)
+        if not query or not query.isascii():
+            continue
+        for q_variant in expand_word_final_sav_variants(query):
+            for word in q_variant.split():
+                if word not in words:
+                    words[word] = _compute_word_variants(word)
+    return words
+
+
+def save_variant_table(words: Dict[str, List[str]], path: Path = None) -> Path:
+    """Write the table with the fingerprint of the rules that produced it."""
+    path = Path(path or VARIANT_TABLE_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "metadata": {
+            "built_at": datetime.now().isoformat(),
+            "rules": rules_fingerprint(),
+            "words": len(words),
+        },
+        "words": words,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    return path
+
+
+# ==========================================
+#  SECTION 10: TESTING
+# ==========================================
+
+def _run_self_test() -> None:
     print("=" * 70)
     print("TRANSLITERATION MAP V5 - RULES-BASED TEST")
     print("=" * 70)
@@ -1354,4 +1538,49 @@ if __name__ == "__main__":
     
     print(f"\n{'='*70}")
     print(f"RESULTS: {passed}/{passed + failed} ({100*passed/(passed+failed):.1f}%)")
-    print("=" * 70)
\ No newline at end of file
+    print("=" * 70)
+
+
+BENCHMARK_WORDS = [
+    "baal", "gemara", "tikkun", "vehaolam", "shenishtanu", "vehamishtamesh",
+    "ukeshehamishtameshin", "baalhabayisshemashkirbeso", "mishtameshinbeisraelvehaolam",
+]
+
+
+def _run_benchmark(repeat: int = 200) -> None:
+    """Time generate_word_variants per word (uncached) to show it stays linear in word length."""
+    import timeit
+
+    print(f"{'word':32s} {'len':>4s} {'us/word':>9s} {'us/char':>8s}")
+    for word in BENCHMARK_WORDS:
+        seconds = timeit.timeit(lambda: generate_word_variants(word), number=repeat) / repeat
+        print(f"{word:32s} {len(word):4d} {seconds * 1e6:9.1f} {seconds * 1e6 / len(word):8.1f}")
+
+
+def main():
+    """Command-line entry point: self-test by default, --build-table to precompute."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Transliteration rules self-test and variant table builder")
+    parser.add_argument("--build-table", action="store_true",
+                        help="Precompute variants for dictionary words and logged queries")
+    parser.add_argument("--output", type=Path, default=VARIANT_TABLE_FILE)
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time variant generation per word")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        _run_benchmark()
+        return
+
+    if args.build_table:
+        words = build_variant_table(iter_table_queries())
+        path = save_variant_table(words, args.output)
+        print(f"Wrote {len(words)} words to {path}")
+        return
+
+    _run_self_test()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,19 @@ V2 IMPROVEMENTS:
 - lookup_all() method to find ALL non-overlapping sub-phrases
 - Better handling of multi-term queries like "chezkas haguf chezkas mammon"
 
+V3 IMPROVEMENTS:
+- Fuzzy lookup: a SymSpell-style deletion index over the keys lets
+  lookup_all() resolve near-misses ("chezkaz hagug", "sfeik sfeika")
+  without falling through to transliteration + Sefaria validation
+- Word-level trie over the keys: find_matches() segments a query in one
+  left-to-right pass and reports the word positions of every match
+
+V4 IMPROVEMENTS:
+- Entries live in a shared SQLite (WAL) store (dictionary_store.py), so
+  every uvicorn worker sees what the others learn and a learned entry or
+  a usage bump writes one row instead of the whole JSON file.
+  word_dictionary.json is the seed and export format.
+
 Auto-populated from:
 1. Your learning notes (Hebrew terms)
 2. Runtime resolutions (learns as you use it)
@@ -15,11 +28,19 @@ NO manual maintenance required.
 
 import json
 import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from collections import Counter
 from datetime import datetime
 
+try:
+    from .dictionary_store import DictionaryStore
+except ImportError:
+    from tools.dictionary_store import DictionaryStore
+
+from utils.edit_distance import within
+
 
 # ==========================================
 #  DICTIONARY STRUCTURE
@@ -27,6 +48,9 @@ from datetime import datetime
 
 DICTIONARY_FILE = Path(__file__).parent.parent / "data" / "word_dictionary.json"
 
+# Shared runtime store (seeded from DICTIONARY_FILE when empty)
+DICTIONARY_DB_FILE = DICTIONARY_FILE.with_suffix(".db")
+
 # Format:
 # {
 #   "transliteration": {
@@ -268,6 +292,165 @@ def initialize_dictionary_from_notes() -> Dict:
     return dictionary
 
 
+# ==========================================
+#  FUZZY INDEX
+# ==========================================
+
+# Largest edit distance the index can answer for
+FUZZY_MAX_DISTANCE = 2
+
+# Spans shorter than this are never fuzzy-matched - too many dictionary
+# keys ("al", "zeh", "daf") are a couple of edits from ordinary words.
+FUZZY_MIN_LENGTH = 6
+
+
+def fuzzy_distance_budget(phrase: str) -> int:
+    """Edits tolerated for a query span: 1 for a short span, 2 for a long phrase."""
+    if len(phrase) < FUZZY_MIN_LENGTH:
+        return 0
+    if ' ' in phrase and len(phrase) >= 10:
+        return 2
+    return 1
+
+
+def _deletes(term: str, max_distance: int) -> Set[str]:
+    """Every string reachable from term by deleting up to max_distance characters."""
+    out = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        frontier = {
+            item[:i] + item[i + 1:]
+            for item in frontier
+            for i in range(len(item))
+        }
+        out |= frontier
+    return out
+
+
+class FuzzyIndex:
+    """
+    SymSpell-style deletion index over dictionary keys.
+
+    Every key is stored under each string obtained by deleting up to
+    FUZZY_MAX_DISTANCE characters from it. A query generates its own
+    deletions the same way; keys sharing a deletion are the only
+    candidates within that distance, so a lookup is a few hundred set
+    probes plus an edit-distance check (with adjacent transpositions)
+    on the handful of candidates - never a scan of the whole dictionary.
+    """
+
+    def __init__(self, keys=(), max_distance: int = FUZZY_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._keys: Set[str] = set()
+        self._deletes: Dict[str, Set[str]] = {}
+        self.max_key_length = 0
+        for key in keys:
+            self.add(key)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str):
+        """Index a key (no-op if already indexed)."""
+        if key in self._keys:
+            return
+        self._keys.add(key)
+        self.max_key_length = max(self.max_key_length, len(key))
+        for variant in _deletes(key, self.max_distance):
+            self._deletes.setdefault(variant, set()).add(key)
+
+    def lookup(self, term: str, max_distance: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Keys within max_distance edits of term, closest first.
+
+        Returns:
+            List of (key, distance) tuples, sorted by distance then key
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        max_distance = min(max_distance, self.max_distance)
+        if len(term) > self.max_key_length + max_distance:
+            return []  # Longer than any key - spares generating its deletions
+
+        candidates: Set[str] = set()
+        for variant in _deletes(term, max_distance):
+            keys = self._deletes.get(variant)
+            if keys:
+                candidates |= keys
+
+        matches = within(term, candidates, max_distance, transpositions=True)
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+
+# ==========================================
+#  PHRASE TRIE
+# ==========================================
+
+class _PhraseTrie:
+    """
+    Word-level trie of dictionary keys ("chezkas haguf" -> chezkas -> haguf).
+
+    longest_match() walks the query's words from a start position and
+    returns the longest key found, so matching a position costs at most
+    one dict probe per word of the longest key - no phrase strings are
+    built for spans that cannot match.
+    """
+
+    _KEY = ""  # Child slot holding the dictionary key a path ends on (words are never empty)
+
+    def __init__(self, keys=()):
+        self._root: Dict = {}
+        self.max_words = 0
+        for key in keys:
+            self.add(key)
+
+    def add(self, key: str):
+        words = key.split()
+        if not words:
+            return
+        node = self._root
+        for word in words:
+            node = node.setdefault(word, {})
+        node[self._KEY] = key
+        self.max_words = max(self.max_words, len(words))
+
+    def longest_match(self, words: List[str], start: int) -> Optional[Tuple[int, str]]:
+        """(end, key) of the longest key starting at words[start], or None."""
+        node = self._root
+        best = None
+        for end in range(start, len(words)):
+            node = node.get(words[end])
+            if node is None:
+                break
+            key = node.get(self._KEY)
+            if key is not None:
+                best = (end + 1, key)
+        return best
+
+
+@dataclass
+class DictionaryMatch:
+    """
+    One dictionary term found in a query.
+
+    start/end are word positions in the query (end exclusive);
+    transliteration is the query's own words for that span, key the
+    dictionary key that matched (different only for fuzzy matches).
+    """
+    start: int
+    end: int
+    transliteration: str
+    key: str
+    hebrew: str
+    entry: Dict
+    distance: int = 0
+
+    @property
+    def is_fuzzy(self) -> bool:
+        return self.distance > 0
+
+
 # ==========================================
 #  DICTIONARY OPERATIONS
 # ==========================================
@@ -277,33 +460,56 @@ class WordDictionary:
     Self-maintaining word dictionary with runtime learning.
     
     V2: Added lookup_all() for finding multiple non-overlapping sub-phrases.
+    V3: lookup_all() falls back to a fuzzy index for near-miss spellings.
+    V4: Backed by a DictionaryStore shared across processes. self.dictionary
+        is this process's copy; refresh() pulls entries other workers wrote.
     """
     
     def __init__(self):
         self.dict_path = DICTIONARY_FILE
+        self.db_path = DICTIONARY_DB_FILE
         self.dict_path.parent.mkdir(parents=True, exist_ok=True)
         
-        self.dictionary = self._load_or_initialize()
+        self.store = DictionaryStore(self.db_path)
+        self.dictionary: Dict[str, Dict] = {}
+        self.phrase_trie = _PhraseTrie()
+        self.fuzzy_index = FuzzyIndex()
+        self._version = 0
+        
+        self._initialize_store()
+        self.refresh()
     
-    def _load_or_initialize(self) -> Dict:
-        """Load existing dictionary or initialize from notes"""
+    def _initialize_store(self):
+        """Seed an empty store from the JSON file (or from notes if there is none)"""
+        if len(self.store):
+            return
         if self.dict_path.exists():
             with open(self.dict_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                dictionary = json.load(f)
         else:
             print("📖 Initializing dictionary from notes...")
             dictionary = initialize_dictionary_from_notes()
-            self._save(dictionary)
-            print(f"✓ Dictionary initialized with {len(dictionary)} entries")
-            return dictionary
-    
-    def _save(self, dictionary: Dict = None):
-        """Save dictionary to disk"""
-        if dictionary is None:
-            dictionary = self.dictionary
-        
-        with open(self.dict_path, 'w', encoding='utf-8') as f:
-            json.dump(dictionary, f, ensure_ascii=False, indent=2)
+        inserted = self.store.import_entries(dictionary)
+        print(f"✓ Dictionary initialized with {inserted} entries")
+    
+    def refresh(self):
+        """Pull entries written (by any process) since the last refresh."""
+        if not self.store.changed():
+            return
+        changes, self._version = self.store.changes_since(self._version)
+        for key, entry in changes:
+            self._remember(key, entry)
+    
+    def _remember(self, key: str, entry: Dict):
+        """Install an entry in the in-memory copy and indexes."""
+        if key not in self.dictionary:
+            self.phrase_trie.add(key)
+            self.fuzzy_index.add(key)
+        self.dictionary[key] = entry
+    
+    def export_json(self, path: Optional[Path] = None):
+        """Write the current store to JSON (default: the seed file)."""
+        self.store.export_json(path or self.dict_path)
     
     def lookup(self, query: str) -> Optional[Dict]:
         """
@@ -312,87 +518,146 @@ class WordDictionary:
         V8: Tries sub-phrases if full query not found.
         NOTE: Returns FIRST match only. Use lookup_all() for multiple terms.
         
+        Order: the whole query, then the longest (leftmost) multi-word
+        sub-phrase, then the first single word.
+        
         Returns entry dict or None if not found.
         """
-        query = query.lower().strip()
-        
-        # Try exact match first
-        if query in self.dictionary:
-            return self._update_and_return(query)
-        
-        # Try sub-phrases (longest first)
-        words = query.split()
-        for phrase_len in range(len(words), 1, -1):
-            for start in range(len(words) - phrase_len + 1):
-                phrase = ' '.join(words[start:start + phrase_len])
-                if phrase in self.dictionary:
-                    return self._update_and_return(phrase)
+        self.refresh()
+        words = query.lower().split()
+        
+        best_length, best_key = 0, None
+        for start in range(len(words)):
+            match = self.phrase_trie.longest_match(words, start)
+            if match is None:
+                continue
+            length = match[0] - start
+            if length > best_length and (length > 1 or best_key is None):
+                best_length, best_key = length, match[1]
+        
+        if best_key is None:
+            return None
+        return self._update_and_return(best_key)
+    
+    def find_matches(self, query: str, fuzzy: bool = True) -> List[DictionaryMatch]:
+        """
+        Segment a query into non-overlapping dictionary terms, with positions.
         
-        # Try individual words
-        for word in words:
-            if word in self.dictionary:
-                return self._update_and_return(word)
+        One left-to-right pass over the words: at each position the
+        longest key in the phrase trie wins. At a word no key starts at,
+        spans starting there are tried against the fuzzy index (longest
+        first, never running into a multi-word exact match), so
+        "chezkaz hagug" still resolves to חזקת הגוף.
         
-        return None
+        Returns:
+            Matches in query order
+        """
+        self.refresh()
+        words = query.lower().split()
+        n = len(words)
+        exact = [self.phrase_trie.longest_match(words, start) for start in range(n)]
+        # Fuzzy spans may merge or split words, so allow one word either way
+        max_fuzzy_words = self.phrase_trie.max_words + 1
+        
+        matches: List[DictionaryMatch] = []
+        start = 0
+        while start < n:
+            if exact[start] is not None:
+                end, key = exact[start]
+                entry = self.dictionary[key]
+                matches.append(DictionaryMatch(start, end, key, key, entry['hebrew'], entry))
+                start = end
+                continue
+            
+            found = None
+            if fuzzy:
+                # Never run into a multi-word exact match; a lone exact word
+                # may be absorbed ("chezkaz mamon" is one term, not "mamon")
+                limit = start + 1
+                while (limit < n and limit - start < max_fuzzy_words
+                       and (exact[limit] is None or exact[limit][0] - limit == 1)):
+                    limit += 1
+                for end in range(limit, start, -1):
+                    phrase = ' '.join(words[start:end])
+                    near = self.lookup_fuzzy(phrase)
+                    if near:
+                        key, distance = near[0]
+                        entry = self.dictionary[key]
+                        found = DictionaryMatch(start, end, phrase, key, entry['hebrew'], entry, distance)
+                        break
+            
+            if found is None:
+                start += 1
+                continue
+            matches.append(found)
+            start = found.end
+        
+        self._touch([match.key for match in matches])
+        return matches
     
-    def lookup_all(self, query: str) -> List[Tuple[str, str, Dict]]:
+    def lookup_all(self, query: str, fuzzy: bool = True) -> List[Tuple[str, str, Dict]]:
         """
         Find ALL non-overlapping dictionary matches in the query.
         
         V2 NEW METHOD: Returns multiple Hebrew terms for queries like
         "chezkas haguf chezkas mammon" → [חזקת הגוף, חזקת ממון]
         
-        Uses greedy longest-first matching to avoid overlaps.
+        Tuple view of find_matches(), in query order. A fuzzy match is
+        reported under the query's own words; its entry is a copy
+        carrying "matched_key" and "distance".
         
         Returns:
             List of (transliteration, hebrew, entry_dict) tuples
         """
-        query = query.lower().strip()
-        words = query.split()
-        n = len(words)
+        results = []
+        for match in self.find_matches(query, fuzzy=fuzzy):
+            entry = match.entry
+            if match.is_fuzzy:
+                entry = dict(entry, matched_key=match.key, distance=match.distance)
+            results.append((match.transliteration, match.hebrew, entry))
+        return results
+    
+    def lookup_fuzzy(self, phrase: str, max_distance: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Dictionary keys within a few edits of phrase, closest first.
         
-        # Track which word positions are already matched
-        used = [False] * n
-        matches = []
-        
-        # Greedy: try longest phrases first
-        for phrase_len in range(n, 0, -1):
-            for start in range(n - phrase_len + 1):
-                # Skip if any word in this range is already used
-                if any(used[start:start + phrase_len]):
-                    continue
-                
-                phrase = ' '.join(words[start:start + phrase_len])
-                
-                if phrase in self.dictionary:
-                    entry = self.dictionary[phrase]
-                    matches.append((phrase, entry['hebrew'], entry))
-                    
-                    # Mark these positions as used
-                    for i in range(start, start + phrase_len):
-                        used[i] = True
-                    
-                    # Update usage stats
-                    self._update_entry_stats(phrase)
-        
-        # Sort matches by position in original query
-        # (optional: currently returns in order found)
-        return matches
+        max_distance defaults to fuzzy_distance_budget(phrase) (0 - no
+        fuzzy matching - for short spans). Ties in distance go to the
+        more-used entry.
+        
+        Returns:
+            List of (transliteration, distance) tuples
+        """
+        phrase = ' '.join(phrase.lower().split())
+        if max_distance is None:
+            max_distance = fuzzy_distance_budget(phrase)
+        if max_distance <= 0:
+            return []
+        
+        near = self.fuzzy_index.lookup(phrase, max_distance)
+        near.sort(key=lambda match: (match[1], -self.dictionary[match[0]].get("usage_count", 0), match[0]))
+        return near
     
     def _update_entry_stats(self, key: str):
         """Update usage stats for an entry (without returning it)."""
-        if key in self.dictionary:
-            self.dictionary[key]["usage_count"] += 1
-            self.dictionary[key]["last_used"] = self._get_timestamp()
-            self._save()
+        self._touch([key])
     
     def _update_and_return(self, key: str) -> Dict:
         """Update usage stats and return entry."""
-        entry = self.dictionary[key]
-        entry["usage_count"] += 1
-        entry["last_used"] = self._get_timestamp()
-        self._save()
-        return entry
+        self._touch([key])
+        return self.dictionary[key]
+    
+    def _touch(self, keys: List[str]):
+        """Record a use of each key, here and in the shared store (one write)."""
+        keys = [key for key in keys if key in self.dictionary]
+        if not keys:
+            return
+        timestamp = self._get_timestamp()
+        for key in keys:
+            entry = self.dictionary[key]
+            entry["usage_count"] = entry.get("usage_count", 0) + 1
+            entry["last_used"] = timestamp
+        self.store.touch(keys, timestamp)
     
     def _confidence_from_hits(self, hits: Optional[int]) -> str:
         """Map Sefaria hit counts to a confidence string."""
@@ -423,29 +688,19 @@ class WordDictionary:
         """
         transliteration = transliteration.lower().strip()
         
-        if transliteration in self.dictionary:
-            # Update existing entry
-            entry = self.dictionary[transliteration]
-            entry["hebrew"] = hebrew
-            entry["confidence"] = confidence
-            entry["usage_count"] += 1
-            entry["last_used"] = self._get_timestamp()
-            if hits is not None:
-                entry["hits"] = hits
-        else:
-            # Add new entry
-            entry = {
-                "hebrew": hebrew,
-                "confidence": confidence,
-                "usage_count": 1,
-                "source": source,
-                "last_used": self._get_timestamp()
-            }
-            if hits is not None:
-                entry["hits"] = hits
-            self.dictionary[transliteration] = entry
+        # The store merges with whatever another worker already learned
+        # for this key (usage_count + 1, source and hits kept)
+        entry = {
+            "hebrew": hebrew,
+            "confidence": confidence,
+            "usage_count": 1,
+            "source": source,
+            "last_used": self._get_timestamp()
+        }
+        if hits is not None:
+            entry["hits"] = hits
+        self._remember(transliteration, self.store.upsert(transliteration, entry))
         
-        self._save()
         print(f"✓ Dictionary learned: '{transliteration}' → '{hebrew}'")
     
     def add(
@@ -477,6 +732,7 @@ class WordDictionary:
     
     def get_stats(self) -> Dict:
         """Get dictionary statistics"""
+        self.refresh()
         return {
             "total_entries": len(self.dictionary),
             "by_source": {
@@ -550,5 +806,22 @@ if __name__ == "__main__":
             print(f"✓ '{query}':")
             for translit, hebrew, _ in results:
                 print(f"    → '{translit}' = '{hebrew}'")
+        else:
+            print(f"✗ '{query}' - no matches")
+    
+    print("\n=== Test Fuzzy Lookups (V3) ===")
+    fuzzy_queries = [
+        "chezkaz hagug",
+        "sfeik sfeika",
+        "bari veshma",
+    ]
+    
+    for query in fuzzy_queries:
+        results = dict_obj.lookup_all(query)
+        if results:
+            print(f"✓ '{query}':")
+            for translit, hebrew, entry in results:
+                via = f" (via '{entry['matched_key']}', distance {entry['distance']})" if 'distance' in entry else ""
+                print(f"    → '{translit}' = '{hebrew}'{via}")
         else:
             print(f"✗ '{query}' - no matches")
\ No newline at end of file
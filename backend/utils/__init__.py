@@ -3,6 +3,11 @@ Shared utility helpers for the Marei Mekomos backend.
 
 Modules:
 - serialization: enum/value helpers and safe serialization
+- hebrew_text: niqqud/HTML stripping and search folding (str.translate based)
+- text_arena: per-request deduplicated text storage for Step 3 sources
+- refs: cached parsing and amud arithmetic for daf refs
+- edit_distance: bit-parallel edit distance (Levenshtein / with transpositions, bulk)
+- mmap_table: memory-mapped sorted-hash tables (term frequencies, English lexicon)
 - levels: shared level metadata and ordering
 - fallbacks: fallback behaviors for pipeline steps
 """
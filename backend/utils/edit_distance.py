@@ -0,0 +1,235 @@
+"""
+Shared edit-distance kernel.
+
+Step 1 compares short words on hot paths - a typed word against English
+spelling suggestions (language_detector), against author name tokens
+(SefariaValidator), and dictionary keys against near-miss queries
+(WordDictionary's fuzzy index). Each used to carry its own
+O(len(a) * len(b)) pure-Python DP loop.
+
+This module computes the distance bit-parallel (Myers' algorithm in
+Hyyrö's formulation): the pattern's columns of the DP table are packed
+into one integer and each character of the other string advances all of
+them with a dozen integer operations. Python ints are unbounded, so the
+same code covers any length; it is fastest for words, which fit a machine
+word anyway.
+
+- levenshtein(a, b, max_distance)    insert/delete/substitute
+- osa_distance(a, b, max_distance)   also adjacent transpositions
+                                     ("chezkas" -> "chezaks" is 1)
+- distances(word, candidates, ...)   one word against many; the
+                                     pattern is encoded once
+- within(word, candidates, ...)      the candidates inside max_distance
+
+With max_distance, the scan stops as soon as the distance provably
+exceeds it and max_distance + 1 is returned - callers asking "is it
+within 1 edit?" pay for only as much of the string as that takes.
+
+    python -m utils.edit_distance    # micro-benchmark against the plain DP
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class _Pattern:
+    """A string encoded for bit-parallel matching: one bitmask per character."""
+
+    __slots__ = ('text', 'length', 'peq', 'mask', 'last')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.length = len(text)
+        peq: Dict[str, int] = {}
+        for i, char in enumerate(text):
+            peq[char] = peq.get(char, 0) | (1 << i)
+        self.peq = peq
+        self.mask = (1 << self.length) - 1
+        self.last = 1 << (self.length - 1) if self.length else 0
+
+    def distance(self, other: str, max_distance: Optional[int] = None, transpositions: bool = False) -> int:
+        m = self.length
+        n = len(other)
+        if max_distance is not None and abs(m - n) > max_distance:
+            return max_distance + 1
+        if not m:
+            return n
+        if not n:
+            return m
+
+        peq = self.peq
+        mask = self.mask
+        last = self.last
+        vp = mask      # Vertical deltas +1 (all, in column 0)
+        vn = 0         # Vertical deltas -1
+        d0 = 0         # Diagonal zero deltas of the previous column
+        prev_eq = 0
+        score = m
+
+        for j, char in enumerate(other):
+            eq = peq.get(char, 0)
+            x = eq | vn
+            if transpositions:
+                x |= (((~d0) & eq) << 1) & prev_eq
+                prev_eq = eq
+            d0 = ((((eq & vp) + vp) ^ vp) | x) & mask
+            hp = vn | (~(d0 | vp) & mask)
+            hn = d0 & vp
+
+            if hp & last:
+                score += 1
+            elif hn & last:
+                score -= 1
+            # The remaining characters can lower the score by at most one each
+            if max_distance is not None and score - (n - j - 1) > max_distance:
+                return max_distance + 1
+
+            hp = ((hp << 1) | 1) & mask
+            hn = (hn << 1) & mask
+            vn = hp & d0
+            vp = hn | (~(hp | d0) & mask)
+
+        if max_distance is not None and score > max_distance:
+            return max_distance + 1
+        return score
+
+
+@lru_cache(maxsize=2048)
+def _pattern(text: str) -> _Pattern:
+    return _Pattern(text)
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Levenshtein distance between a and b.
+
+    With max_distance, anything farther is reported as max_distance + 1.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    return _pattern(b).distance(a, max_distance)
+
+
+def osa_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Optimal-string-alignment distance: Levenshtein plus adjacent
+    transpositions (each substring edited at most once).
+
+    With max_distance, anything farther is reported as max_distance + 1.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    return _pattern(b).distance(a, max_distance, transpositions=True)
+
+
+def distances(
+    word: str,
+    candidates: Iterable[str],
+    max_distance: Optional[int] = None,
+    transpositions: bool = False,
+) -> List[int]:
+    """Distance from word to each candidate, in order (word is encoded once)."""
+    pattern = _pattern(word)
+    return [pattern.distance(candidate, max_distance, transpositions) for candidate in candidates]
+
+
+def within(
+    word: str,
+    candidates: Iterable[str],
+    max_distance: int,
+    transpositions: bool = False,
+) -> List[Tuple[str, int]]:
+    """(candidate, distance) for every candidate within max_distance of word, in input order."""
+    pattern = _pattern(word)
+    out = []
+    for candidate in candidates:
+        distance = pattern.distance(candidate, max_distance, transpositions)
+        if distance <= max_distance:
+            out.append((candidate, distance))
+    return out
+
+
+def similarity(a: str, b: str) -> float:
+    """1.0 for identical strings, 0.0 for nothing in common (1 - distance / longer length)."""
+    longer = max(len(a), len(b))
+    if not longer:
+        return 1.0
+    return 1.0 - levenshtein(a, b) / longer
+
+
+__all__ = [
+    'levenshtein',
+    'osa_distance',
+    'distances',
+    'within',
+    'similarity',
+]
+
+
+# ==========================================
+#  MICRO-BENCHMARK
+# ==========================================
+
+def _dp_distance(a: str, b: str, transpositions: bool = False) -> int:
+    """Reference DP (what the call sites used before): checks results, sets the baseline."""
+    before_prev: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if transpositions and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before_prev[j - 2] + 1)
+            cur.append(cost)
+        before_prev, prev = prev, cur
+    return prev[-1]
+
+
+_BENCHMARK_PAIRS: Sequence[Tuple[str, str]] = (
+    ("rashi", "rashba"),
+    ("chezkas haguf", "chezkaz hagug"),
+    ("maharsha", "maharshal"),
+    ("shulchan aruch", "shulchan arukh"),
+    ("חזקת הגוף", "חזקת ממון"),
+    ("tosafos", "tosfos"),
+    ("rambam", "ramban"),
+    ("ketzos hachoshen", "kitzur shulchan aruch"),
+)
+
+
+def main():
+    """Check the kernel against the DP and time both."""
+    import random
+    import timeit
+
+    rng = random.Random(0)
+    alphabet = "abcdeהוא "
+    for _ in range(3000):
+        a = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+        b = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+        assert levenshtein(a, b) == _dp_distance(a, b), (a, b)
+        assert osa_distance(a, b) == _dp_distance(a, b, True), (a, b)
+        limit = rng.randint(0, 3)
+        assert levenshtein(a, b, limit) == min(_dp_distance(a, b), limit + 1), (a, b, limit)
+    print("kernel matches the DP on 3000 random pairs\n")
+
+    repeat = 2000
+    print(f"{'pair':40s} {'dp us':>7s} {'kernel us':>10s} {'max=1 us':>9s}")
+    for a, b in _BENCHMARK_PAIRS:
+        dp = timeit.timeit(lambda: _dp_distance(a, b), number=repeat) / repeat
+        kernel = timeit.timeit(lambda: _pattern(a).distance(b), number=repeat) / repeat
+        bounded = timeit.timeit(lambda: _pattern(a).distance(b, 1), number=repeat) / repeat
+        print(f"{a + ' / ' + b:40s} {dp * 1e6:7.1f} {kernel * 1e6:10.1f} {bounded * 1e6:9.1f}")
+
+    words = [a for a, _ in _BENCHMARK_PAIRS] * 50
+    dp = timeit.timeit(lambda: [_dp_distance("chezkas haguf", w) for w in words], number=20) / 20
+    bulk = timeit.timeit(lambda: distances("chezkas haguf", words), number=20) / 20
+    print(f"\none word vs {len(words)} candidates: dp {dp * 1e3:.2f} ms, distances() {bulk * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
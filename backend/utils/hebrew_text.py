@@ -0,0 +1,113 @@
+"""
+Hebrew text normalization shared across the backend.
+
+All character-level folding is done with precomputed str.translate tables
+(one C-level pass) instead of chained re.sub / str.replace calls.
+NormalizedText holds every form the matchers need, computed once per
+segment when it is fetched.
+"""
+
+import re
+from typing import Dict, Optional
+
+
+# Cantillation (U+0591-U+05AF), vowel points and other marks up to U+05C7
+_NIQQUD_CHARS = [chr(cp) for cp in range(0x0591, 0x05C8)]
+
+# Vowel points normalize_for_search has always removed (cantillation and
+# maqaf are left in place, matching the historical behaviour)
+_SEARCH_POINT_CHARS = (
+    [chr(cp) for cp in range(0x05B0, 0x05BE)]
+    + [chr(cp) for cp in (0x05BF, 0x05C1, 0x05C2, 0x05C4, 0x05C5, 0x05C7)]
+)
+
+SOFIT_MAP: Dict[str, str] = {'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ך': 'כ', 'ץ': 'צ'}
+SOFIT_TABLE = str.maketrans(SOFIT_MAP)
+
+# strip_niqqud: delete U+0591-U+05C7
+NIQQUD_TABLE = str.maketrans('', '', ''.join(_NIQQUD_CHARS))
+
+# Search folding: delete vowel points and geresh/gershayim/quotes, fold sofits
+SEARCH_FOLD_TABLE = str.maketrans({
+    **{c: None for c in _SEARCH_POINT_CHARS},
+    **{c: None for c in ('״', '׳', '"', "'")},
+    **SOFIT_MAP,
+})
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def strip_html(text: str) -> str:
+    """Remove HTML tags (no whitespace changes)."""
+    if not text:
+        return ""
+    return _HTML_TAG_RE.sub('', text)
+
+
+def strip_niqqud(text: str) -> str:
+    """
+    Strip Hebrew vowel points (nekudos/niqqud) and cantillation from text.
+
+    This removes:
+    - Hebrew cantillation marks (U+0591-U+05AF): taamim
+    - Hebrew points (U+05B0-U+05BD): sheva, hiriq, tsere, segol, patah, qamats, holam, dagesh, etc.
+    - Hebrew punctuation (U+05BE-U+05BF): maqaf, rafe
+    - Shin/sin dots and remaining marks up to U+05C7
+    """
+    if not text:
+        return ""
+    return text.translate(NIQQUD_TABLE)
+
+
+def fold_for_search(text: str) -> str:
+    """
+    Normalize Hebrew text for keyword matching.
+
+    Strips HTML, vowel points and geresh/gershayim, folds final letters
+    and collapses whitespace.
+    """
+    if not text:
+        return ""
+    text = _HTML_TAG_RE.sub('', text)
+    text = text.translate(SEARCH_FOLD_TABLE)
+    return _WHITESPACE_RE.sub(' ', text)
+
+
+class NormalizedText:
+    """
+    A piece of Hebrew text together with its normalized forms.
+
+    Attributes:
+        raw: Text as received from Sefaria / the local corpus
+        no_niqqud: raw with niqqud and cantillation removed
+        folded: fold_for_search(raw)
+        folded_no_space: folded with all spaces removed
+    """
+
+    __slots__ = ('raw', 'no_niqqud', 'folded', 'folded_no_space')
+
+    def __init__(self, raw: Optional[str]):
+        self.raw = raw or ""
+        self.no_niqqud = strip_niqqud(self.raw)
+        self.folded = fold_for_search(self.raw)
+        self.folded_no_space = self.folded.replace(" ", "")
+
+    def __bool__(self) -> bool:
+        return bool(self.raw)
+
+    def __repr__(self) -> str:
+        preview = self.raw[:40] + ("..." if len(self.raw) > 40 else "")
+        return f"NormalizedText({preview!r})"
+
+
+__all__ = [
+    'NIQQUD_TABLE',
+    'SEARCH_FOLD_TABLE',
+    'SOFIT_MAP',
+    'SOFIT_TABLE',
+    'strip_html',
+    'strip_niqqud',
+    'fold_for_search',
+    'NormalizedText',
+]
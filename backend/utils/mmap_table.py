@@ -0,0 +1,206 @@
+"""
+Memory-mapped sorted-hash tables.
+
+Offline-built lookup files (term_frequency.bin, english_lexicon.bin) share
+one format: sections of sorted 64-bit string hashes, optionally with a
+parallel array of values, plus a little JSON metadata. At runtime the file
+is memory-mapped and keys are found by binary search - nothing is parsed
+or loaded into Python objects.
+
+FILE LAYOUT (little-endian):
+    header    24 bytes: magic, version, param, section count, metadata length
+    lengths   section count * uint64 (items per section)
+    metadata  JSON, padded to 8 bytes
+    sections  one array each (item types fixed by the table type), padded to 8 bytes
+
+"param" is one small table-specific number (the term-frequency table's
+max n, the lexicon's near-miss minimum length).
+
+A table type subclasses MappedTable with its magic, version and section
+types, writes files with write_mapped_table() and holds its process-wide
+instance in a TableLoader.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<4sIIIQ")
+
+
+def hash_key(text: str) -> int:
+    """Stable 64-bit key for a string (Python's hash() varies per process)."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _padded(length: int) -> int:
+    return (length + 7) // 8 * 8
+
+
+# =============================================================================
+#  READING
+# =============================================================================
+
+class MappedTable:
+    """
+    Read-only, memory-mapped table file.
+
+    Subclasses pass their magic, version and one array typecode per
+    section ("Q" for keys, "I" for uint32 values, ...).
+    """
+
+    def __init__(self, path: Path, magic: bytes, version: int, typecodes: str):
+        self.path = Path(path)
+        self.sections: List[memoryview] = []
+        self._view: Optional[memoryview] = None
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        try:
+            file_magic, file_version, self.param, count, meta_len = _HEADER.unpack_from(self._mmap, 0)
+            if file_magic != magic or file_version != version or count != len(typecodes):
+                raise ValueError(f"{self.path} is not a version {version} {magic.decode()} table")
+
+            lengths = struct.unpack_from(f"<{count}Q", self._mmap, _HEADER.size)
+            offset = _HEADER.size + 8 * count
+            self.metadata: Dict[str, Any] = json.loads(self._mmap[offset:offset + meta_len].decode("utf-8"))
+            offset += _padded(meta_len)
+
+            self._view = memoryview(self._mmap)
+            for typecode, length in zip(typecodes, lengths):
+                size = length * array(typecode).itemsize
+                self.sections.append(self._view[offset:offset + size].cast(typecode))
+                offset += _padded(size)
+        except Exception:
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self.sections[0])
+
+    def find(self, key: int, section: int = 0) -> Optional[int]:
+        """Index of key in a sorted key section, None if absent."""
+        keys = self.sections[section]
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return i
+        return None
+
+    def close(self) -> None:
+        for view in self.sections:
+            view.release()
+        self.sections = []
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        self._mmap.close()
+        self._file.close()
+
+
+# =============================================================================
+#  WRITING
+# =============================================================================
+
+def write_mapped_table(
+    path: Path,
+    magic: bytes,
+    version: int,
+    sections: Sequence[array],
+    param: int = 0,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Write a table file; key sections must already be sorted."""
+    meta = json.dumps({
+        **(metadata or {}),
+        "built_at": datetime.now().isoformat(),
+    }, ensure_ascii=False).encode("utf-8")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(magic, version, param, len(sections), len(meta)))
+        f.write(struct.pack(f"<{len(sections)}Q", *(len(section) for section in sections)))
+        f.write(meta.ljust(_padded(len(meta)), b" "))
+        for section in sections:
+            data = section.tobytes()
+            f.write(data.ljust(_padded(len(data)), b"\0"))
+
+
+# =============================================================================
+#  PROCESS-WIDE INSTANCE
+# =============================================================================
+
+T = TypeVar("T", bound=MappedTable)
+
+
+def _configured_path(setting: str) -> Optional[Path]:
+    try:
+        from config import get_settings
+        return getattr(get_settings(), setting, None)
+    except Exception:
+        return None
+
+
+class TableLoader(Generic[T]):
+    """
+    Holds one table type's process-wide instance, mapped on first use.
+
+    The path is the one passed to get(), else the settings field, else the
+    default; a missing or unreadable file gives None.
+    """
+
+    def __init__(
+        self,
+        table_type: Callable[[Path], T],
+        default_path: Path,
+        setting: str,
+        log_prefix: str,
+        describe: Callable[[T], str],
+    ):
+        self.table_type = table_type
+        self.default_path = default_path
+        self.setting = setting
+        self.log_prefix = log_prefix
+        self.describe = describe
+        self._table: Optional[T] = None
+        self._loaded = False
+
+    def load(self, path: Path) -> Optional[T]:
+        """Open a table file (None if missing or unreadable)."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            return self.table_type(path)
+        except Exception as e:
+            logger.warning(f"{self.log_prefix} Could not load {path}: {e}")
+            return None
+
+    def get(self, path: Optional[Path] = None) -> Optional[T]:
+        if not self._loaded:
+            self._table = self.load(path or _configured_path(self.setting) or self.default_path)
+            self._loaded = True
+            if self._table is not None:
+                logger.info(f"{self.log_prefix} {self.describe(self._table)}")
+        return self._table
+
+
+__all__ = [
+    'MappedTable',
+    'TableLoader',
+    'hash_key',
+    'write_mapped_table',
+]
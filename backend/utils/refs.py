@@ -0,0 +1,212 @@
+"""
+Canonical parsing for Talmud-style Sefaria refs.
+
+Refs travel through every step of the pipeline as plain strings
+("Pesachim 4a", "Rashi on Pesachim 4a:5:1", "Pesachim 2a-3b") and each step
+used to pick them apart with its own regex or str.split(), which disagreed
+on multi-word tractates ("Bava Metzia 21a".split()[0] == "Bava") and
+re-parsed the same handful of refs over and over.
+
+parse_ref() turns a ref into a Ref once (results are LRU-cached, so a ref
+seen again in the same request is a dict lookup) and the Ref carries the
+arithmetic callers need: the other amud, the next amud, expanding a daf
+range, and a sort key in daf order.
+
+Refs that do not name a daf/amud (Mishneh Torah, Shulchan Arukh, Mishnah
+chapter:mishnah) parse to None; callers keep their string handling for
+those.
+"""
+
+import re
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+
+# Safety cap when expanding a daf range
+MAX_RANGE_AMUDIM = 21
+
+_REF_RE = re.compile(
+    r'^(?:(?P<commentator>.+?) on )?(?P<book>.+?)\s+'
+    r'(?P<daf>\d+)(?P<amud>[ab])'
+    r'(?::(?P<segment>\d+)(?::(?P<comment>\d+))?)?'
+    r'(?:\s*-\s*(?:(?P<end_daf>\d+)(?P<end_amud>[ab]))?(?P<end_tail>(?::?\d+)*))?$',
+    re.IGNORECASE,
+)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@dataclass(frozen=True)
+class Ref:
+    """
+    A parsed daf ref.
+
+    "Rashi on Pesachim 4a:5:1" -> commentator="Rashi", book="Pesachim",
+    daf=4, amud="a", segment=5, comment=1. A range across amudim
+    ("Pesachim 2a-3b") sets end_daf/end_amud; a range within one amud
+    ("Pesachim 4a:3-5") keeps them None.
+    """
+
+    book: str
+    daf: int
+    amud: str
+    segment: Optional[int] = None
+    comment: Optional[int] = None
+    commentator: Optional[str] = None
+    end_daf: Optional[int] = None
+    end_amud: Optional[str] = None
+
+    # ----- views -----
+
+    @property
+    def daf_label(self) -> str:
+        """ "4a" """
+        return f"{self.daf}{self.amud}"
+
+    @property
+    def prefix(self) -> str:
+        """ "Rashi on " for commentary refs, "" otherwise."""
+        return f"{self.commentator} on " if self.commentator else ""
+
+    @property
+    def amud_ref(self) -> str:
+        """The ref cut back to its (starting) amud: "Rashi on Pesachim 4a"."""
+        return f"{self.prefix}{self.book} {self.daf_label}"
+
+    @property
+    def position(self) -> int:
+        """Amud index for arithmetic: 2a=4, 2b=5, 3a=6, ..."""
+        return self.daf * 2 + (self.amud == "b")
+
+    @property
+    def end_position(self) -> int:
+        if self.end_daf is None:
+            return self.position
+        return self.end_daf * 2 + (self.end_amud == "b")
+
+    @property
+    def is_range(self) -> bool:
+        """True if the ref spans more than one amud."""
+        return self.end_daf is not None and self.end_position != self.position
+
+    @property
+    def sort_key(self) -> Tuple[str, int, int, int, int]:
+        """(book, daf, amud, segment, comment) - daf order within a book."""
+        return (self.book, self.daf, self.amud == "b", self.segment or 0, self.comment or 0)
+
+    def __str__(self) -> str:
+        text = self.amud_ref
+        if self.segment is not None:
+            text += f":{self.segment}"
+            if self.comment is not None:
+                text += f":{self.comment}"
+        if self.end_daf is not None:
+            text += f"-{self.end_daf}{self.end_amud}"
+        return text
+
+    # ----- arithmetic -----
+
+    def at_amud(self, position: int) -> "Ref":
+        """The whole-amud ref at a given position, same book and commentator."""
+        return Ref(
+            book=self.book,
+            daf=position // 2,
+            amud="b" if position % 2 else "a",
+            commentator=self.commentator,
+        )
+
+    def whole_amud(self) -> "Ref":
+        """This ref without segment or range."""
+        return self.at_amud(self.position)
+
+    def other_amud(self) -> "Ref":
+        """4a -> 4b, 4b -> 4a."""
+        return self.at_amud(self.position ^ 1)
+
+    def next_amud(self) -> "Ref":
+        """4a -> 4b, 4b -> 5a."""
+        return self.at_amud(self.position + 1)
+
+    def amudim(self, limit: int = MAX_RANGE_AMUDIM) -> List["Ref"]:
+        """
+        Every amud the ref covers, in order ("2a-3b" -> 2a, 2b, 3a, 3b).
+
+        A backwards range yields the start and walks forward; at most
+        `limit` amudim are returned either way.
+        """
+        out = [self.whole_amud()]
+        end = self.end_position
+        position = self.position
+        while position != end and len(out) < limit:
+            position += 1
+            out.append(self.at_amud(position))
+        return out
+
+    def on(self, commentator: Optional[str]) -> "Ref":
+        """The same location as a commentary ref (or the base text, with None)."""
+        return replace(self, commentator=commentator)
+
+
+_HEBREW_ONES = ["", "א", "ב", "ג", "ד", "ה", "ו", "ז", "ח", "ט"]
+_HEBREW_TENS = ["", "י", "כ", "ל", "מ", "נ", "ס", "ע", "פ", "צ"]
+_HEBREW_HUNDREDS = ["", "ק", "ר", "ש", "ת"]
+
+
+def hebrew_numeral(number: int) -> str:
+    """Daf number in Hebrew letters with geresh/gershayim: 4 -> "ד׳", 15 -> "ט״ו"."""
+    hundreds, rest = divmod(number, 100)
+    letters = _HEBREW_HUNDREDS[min(hundreds, 4)]
+    tens, ones = divmod(rest, 10)
+    if tens == 1 and ones in (5, 6):
+        letters += "ט" + _HEBREW_ONES[ones + 1]  # 15/16 are written 9+6/9+7
+    else:
+        letters += _HEBREW_TENS[tens] + _HEBREW_ONES[ones]
+    if len(letters) == 1:
+        return letters + "׳"
+    return letters[:-1] + "״" + letters[-1]
+
+
+def hebrew_daf_label(daf: int, amud: str) -> str:
+    """Sefaria's Hebrew daf notation: (4, "a") -> "ד׳ א"."""
+    return f"{hebrew_numeral(daf)} {'א' if amud == 'a' else 'ב'}"
+
+
+@lru_cache(maxsize=4096)
+def parse_ref(ref: str) -> Optional[Ref]:
+    """
+    Parse a daf ref, or None if it has no daf/amud.
+
+    Examples:
+        "Pesachim 4a"              -> Ref(book="Pesachim", daf=4, amud="a")
+        "Rashi on Pesachim 4a:5:1" -> Ref(..., segment=5, comment=1, commentator="Rashi")
+        "Bava Metzia 2a-3b"        -> Ref(book="Bava Metzia", ..., end_daf=3, end_amud="b")
+        "Mishneh Torah, Theft 1:2" -> None
+    """
+    if not ref:
+        return None
+    match = _REF_RE.match(_WHITESPACE_RE.sub(" ", ref.strip()))
+    if not match:
+        return None
+
+    segment = match.group("segment")
+    comment = match.group("comment")
+    end_daf = match.group("end_daf")
+    return Ref(
+        book=match.group("book"),
+        daf=int(match.group("daf")),
+        amud=match.group("amud").lower(),
+        segment=int(segment) if segment else None,
+        comment=int(comment) if comment else None,
+        commentator=match.group("commentator"),
+        end_daf=int(end_daf) if end_daf else None,
+        end_amud=match.group("end_amud").lower() if end_daf else None,
+    )
+
+
+__all__ = [
+    'Ref',
+    'parse_ref',
+    'hebrew_numeral',
+    'hebrew_daf_label',
+    'MAX_RANGE_AMUDIM',
+]
@@ -0,0 +1,148 @@
+"""
+Per-request text storage for Step 3 sources.
+
+A search builds dozens of Source objects, many carrying the same text
+(a daf fetched as a foundation stone and again as the landmark, the same
+commentary reached from two segments). Each request gets a TextArena that
+stores every distinct text once; sources keep a small TextHandle into it
+and callers that only need a preview (API serialization, console output)
+ask the handle for a truncated slice or snippet instead of the full text.
+
+The arena for the running request lives in a ContextVar, so concurrent
+searches never share one and asyncio tasks spawned by a search see it.
+Outside a request, handles simply hold their own string.
+"""
+
+import contextvars
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class TextArena:
+    """Deduplicated text storage shared by the sources of one request."""
+
+    __slots__ = ('_texts', '_index', 'requests')
+
+    def __init__(self):
+        self._texts: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.requests = 0  # Texts added, including duplicates
+
+    def add(self, text: Optional[str]) -> "TextHandle":
+        """Store text (once) and return a handle to it."""
+        text = text or ""
+        self.requests += 1
+        slot = self._index.get(text)
+        if slot is None:
+            slot = len(self._texts)
+            self._texts.append(text)
+            self._index[text] = slot
+        return TextHandle(self, slot)
+
+    def get(self, slot: int) -> str:
+        return self._texts[slot]
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    @property
+    def chars(self) -> int:
+        """Characters stored (after deduplication)."""
+        return sum(len(text) for text in self._texts)
+
+    def __repr__(self) -> str:
+        return f"TextArena({len(self._texts)} texts, {self.requests} added, {self.chars} chars)"
+
+
+class TextHandle:
+    """
+    A reference to one text, with cheap truncation.
+
+    Backed by an arena slot, or by its own string when created outside a
+    request.
+    """
+
+    __slots__ = ('_arena', '_slot', '_text')
+
+    def __init__(self, arena: Optional[TextArena], slot: int = 0, text: str = ""):
+        self._arena = arena
+        self._slot = slot
+        self._text = text
+
+    @property
+    def text(self) -> str:
+        """The full text."""
+        if self._arena is None:
+            return self._text
+        return self._arena.get(self._slot)
+
+    def truncated(self, limit: Optional[int]) -> str:
+        """The first `limit` characters (the whole text if limit is None)."""
+        text = self.text
+        if limit is None or len(text) <= limit:
+            return text
+        return text[:limit]
+
+    def snippet(self, limit: int = 200, ellipsis: str = "...") -> str:
+        """Whitespace-collapsed preview cut at a word boundary."""
+        text = self.text
+        # Only collapse the part that can end up in the snippet
+        preview = _WHITESPACE_RE.sub(' ', text[:limit * 2]).strip()
+        if len(preview) <= limit and len(text) <= limit * 2:
+            return preview
+        cut = preview[:limit]
+        if ' ' in cut:
+            cut = cut.rsplit(' ', 1)[0]
+        return cut + ellipsis
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __bool__(self) -> bool:
+        return bool(self.text)
+
+    def __repr__(self) -> str:
+        return f"TextHandle({self.snippet(30)!r})"
+
+
+_current_arena: contextvars.ContextVar = contextvars.ContextVar("text_arena", default=None)
+
+
+def current_text_arena() -> Optional[TextArena]:
+    """The running request's arena, if any."""
+    return _current_arena.get()
+
+
+def text_handle(text: Optional[str]) -> TextHandle:
+    """Handle for text in the current request's arena (standalone outside a request)."""
+    arena = _current_arena.get()
+    if arena is None:
+        return TextHandle(None, text=text or "")
+    return arena.add(text)
+
+
+@contextmanager
+def text_arena_scope() -> Iterator[TextArena]:
+    """Run a block (one request) with a fresh arena."""
+    arena = TextArena()
+    token = _current_arena.set(arena)
+    try:
+        yield arena
+    finally:
+        _current_arena.reset(token)
+
+
+__all__ = [
+    'TextArena',
+    'TextHandle',
+    'current_text_arena',
+    'text_handle',
+    'text_arena_scope',
+]
@@ -0,0 +1,331 @@
+"""
+Corpus-Derived Variant Lexicon
+==============================
+
+Keyword matching in Step 3 needs the surface forms a term actually takes in
+the gemara: proclitic prefixes (ד/ב/ל/ו/ה), the Aramaic emphatic -א, plural
+-ין/-ים/-ות and smichut ה↔ת. generate_keyword_variants used to guess these
+with a handful of rules and a small hardcoded Aramaic table.
+
+This module mines the local Sefaria export once, offline, for every attested
+surface form of each stem and writes data/variant_lexicon.json. At runtime
+the lexicon is loaded once and variants(word) is a pair of dict lookups.
+
+Everything is stored sofit-folded and niqqud-stripped, which is how the
+keyword matcher compares text anyway.
+
+A surface form is filed under a stem only if the stem itself is attested as a
+standalone word (at least --min-stem-count times), which keeps prefix
+stripping from inventing stems (e.g. "ברי" is never read as ב + "רי").
+מ/ש/כ are deliberately not treated as prefixes - they are too often root
+letters (משכיר, שמא, כתובה).
+
+BUILD (offline, needs the local export - see README "Local Corpus Setup"):
+    python variant_lexicon.py --build
+    python variant_lexicon.py --build --categories "Talmud/Bavli" "Halakhah/Shulchan Arukh"
+
+LOOKUP:
+    from variant_lexicon import get_variant_lexicon
+    lexicon = get_variant_lexicon()
+    if lexicon:
+        lexicon.variants("ממון")   # ['ממונ', 'ממונא', 'דממונא', 'בממונ', ...]
+"""
+
+import json
+import logging
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from local_corpus import iter_text_segments
+from utils.hebrew_text import SOFIT_TABLE, strip_html, strip_niqqud
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+#  CONFIGURATION
+# =============================================================================
+
+DEFAULT_LEXICON_PATH = Path(__file__).resolve().parent / "data" / "variant_lexicon.json"
+
+# Corpus sub-trees mined by default (relative to the export's json/ root)
+DEFAULT_CATEGORIES = ["Talmud/Bavli"]
+
+# Proclitics: single letters and the two-letter chains ו+X
+PROCLITIC_LETTERS = ["ו", "ד", "ב", "ל", "ה"]
+PROCLITICS = [""] + PROCLITIC_LETTERS + ["ו" + p for p in PROCLITIC_LETTERS if p != "ו"]
+
+# Suffixes stripped to reach a stem, in folded form (-ין/-ים are -ינ/-ימ after sofit folding)
+STRIPPED_SUFFIXES = ["ינ", "ימ", "ות", "א", "ת"]
+
+MIN_STEM_LENGTH = 3
+DEFAULT_MIN_STEM_COUNT = 3
+DEFAULT_MIN_FORM_COUNT = 2
+DEFAULT_MAX_FORMS = 24
+
+_HEBREW_TOKEN_RE = re.compile(r'[א-ת]+')
+
+
+# =============================================================================
+#  NORMALIZATION
+# =============================================================================
+
+def fold_token(token: str) -> str:
+    """Niqqud-stripped, sofit-folded form of a single word."""
+    return strip_niqqud(token).translate(SOFIT_TABLE)
+
+
+def candidate_stems(form: str) -> Set[str]:
+    """
+    Every (prefix, stem, suffix) reading of a folded form.
+
+    Returns the stems only; the builder keeps those that are attested.
+    """
+    stems = set()
+    for prefix in PROCLITICS:
+        if not form.startswith(prefix):
+            continue
+        rest = form[len(prefix):]
+        if len(rest) < MIN_STEM_LENGTH:
+            continue
+        stems.add(rest)
+
+        for suffix in STRIPPED_SUFFIXES:
+            if rest.endswith(suffix) and len(rest) - len(suffix) >= MIN_STEM_LENGTH:
+                stems.add(rest[:-len(suffix)])
+
+        # Smichut / Aramaic feminine: חזקת, חזקא -> חזקה
+        if rest[-1] in ("ת", "א"):
+            stems.add(rest[:-1] + "ה")
+
+    return stems
+
+
+# =============================================================================
+#  LEXICON
+# =============================================================================
+
+class VariantLexicon:
+    """Stem -> attested surface forms, with a reverse index for O(1) lookups."""
+
+    def __init__(self, lemmas: Dict[str, List[str]], metadata: Optional[Dict[str, Any]] = None):
+        self.lemmas = lemmas
+        self.metadata = metadata or {}
+
+        # Surface form -> stems it was filed under
+        self._stems_of: Dict[str, List[str]] = defaultdict(list)
+        for stem, forms in lemmas.items():
+            for form in forms:
+                self._stems_of[form].append(stem)
+
+    def __len__(self) -> int:
+        return len(self.lemmas)
+
+    def __contains__(self, word: str) -> bool:
+        return fold_token(word) in self._stems_of
+
+    def variants(self, word: str) -> List[str]:
+        """
+        Attested surface forms sharing a stem with word (folded).
+
+        Empty if the word never appeared in the mined corpus.
+        """
+        folded = fold_token(word)
+        stems = self._stems_of.get(folded)
+        if not stems:
+            return []
+
+        if len(stems) == 1:
+            return list(self.lemmas[stems[0]])
+
+        seen = set()
+        out = []
+        for stem in stems:
+            for form in self.lemmas[stem]:
+                if form not in seen:
+                    seen.add(form)
+                    out.append(form)
+        return out
+
+
+_lexicon: Optional[VariantLexicon] = None
+_lexicon_loaded = False
+
+
+def load_lexicon(path: Path = DEFAULT_LEXICON_PATH) -> Optional[VariantLexicon]:
+    """Load a lexicon file (None if missing or unreadable)."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return VariantLexicon(data.get("lemmas", {}), data.get("metadata", {}))
+    except Exception as e:
+        logger.warning(f"[VARIANT_LEXICON] Could not load {path}: {e}")
+        return None
+
+
+def get_variant_lexicon(path: Optional[Path] = None) -> Optional[VariantLexicon]:
+    """
+    Get the process-wide lexicon (loaded once).
+
+    Returns None when no lexicon has been built; callers fall back to
+    their heuristic variants.
+    """
+    global _lexicon, _lexicon_loaded
+    if not _lexicon_loaded:
+        _lexicon = load_lexicon(path or DEFAULT_LEXICON_PATH)
+        _lexicon_loaded = True
+        if _lexicon is not None:
+            logger.info(f"[VARIANT_LEXICON] Loaded {len(_lexicon)} stems")
+        else:
+            logger.info("[VARIANT_LEXICON] No lexicon built - using heuristic keyword variants")
+    return _lexicon
+
+
+# =============================================================================
+#  OFFLINE BUILDER
+# =============================================================================
+
+def iter_corpus_tokens(corpus_root: Path, categories: List[str]) -> Iterator[str]:
+    """Folded Hebrew tokens from every Hebrew merged.json under the categories."""
+    for category in categories:
+        base = Path(corpus_root) / category
+        if not base.exists():
+            logger.warning(f"[VARIANT_LEXICON] Missing corpus path: {base}")
+            continue
+
+        for path in sorted(base.rglob("merged.json")):
+            if "Hebrew" not in path.parts:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.debug(f"[VARIANT_LEXICON] Failed to load {path}: {e}")
+                continue
+
+            for text in iter_text_segments(data.get("text", [])):
+                for token in _HEBREW_TOKEN_RE.findall(strip_niqqud(strip_html(text))):
+                    yield token.translate(SOFIT_TABLE)
+
+
+def build_lexicon(
+    corpus_root: Path,
+    categories: List[str] = None,
+    min_stem_count: int = DEFAULT_MIN_STEM_COUNT,
+    min_form_count: int = DEFAULT_MIN_FORM_COUNT,
+    max_forms: int = DEFAULT_MAX_FORMS,
+) -> VariantLexicon:
+    """
+    Mine the corpus for attested surface forms of each stem.
+
+    Args:
+        corpus_root: Sefaria export json/ root
+        categories: Sub-trees to mine (default: Talmud/Bavli)
+        min_stem_count: A stem must appear on its own this often
+        min_form_count: Ignore surface forms rarer than this
+        max_forms: Keep only the most frequent forms per stem
+    """
+    categories = categories or DEFAULT_CATEGORIES
+    counts = Counter(iter_corpus_tokens(corpus_root, categories))
+    logger.info(f"[VARIANT_LEXICON] {sum(counts.values())} tokens, {len(counts)} distinct forms")
+
+    forms_by_stem: Dict[str, Counter] = defaultdict(Counter)
+    for form, count in counts.items():
+        if count < min_form_count:
+            continue
+        for stem in candidate_stems(form):
+            if counts.get(stem, 0) >= min_stem_count:
+                forms_by_stem[stem][form] = count
+
+    lemmas = {}
+    for stem, forms in forms_by_stem.items():
+        if len(forms) < 2:
+            continue  # Only the stem itself - nothing to expand to
+        lemmas[stem] = [form for form, _ in forms.most_common(max_forms)]
+
+    metadata = {
+        "built_at": datetime.now().isoformat(),
+        "corpus_root": str(corpus_root),
+        "categories": categories,
+        "tokens": sum(counts.values()),
+        "distinct_forms": len(counts),
+        "stems": len(lemmas),
+        "min_stem_count": min_stem_count,
+        "min_form_count": min_form_count,
+        "max_forms": max_forms,
+    }
+    return VariantLexicon(lemmas, metadata)
+
+
+def save_lexicon(lexicon: VariantLexicon, path: Path = DEFAULT_LEXICON_PATH) -> None:
+    """Write a lexicon to disk (compact JSON)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(
+            {"metadata": lexicon.metadata, "lemmas": lexicon.lemmas},
+            f, ensure_ascii=False, separators=(",", ":")
+        )
+
+
+__all__ = [
+    'VariantLexicon',
+    'get_variant_lexicon',
+    'load_lexicon',
+    'build_lexicon',
+    'save_lexicon',
+    'candidate_stems',
+    'fold_token',
+]
+
+
+# =============================================================================
+#  CLI
+# =============================================================================
+
+def main():
+    """Command-line entry point."""
+    import argparse
+    from local_corpus import DEFAULT_CORPUS_ROOT
+
+    parser = argparse.ArgumentParser(description="Build or query the corpus variant lexicon")
+    parser.add_argument("--build", action="store_true", help="Mine the local corpus and write the lexicon")
+    parser.add_argument("--corpus-root", type=Path, default=DEFAULT_CORPUS_ROOT)
+    parser.add_argument("--categories", nargs="+", default=DEFAULT_CATEGORIES)
+    parser.add_argument("--output", type=Path, default=DEFAULT_LEXICON_PATH)
+    parser.add_argument("--min-stem-count", type=int, default=DEFAULT_MIN_STEM_COUNT)
+    parser.add_argument("--min-form-count", type=int, default=DEFAULT_MIN_FORM_COUNT)
+    parser.add_argument("--max-forms", type=int, default=DEFAULT_MAX_FORMS)
+    parser.add_argument("words", nargs="*", help="Words to look up")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s | %(message)s')
+
+    if args.build:
+        lexicon = build_lexicon(
+            args.corpus_root,
+            args.categories,
+            min_stem_count=args.min_stem_count,
+            min_form_count=args.min_form_count,
+            max_forms=args.max_forms,
+        )
+        save_lexicon(lexicon, args.output)
+        print(f"Wrote {len(lexicon)} stems to {args.output}")
+    else:
+        lexicon = load_lexicon(args.output)
+        if lexicon is None:
+            print(f"No lexicon at {args.output} - run with --build first")
+            return
+
+    for word in args.words:
+        print(f"{word}: {lexicon.variants(word)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -52,6 +52,8 @@ function App() {
   // Steps 2 & 3: Search results
   const [searchResult, setSearchResult] = useState(null);
   const [searchLoading, setSearchLoading] = useState(false);
+  // English text is only requested once the user asks to see it
+  const [englishShown, setEnglishShown] = useState(false);
 
   // Source feedback state
   const [queryId, setQueryId] = useState(null);
@@ -62,7 +64,7 @@ function App() {
   //  API CALLS
   // ==========================================
 
-  const callSearch = useCallback(async (searchQueryOverride) => {
+  const callSearch = useCallback(async (searchQueryOverride, { includeEnglish = false } = {}) => {
     const searchQuery = searchQueryOverride || query
     if (!searchQuery) {
       setError('No query to search. Try again?')
@@ -70,13 +72,17 @@ function App() {
     }
 
     setSearchLoading(true)
-    setSearchResult(null)
-    // Reset feedback state for new search
-    setSourceRatings({})
-    setFeedbackSubmitted(false)
-    // Generate unique query ID for this search session
-    const newQueryId = `${Date.now()}-${Math.random().toString(36).substring(2, 11)}`
-    setQueryId(newQueryId)
+    if (!includeEnglish) {
+      // New search (re-fetching the same one with English keeps the results and ratings)
+      setSearchResult(null)
+      setEnglishShown(false)
+      // Reset feedback state for new search
+      setSourceRatings({})
+      setFeedbackSubmitted(false)
+      // Generate unique query ID for this search session
+      const newQueryId = `${Date.now()}-${Math.random().toString(36).substring(2, 11)}`
+      setQueryId(newQueryId)
+    }
 
     try {
       const response = await fetch(`${API_BASE}/search`, {
@@ -85,7 +91,8 @@ function App() {
         // Important: always send the ORIGINAL user query to the full pipeline.
         // The backend re-runs Step 1 (mixed query detection) itself. Passing only
         // the transliterated term would collapse mixed queries to a single term.
-        body: JSON.stringify({ query: searchQuery })
+        // English is fetched separately on the backend, only when asked for.
+        body: JSON.stringify({ query: searchQuery, include_english: includeEnglish })
       })
 
       if (!response.ok) {
@@ -94,6 +101,7 @@ function App() {
 
       const data = await response.json()
       setSearchResult(data)
+      if (includeEnglish) setEnglishShown(true)
 
     } catch (err) {
       setError('Error searching for sources. Make sure the backend is running.')
@@ -299,6 +307,10 @@ function App() {
     document.querySelector('.query-input')?.focus()
   }, [])
 
+  const handleShowEnglish = useCallback(() => {
+    callSearch(searchResult?.original_query || query, { includeEnglish: true })
+  }, [callSearch, searchResult, query])
+
   // Source feedback handlers
   const handleSourceRate = useCallback((sourceRef, rating) => {
     setSourceRatings(prev => {
@@ -365,6 +377,8 @@ function App() {
         onSuggestionSelect={handleClarificationSelect}
         sourceRatings={sourceRatings}
         onSourceRate={handleSourceRate}
+        onShowEnglish={englishShown ? null : handleShowEnglish}
+        englishLoading={searchLoading}
       />
       {/* Source Feedback Panel */}
       {searchResult && allSources.length > 0 && !feedbackSubmitted && (
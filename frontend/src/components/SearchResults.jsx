@@ -11,8 +11,18 @@ import { SourceRatingButtons } from './SourceFeedbackPanel';
  * - onSuggestionSelect: Optional handler for clarification suggestions.
  * - sourceRatings: Object mapping source refs to ratings.
  * - onSourceRate: Callback (sourceRef, rating) => void for rating sources.
+ * - onShowEnglish: Optional handler that re-fetches the results with English text.
+ * - englishLoading: True while that fetch is running.
  */
-const SearchResults = ({ searchResult, apiBase, onSuggestionSelect, sourceRatings = {}, onSourceRate }) => {
+const SearchResults = ({
+  searchResult,
+  apiBase,
+  onSuggestionSelect,
+  sourceRatings = {},
+  onSourceRate,
+  onShowEnglish,
+  englishLoading = false,
+}) => {
   if (!searchResult) return null;
 
   const baseUrl = apiBase || '';
@@ -431,6 +441,19 @@ const SearchResults = ({ searchResult, apiBase, onSuggestionSelect, sourceRating
         </div>
       )}
 
+      {hasSources && onShowEnglish && (
+        <div className="source-actions">
+          <button
+            type="button"
+            className="source-action-btn secondary"
+            onClick={onShowEnglish}
+            disabled={englishLoading}
+          >
+            {englishLoading ? 'Loading English...' : 'Show English'}
+          </button>
+        </div>
+      )}
+
       {sourcesByTermEntries.length > 0 ? (
         <div className="sources-container">
           <h3>Sources by Term ({totalSourcesByTerm} found)</h3>